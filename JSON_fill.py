@@ -6,7 +6,7 @@ def load_json(filename="reaction_data.json"):
     with open(filename, "r") as f:
         return json.load(f)
 
-def validate_json(data):
+def find_validation_errors(data):
     errors = []  # Liste zum Sammeln von Fehlern
 
     # Schritt 1: Schleife über Reaktionen
@@ -55,6 +55,11 @@ def validate_json(data):
         #if not isinstance(reaction["scaling"], str):
             #errors.append(f"❌ Invalid value in scaling for reaction {reaction_index}. Should have been a string. Run this program a second time.")
 
+    return errors
+
+def validate_json(data):
+    errors = find_validation_errors(data)
+
     if errors:
         # Alle Fehler anzeigen
         for error in errors:
@@ -63,40 +68,43 @@ def validate_json(data):
     else:
         print("✅ All checks passed successfully!")
 
-def fix_values(data):
-    # Schritt 8: Fixieren der Werte ("" auf 0 und "x" auf 0 für natürliche Zahlen)
-    for reaction in data["reactions"]:
+def fix_reaction(reaction):
+    # Schritt 8 für eine einzelne Reaktion (wird von fix_values und JSON_stream verwendet)
     # Umwandeln in Edicts
-        for key, value in reaction["educts"].items():
-            if key.startswith("S") or key.startswith("E"):
-                if value == "":
-                    reaction["educts"][key] = 0
-                elif isinstance(value, str) and value.isdigit():
-                    reaction["educts"][key] = int(value)
-                elif isinstance(value, float):  # Falls ein Float vorhanden ist, auf Integer setzen
-                    reaction["educts"][key] = int(value)
+    for key, value in reaction["educts"].items():
+        if key.startswith("S") or key.startswith("E"):
+            if value == "":
+                reaction["educts"][key] = 0
+            elif isinstance(value, str) and value.isdigit():
+                reaction["educts"][key] = int(value)
+            elif isinstance(value, float):  # Falls ein Float vorhanden ist, auf Integer setzen
+                reaction["educts"][key] = int(value)
 
     # Umwandeln in Products
-        for key, value in reaction["products"].items():
-            if key.startswith("S") or key.startswith("E"):
-                if value == "":
-                    reaction["products"][key] = 0
-                elif isinstance(value, str) and value.isdigit():
-                    reaction["products"][key] = int(value)
-                elif isinstance(value, float):  # Falls ein Float vorhanden ist, auf Integer setzen
-                    reaction["products"][key] = int(value)
-                    
-    
+    for key, value in reaction["products"].items():
+        if key.startswith("S") or key.startswith("E"):
+            if value == "":
+                reaction["products"][key] = 0
+            elif isinstance(value, str) and value.isdigit():
+                reaction["products"][key] = int(value)
+            elif isinstance(value, float):  # Falls ein Float vorhanden ist, auf Integer setzen
+                reaction["products"][key] = int(value)
+
     # rate_unscaled und scaling anpassen
-        if isinstance(reaction["rate_unscaled"], int):  # Umwandeln in String
-            reaction["rate_unscaled"] = str(reaction["rate_unscaled"])
-        if reaction["rate_unscaled"] == "":
-                reaction["rate_unscaled"] = f"k{reaction['index']}"
+    if isinstance(reaction["rate_unscaled"], int):  # Umwandeln in String
+        reaction["rate_unscaled"] = str(reaction["rate_unscaled"])
+    if reaction["rate_unscaled"] == "":
+        reaction["rate_unscaled"] = f"k{reaction['index']}"
 
-        if isinstance(reaction["scaling"], int):  # Umwandeln in String
-            reaction["scaling"] = str(reaction["scaling"])
-        if reaction["scaling"] == "":
-                reaction["scaling"] = f"g{reaction['index']}"
+    if isinstance(reaction["scaling"], int):  # Umwandeln in String
+        reaction["scaling"] = str(reaction["scaling"])
+    if reaction["scaling"] == "":
+        reaction["scaling"] = f"g{reaction['index']}"
+
+def fix_values(data):
+    # Schritt 8: Fixieren der Werte ("" auf 0 und "x" auf 0 für natürliche Zahlen)
+    for reaction in data["reactions"]:
+        fix_reaction(reaction)
 
     print("✅ Fixed values for 'S' and 'E' keys: Empty strings set to 0, strings with numbers converted to integers.")
     print("✅ Fixed values for 'rate_unscaled' and 'scaling' keys: Empty strings set to reaction-index-variables, numbers converted to strings.")
@@ -106,14 +114,18 @@ def save_to_json(data, filename="reaction_data.json"):
         json.dump(data, f, indent=4)
     print(f"Data successfully saved to {filename}")
 
-# Lade die JSON-Daten von der Datei reaction_data.json
-data = load_json("reaction_data.json")
+if __name__ == "__main__":
+    # Optional: Dateiname als Argument, sonst reaction_data.json
+    filename = sys.argv[1] if len(sys.argv) > 1 else "reaction_data.json"
+
+    # Lade die JSON-Daten
+    data = load_json(filename)
 
-# Führe die Fehlerüberprüfung durch
-validate_json(data)
+    # Führe die Fehlerüberprüfung durch
+    validate_json(data)
 
-# Korrigiere die Werte
-fix_values(data)
+    # Korrigiere die Werte
+    fix_values(data)
 
-# Speichere die geänderten Daten zurück in die Datei
-save_to_json(data)
+    # Speichere die geänderten Daten zurück in die Datei
+    save_to_json(data, filename)
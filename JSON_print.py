@@ -1,14 +1,16 @@
+import sys
+
 from JSON_fill import load_json
 
 
 
-def print_CRN(data):
+def print_CRN(data, filename="reactions_data_print.txt"):
     reactionstring = ""
     j = 0
     k = 0
 
     # Öffne eine Datei zum Schreiben (wenn die Datei existiert, wird sie überschrieben)
-    with open("reactions_data_print.txt", "w") as file:
+    with open(filename, "w") as file:
         
         while j < int(data["reactions_count"]):
             while k < int(data["slow_species_count"]):
@@ -64,8 +66,13 @@ def print_CRN(data):
 
     
     
-# Lade die JSON-Daten von der Datei reaction_data.json
-data = load_json("reaction_data.json")
+if __name__ == "__main__":
+    # Optional: Ein- und Ausgabedatei als Argumente
+    input_filename = sys.argv[1] if len(sys.argv) > 1 else "reaction_data.json"
+    output_filename = sys.argv[2] if len(sys.argv) > 2 else "reactions_data_print.txt"
+
+    # Lade die JSON-Daten
+    data = load_json(input_filename)
 
-# Ausgabe des CRN
-print_CRN(data)
\ No newline at end of file
+    # Ausgabe des CRN
+    print_CRN(data, output_filename)
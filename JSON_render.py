@@ -0,0 +1,154 @@
+import argparse
+import sys
+from contextlib import contextmanager
+from itertools import chain
+
+from JSON_stream import iter_reactions
+
+FORMATS = ("text", "latex", "markdown")
+BATCH_SIZE = 10000  # Anzahl Reaktionen pro Schreibvorgang
+BUFFER_SIZE = 1 << 20
+
+
+def _slow_terms(side, slow_species_count):
+    # Liefert [(k, Koeffizient)] der langsamen Spezies S{k} mit Koeffizient != 0, aufsteigend nach k
+    terms = []
+    for key, value in side.items():
+        if key.startswith("S") and key[1:].isdigit():
+            k = int(key[1:])
+            coeff = int(value or 0)
+            if coeff != 0 and (slow_species_count is None or k <= slow_species_count):
+                terms.append((k, coeff))
+    terms.sort()
+    return terms
+
+def _fast_index(side):
+    # Index der schnellen Spezies E{j} mit Wert 1 (es gibt höchstens eine), sonst None
+    for key, value in side.items():
+        if key.startswith("E") and value == 1:
+            return key[1:]
+    return None
+
+def _parts(reaction, slow_species_count):
+    return (
+        _slow_terms(reaction["educts"], slow_species_count),
+        _fast_index(reaction["educts"]),
+        _slow_terms(reaction["products"], slow_species_count),
+        _fast_index(reaction["products"]),
+    )
+
+def render_text(j, reaction, slow_species_count=None):
+    # Gleiche Ausgabe wie print_CRN in JSON_print
+    slow_educts, fast_educt, slow_products, fast_product = _parts(reaction, slow_species_count)
+    line = "".join(f"+ {c} * S{k} " for k, c in slow_educts)
+    line += " ---> " if fast_educt is None else f"+ E{fast_educt} ---> "
+    line += "".join(f"+ {c} * S{k} " for k, c in slow_products)
+    line += "" if fast_product is None else f"+ E{fast_product}"
+    return f"Reaktion {j}:\n{line}\nκ_ℛ = {reaction['rate_unscaled']}, γ_ℛ = {reaction['scaling']}\n\n"
+
+def _side_latex(slow_terms, fast):
+    terms = [f"{c if c != 1 else ''}S_{{{k}}}" for k, c in slow_terms]
+    if fast is not None:
+        terms.append(f"E_{{{fast}}}")
+    return " + ".join(terms) if terms else r"\emptyset"
+
+def render_latex(j, reaction, slow_species_count=None):
+    slow_educts, fast_educt, slow_products, fast_product = _parts(reaction, slow_species_count)
+    return (
+        f"{j} & ${_side_latex(slow_educts, fast_educt)} \\longrightarrow {_side_latex(slow_products, fast_product)}$"
+        f" & ${reaction['rate_unscaled']}$ & ${reaction['scaling']}$ \\\\\n"
+    )
+
+def _side_markdown(slow_terms, fast):
+    terms = [f"{c if c != 1 else ''}S{k}" for k, c in slow_terms]
+    if fast is not None:
+        terms.append(f"E{fast}")
+    return " + ".join(terms) if terms else "∅"
+
+def render_markdown(j, reaction, slow_species_count=None):
+    slow_educts, fast_educt, slow_products, fast_product = _parts(reaction, slow_species_count)
+    return (
+        f"| {j} | {_side_markdown(slow_educts, fast_educt)} → {_side_markdown(slow_products, fast_product)}"
+        f" | {reaction['rate_unscaled']} | {reaction['scaling']} |\n"
+    )
+
+RENDERERS = {"text": render_text, "latex": render_latex, "markdown": render_markdown}
+
+HEADERS = {
+    "text": "",
+    "latex": "\\begin{tabular}{rlll}\n\\hline\nNr. & Reaktion & $\\kappa_\\mathcal{R}$ & $\\gamma_\\mathcal{R}$ \\\\\n\\hline\n",
+    "markdown": "| Nr. | Reaktion | κ_ℛ | γ_ℛ |\n|---:|---|---|---|\n",
+}
+
+FOOTERS = {
+    "text": "\n",  # Leere Zeile am Ende der Datei wie bei print_CRN
+    "latex": "\\hline\n\\end{tabular}\n",
+    "markdown": "",
+}
+
+def render_reactions(reactions, out, fmt="text", slow_species_count=None):
+    """
+    Schreibt die Reaktionen gesammelt in Blöcken von BATCH_SIZE Zeilen in den Ausgabestrom.
+
+    Die Reaktionen dürfen dicht (alle Schlüssel S{k}/E{k}) oder dünnbesetzt (nur Einträge != 0) sein.
+
+    :param reactions: Iterierbare Reaktionen im Format von JSON_fill (auch ein Generator).
+    :param out: Textstrom, z. B. sys.stdout oder eine geöffnete Datei.
+    :param fmt: "text", "latex" oder "markdown".
+    :param slow_species_count: Optional: nur S1..S{slow_species_count} ausgeben (wie print_CRN).
+    :return: Anzahl der geschriebenen Reaktionen.
+    """
+    render = RENDERERS[fmt]
+    out.write(HEADERS[fmt])
+    batch = []
+    count = 0
+    for count, reaction in enumerate(reactions, start=1):
+        batch.append(render(count, reaction, slow_species_count))
+        if len(batch) >= BATCH_SIZE:
+            out.write("".join(batch))
+            batch.clear()
+    out.write("".join(batch))
+    out.write(FOOTERS[fmt])
+    return count
+
+@contextmanager
+def open_output(path=None):
+    # Gepufferter Ausgabestrom: Datei oder stdout ("-" bzw. None)
+    if path in (None, "-"):
+        yield sys.stdout
+        sys.stdout.flush()
+    else:
+        with open(path, "w", buffering=BUFFER_SIZE, encoding="utf-8") as f:
+            yield f
+
+def render_data(data, path=None, fmt="text"):
+    """
+    Rendert ein bereits geladenes Reaktions-Dictionary (Format von JSON_fill).
+    """
+    with open_output(path) as out:
+        slow_species_count = data.get("slow_species_count")
+        return render_reactions(data["reactions"], out, fmt, None if slow_species_count is None else int(slow_species_count))
+
+def render_file(filename, path=None, fmt="text"):
+    """
+    Rendert eine Reaktionsdatei, ohne sie vollständig zu laden (inkrementell über JSON_stream).
+    """
+    header = {}
+    with open(filename, "r") as f, open_output(path) as out:
+        reactions = (reaction for reaction, _, _ in iter_reactions(f, header))
+        first = next(reactions, None)
+        # slow_species_count steht in den Vorlagen vor den Reaktionen und ist damit jetzt bekannt
+        slow_species_count = header.get("slow_species_count")
+        return render_reactions(
+            chain([] if first is None else [first], reactions), out, fmt,
+            None if slow_species_count is None else int(slow_species_count),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render reaction JSON files as text, LaTeX or Markdown.")
+    parser.add_argument("filename", nargs="?", default="reaction_data.json")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="text")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args()
+    render_file(args.filename, args.output, args.format)
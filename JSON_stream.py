@@ -0,0 +1,273 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+from JSON_fill import find_validation_errors, fix_reaction
+
+CHUNK_SIZE = 1 << 20  # Anzahl Zeichen pro Lesevorgang
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONStreamError(ValueError):
+    def __init__(self, message, line, column):
+        super().__init__(f"line {line}, column {column}: {message}")
+        self.line = line
+        self.column = column
+
+
+class _Reader:
+    # Liest eine Datei blockweise und dekodiert einzelne JSON-Werte mit raw_decode,
+    # ohne die ganze Datei im Speicher zu halten. Zeile und Spalte werden mitgezählt.
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.line = 1
+        self.line_start = 0  # Position des Zeilenanfangs relativ zum Puffer (kann negativ werden)
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        # Verworfenen Pufferanfang abschneiden und nachladen
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.line_start -= self.pos
+            self.pos = 0
+        chunk = self.file.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+        self.buffer += chunk
+        return bool(chunk)
+
+    def _advance(self, end):
+        newlines = self.buffer.count("\n", self.pos, end)
+        if newlines:
+            self.line += newlines
+            self.line_start = self.buffer.rindex("\n", self.pos, end) + 1
+        self.pos = end
+
+    def position(self):
+        return self.line, self.pos - self.line_start + 1
+
+    def _position_of(self, index):
+        newlines = self.buffer.count("\n", self.pos, index)
+        if not newlines:
+            return self.line, index - self.line_start + 1
+        return self.line + newlines, index - self.buffer.rindex("\n", self.pos, index)
+
+    def error(self, message):
+        return JSONStreamError(message, *self.position())
+
+    def skip_whitespace(self):
+        while True:
+            self._advance(WHITESPACE.match(self.buffer, self.pos).end())
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.buffer[self.pos] if self.pos < len(self.buffer) else ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"expected '{char}'")
+        self._advance(self.pos + 1)
+
+    def value(self):
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                # Möglicherweise am Pufferende abgeschnittener Wert: nachladen und erneut versuchen
+                position = self._position_of(error.pos)
+                if len(self.buffer) - self.pos < CHUNK_SIZE and not self.eof and self._fill():
+                    continue
+                raise JSONStreamError(error.msg, *position)
+            # Eine Zahl am Pufferende kann noch weitergehen
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self._advance(end)
+            return value
+
+
+def iter_reactions(file, header=None):
+    """
+    Liest eine Reaktionsdatei (Format von JSON_init) inkrementell und liefert jede Reaktion einzeln.
+
+    Alle übrigen Schlüssel der obersten Ebene werden in `header` gesammelt.
+
+    :param file: Geöffnete Textdatei.
+    :param header: Optionales Dictionary für die übrigen Schlüssel.
+    :return: Generator von (Reaktion, Zeile, Spalte).
+    """
+    header = {} if header is None else header
+    reader = _Reader(file)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise reader.error("expected a string key")
+        reader.expect(":")
+        if key == "reactions":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    line, column = reader.position()
+                    yield reader.value(), line, column
+                    if reader.peek() == ",":
+                        reader.expect(",")
+                    else:
+                        reader.expect("]")
+                        break
+        else:
+            header[key] = reader.value()
+        if reader.peek() == ",":
+            reader.expect(",")
+        else:
+            reader.expect("}")
+            break
+
+def read_header(filename):
+    # Liest nur die Schlüssel außerhalb der Reaktionen (die Reaktionen werden dabei übersprungen)
+    header = {}
+    with open(filename, "r") as f:
+        for _ in iter_reactions(f, header):
+            pass
+    return header
+
+class _Writer:
+    # Schreibt {header..., "reactions": [...]} Reaktion für Reaktion
+    def __init__(self, file, header):
+        self.file = file
+        self.first = True
+        self.file.write("{\n")
+        for key, value in header.items():
+            self.file.write(f"    {json.dumps(key)}: {json.dumps(value)},\n")
+        self.file.write('    "reactions": [')
+
+    def write(self, reaction):
+        self.file.write("\n        " if self.first else ",\n        ")
+        self.file.write(json.dumps(reaction))
+        self.first = False
+
+    def close(self):
+        self.file.write("\n    ]\n}\n" if not self.first else "]\n}\n")
+
+
+def write_sparse_template(filename, reactions_count, slow_species_count, fast_species_count):
+    """
+    Erzeugt eine dünnbesetzte Vorlage: Edukte und Produkte sind leere Dictionaries, fehlende Schlüssel
+    S{k}/E{k} bedeuten 0. Die Dateigröße wächst mit O(R) statt O(R·S).
+    """
+    header = {
+        "reactions_count": reactions_count,
+        "slow_species_count": slow_species_count,
+        "fast_species_count": fast_species_count,
+        "sparse": True,
+    }
+    with open(filename, "w") as f:
+        writer = _Writer(f, header)
+        for j in range(reactions_count):
+            writer.write({"index": j + 1, "educts": {}, "products": {}, "rate_unscaled": "", "scaling": ""})
+        writer.close()
+
+def _reaction_errors(reaction, line, column):
+    # Strukturfehler vorab prüfen, damit find_validation_errors nicht mit KeyError abbricht
+    where = f"line {line}, column {column}"
+    if not isinstance(reaction, dict):
+        return [f"❌ {where}: reaction must be an object."]
+    missing = [key for key in ("index", "educts", "products") if key not in reaction]
+    if missing:
+        return [f"❌ {where}: reaction is missing {', '.join(missing)}."]
+    if not isinstance(reaction["educts"], dict) or not isinstance(reaction["products"], dict):
+        return [f"❌ {where}: educts and products must be objects."]
+    return [f"{error[:2]}{where}: {error[2:]}" for error in find_validation_errors({"reactions": [reaction]})]
+
+def stream_validate(filename, output=None):
+    """
+    Prüft (und korrigiert, falls output angegeben ist) eine Reaktionsdatei Reaktion für Reaktion.
+
+    Es werden alle Fehler mit Zeile und Spalte gesammelt. Die korrigierte Datei wird nur geschrieben,
+    wenn keine Fehler auftreten; output darf gleich filename sein.
+
+    :param filename: Eingabedatei.
+    :param output: Ausgabedatei für die korrigierten Reaktionen (None = nur prüfen).
+    :return: Liste der Fehlermeldungen.
+    """
+    errors = []
+    header = read_header(filename) if output else {}
+    temp = f"{output}.tmp" if output else None
+    out = open(temp, "w") if output else None
+    try:
+        writer = _Writer(out, header) if output else None
+        with open(filename, "r") as f:
+            try:
+                for reaction, line, column in iter_reactions(f):
+                    reaction_errors = _reaction_errors(reaction, line, column)
+                    errors.extend(reaction_errors)
+                    if writer and not reaction_errors:
+                        reaction.setdefault("rate_unscaled", "")
+                        reaction.setdefault("scaling", "")
+                        fix_reaction(reaction)
+                        writer.write(reaction)
+            except JSONStreamError as error:
+                errors.append(f"❌ {error}")
+        if writer:
+            writer.close()
+    finally:
+        if out:
+            out.close()
+    if output:
+        if errors:
+            os.remove(temp)
+        else:
+            os.replace(temp, output)
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Non-interactive, streaming reaction JSON pipeline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init", help="write a sparse template")
+    init.add_argument("filename", nargs="?", default="reaction_data.json")
+    init.add_argument("-r", "--reactions", type=int, required=True)
+    init.add_argument("-s", "--slow", type=int, default=0)
+    init.add_argument("-f", "--fast", type=int, default=0)
+
+    validate = commands.add_parser("validate", help="report all errors with positions")
+    validate.add_argument("filename", nargs="?", default="reaction_data.json")
+
+    fill = commands.add_parser("fill", help="validate and fix values")
+    fill.add_argument("filename", nargs="?", default="reaction_data.json")
+    fill.add_argument("-o", "--output", help="output file (default: overwrite the input)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "init":
+        if args.reactions <= 0 or args.slow < 0 or args.fast < 0:
+            sys.exit("❌ Invalid counts. Reactions must be positive, species counts non-negative.")
+        write_sparse_template(args.filename, args.reactions, args.slow, args.fast)
+        print(f"Data successfully saved to {args.filename}")
+        return
+
+    errors = stream_validate(args.filename, (args.output or args.filename) if args.command == "fill" else None)
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit("❌ Program terminated due to validation errors.")
+    print("✅ All checks passed successfully!")
+    if args.command == "fill":
+        print(f"Data successfully saved to {args.output or args.filename}")
+
+
+if __name__ == "__main__":
+    main()
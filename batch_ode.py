@@ -0,0 +1,293 @@
+import argparse
+import json
+import sys
+import time
+
+import telemetry
+from functions_for_LLN_CLT import conservation_laws, default_eliminate
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+sp = lazy_import("sympy")
+
+# Dormand–Prince 5(4) für autonome Systeme: Koeffizienten (die letzte Zeile sind die Gewichte der Lösung 5. Ordnung)
+# und Differenz der Gewichte zur eingebetteten Lösung 4. Ordnung
+_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+class LimitSystem:
+    """
+    Rechte Seite des Gesetzes der großen Zahlen v' = F(v) und (mit noise=True) der Kovarianzgleichung des linearen
+    Rauschens Σ' = JΣ + ΣJᵀ + D, vektorisiert über viele Zustände und Parametersätze.
+
+    F stammt aus crn_lln (Koeffizienten von fp_i), J und D aus crn_clt: J[n, m] ist der Koeffizient von u_m in der
+    Drift von fp_n, D[n, n] = 2·sigma[fpp_nn] und D[n, m] = sigma[fpp_nm] für n < m. Alle Ausdrücke werden einmal mit
+    codegen.numpy_module_source übersetzt; der Zustand einer Trajektorie ist [v, Σ zeilenweise].
+    """
+
+    def __init__(self, network, eliminate=None, noise=False):
+        """
+        :param network: Kompiliertes Netzwerk (network_formats) mit ganzzahligen Skalierungen.
+        :param eliminate: Zu eliminierende Indizes für crn_lln/crn_clt (Standard: functions_for_LLN_CLT.default_eliminate).
+        :param noise: Auch die Kovarianz des linearen Rauschens integrieren.
+        """
+        import codegen
+        import network_formats
+
+        name, species, educts, products, scaling_species, scaling_rates = network_formats.to_matrices(network)
+        if eliminate is None:
+            eliminate = default_eliminate(species, educts, products, scaling_species)
+        eliminate = [int(i) for i in eliminate]
+        slow_index = [i for i, kind in enumerate(scaling_species) if kind == 1]
+        self.relevant = [i for i in slow_index if i not in eliminate]
+        self.species = [species[i] for i in self.relevant]
+        self.noise = noise
+        n = len(self.relevant)
+
+        mu = network_formats.crn_lln(network, eliminate=eliminate, verbose=False)
+        expressions = {f"F{i}": mu.diff(sp.Symbol(f"fp{i}")) for i in self.relevant}
+        if noise:
+            drift, sigma = network_formats.crn_clt(network, eliminate=eliminate, verbose=False)
+            drift = {str(key): sp.expand(value) for key, value in drift.items()}
+            sigma = {str(key): value for key, value in sigma.items()}
+            for i in self.relevant:
+                for j in self.relevant:
+                    expressions[f"J{i}_{j}"] = drift[f"fp{i}"].diff(sp.Symbol(f"u{j}"))
+            for a, i in enumerate(self.relevant):
+                for b, j in enumerate(self.relevant):
+                    key = f"fpp{min(i, j)}{max(i, j)}"
+                    expressions[f"D{i}_{j}"] = 2 * sigma[key] if i == j else sigma[key]
+        expressions = codegen.integer_scales(expressions)
+
+        # crn_lln nummeriert die langsamen Spezies mit v0, v1, ... über alle langsamen Spezies
+        self.states = [sp.Symbol(f"v{slow_index.index(i)}") for i in self.relevant]
+        self.parameters = codegen.split_symbols(expressions, self.states)[1]
+        self.parameter_names = [str(symbol) for symbol in self.parameters]
+        self.source = codegen.numpy_module_source(expressions, self.states, self.parameters)
+        self._evaluate = codegen.load_module(self.source).evaluate
+        self.dimension = n + n * n if noise else n
+
+    def rhs(self, y, p):
+        """
+        :param y: Zustände, Form (Trajektorien, dimension).
+        :param p: Parameter, Form (Trajektorien, len(parameters)).
+        :return: Ableitungen, Form wie y.
+        """
+        n = len(self.relevant)
+        values = self._evaluate(y[:, :n], p)
+        if not self.noise:
+            return values
+        J = values[:, n:n + n * n].reshape(-1, n, n)
+        D = values[:, n + n * n:].reshape(-1, n, n)
+        covariance = y[:, n:].reshape(-1, n, n)
+        change = J @ covariance
+        change += np.swapaxes(change, 1, 2) + D
+        return np.concatenate([values[:, :n], change.reshape(-1, n * n)], axis=1)
+
+
+def integrate(rhs, y0, p, times, rtol=1e-6, atol=1e-9, shared_step=False, max_steps=100000):
+    """
+    Integriert viele Anfangswertprobleme gleichzeitig mit dem eingebetteten Runge-Kutta-Verfahren nach
+    Dormand–Prince 5(4). Alle Trajektorien werden als ein Array ausgewertet; abgeschlossene Trajektorien scheiden aus.
+
+    :param rhs: Funktion rhs(y, p) für Arrays der Form (Trajektorien, d) und (Trajektorien, Parameter).
+    :param y0: Anfangswerte, Form (Trajektorien, d).
+    :param p: Parameter, Form (Trajektorien, Parameter) oder (Parameter,).
+    :param times: Aufsteigende Ausgabezeiten; times[0] ist der Startzeitpunkt.
+    :param rtol: Relative Toleranz.
+    :param atol: Absolute Toleranz.
+    :param shared_step: Eine gemeinsame Schrittweite für alle Trajektorien (ein Schritt wird nur angenommen, wenn
+                        alle Fehler klein genug sind) statt einer eigenen Schrittweite pro Trajektorie.
+    :param max_steps: Höchstzahl der Schritte; nicht fertige Trajektorien werden als fehlgeschlagen markiert.
+    :return: Dictionary mit "y" (Trajektorien, len(times), d; NaN nach einem Fehlschlag), "ok" (Trajektorien,)
+             und "steps" (angenommene Schritte je Trajektorie).
+    """
+    y = np.array(y0, dtype=float, copy=True)
+    batch, dimension = y.shape
+    p = np.broadcast_to(np.asarray(p, dtype=float), (batch, np.shape(p)[-1])).copy()
+    times = np.asarray(times, dtype=float)
+    out = np.full((batch, len(times), dimension), np.nan)
+    out[:, 0] = y
+    t = np.full(batch, times[0])
+    target = np.ones(batch, dtype=np.intp)  # Index der nächsten Ausgabezeit
+    steps = np.zeros(batch, dtype=np.intp)
+    ok = np.ones(batch, dtype=bool)
+    active = target < len(times)
+    derivative = rhs(y, p)
+
+    # Anfangsschrittweite nach Hairer/Wanner aus den Größen von y und y'
+    scale = atol + rtol * np.abs(y)
+    d0 = np.sqrt(np.mean((y / scale) ** 2, axis=1))
+    d1 = np.sqrt(np.mean((derivative / scale) ** 2, axis=1))
+    h = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+    h = np.minimum(h, times[-1] - times[0]) if len(times) > 1 else h
+    if shared_step:
+        h[:] = h.min()
+
+    for _ in range(max_steps):
+        index = np.flatnonzero(active)
+        if index.size == 0:
+            break
+        ys, ps, ts = y[index], p[index], t[index]
+        hs = np.minimum(h[index], times[target[index]] - ts)
+        stages = [derivative[index]]
+        for row in _A[1:]:
+            increment = sum(coefficient * stage for coefficient, stage in zip(row, stages) if coefficient)
+            stages.append(rhs(ys + hs[:, None] * increment, ps))
+        new = ys + hs[:, None] * sum(coefficient * stage for coefficient, stage in zip(_A[6], stages) if coefficient)
+        # Die letzte Stufe ist bereits y' am neuen Punkt (FSAL); sie wird für das eingebettete Verfahren benötigt
+        error = hs[:, None] * sum(coefficient * stage for coefficient, stage in zip(_E, stages) if coefficient)
+        scale = atol + rtol * np.maximum(np.abs(ys), np.abs(new))
+        norm = np.sqrt(np.mean((error / scale) ** 2, axis=1))
+        norm = np.where(np.isfinite(norm) & np.isfinite(new).all(axis=1), norm, np.inf)
+        accept = norm <= 1.0
+        if shared_step:
+            accept[:] = accept.all()
+
+        factor = np.clip(0.9 * np.where(norm > 0, norm, 1e-10) ** -0.2, 0.2, 5.0)
+        if shared_step:
+            factor[:] = factor.min()
+        done = index[accept]
+        y[done] = new[accept]
+        t[done] = ts[accept] + hs[accept]
+        derivative[done] = stages[6][accept]
+        steps[done] += 1
+        # Auf eine Ausgabezeit verkürzte Schritte sollen die Schrittweite nicht dauerhaft verkleinern
+        clamped = hs < h[index]
+        h[index] = np.where(accept & clamped, np.maximum(h[index], hs * factor), hs * factor)
+
+        # Ausgabezeit erreicht: Wert speichern, nächste Ausgabezeit ansteuern
+        reached = done[np.isclose(t[done], times[target[done]], rtol=1e-12, atol=0.0)]
+        t[reached] = times[target[reached]]
+        out[reached, target[reached]] = y[reached]
+        target[reached] += 1
+        # Schrittweite unterläuft die Auflösung von t: Trajektorie abbrechen
+        failed = index[h[index] < 1e-14 * np.maximum(np.abs(t[index]), 1.0)]
+        ok[failed] = False
+        active = ok & (target < len(times))
+    ok &= target >= len(times)
+    return {"y": out, "ok": ok, "steps": steps}
+
+
+def integrate_chunks(system, initial, parameters, times, chunk=4096, **options):
+    """
+    Integriert sehr viele Anfangswerte in Blöcken und liefert die Ergebnisse blockweise, damit sie geschrieben
+    werden können, bevor der nächste Block beginnt.
+
+    :param system: LimitSystem.
+    :param initial: Anfangswerte der langsamen Spezies, Form (Trajektorien, len(system.species)).
+    :param parameters: Parameter, Form (Trajektorien, len(system.parameter_names)) oder ein einzelner Satz.
+    :param times: Ausgabezeiten.
+    :param chunk: Trajektorien pro Block.
+    :param options: Weitere Argumente für `integrate` (rtol, atol, shared_step, max_steps).
+    :return: Generator von Dictionaries mit start, stop, times, states (Block, Zeiten, Spezies), ok, steps und bei
+             system.noise zusätzlich covariance (Block, Zeiten, Spezies, Spezies).
+    """
+    initial = np.atleast_2d(np.asarray(initial, dtype=float))
+    parameters = np.atleast_2d(np.asarray(parameters, dtype=float))
+    total = max(len(initial), len(parameters))
+    initial = np.broadcast_to(initial, (total, initial.shape[1]))
+    parameters = np.broadcast_to(parameters, (total, parameters.shape[1]))
+    n = len(system.species)
+    for start in range(0, total, chunk):
+        stop = min(start + chunk, total)
+        y0 = initial[start:stop]
+        if system.noise:
+            # Deterministischer Anfangswert: Kovarianz 0
+            y0 = np.concatenate([y0, np.zeros((stop - start, n * n))], axis=1)
+        result = integrate(system.rhs, y0, parameters[start:stop], times, **options)
+        block = {"start": start, "stop": stop, "times": np.asarray(times, dtype=float),
+                 "states": result["y"][:, :, :n], "ok": result["ok"], "steps": result["steps"]}
+        if system.noise:
+            block["covariance"] = result["y"][:, :, n:].reshape(stop - start, len(times), n, n)
+        yield block
+
+
+def _read_points(file_path, species, parameter_names, rate_names, constants):
+    # JSON-Lines wie bei numeric_generator: {"states": {...}, "parameters": {...}}; Raten auch unter ihrem Dateinamen,
+    # fehlende Konstanten M{i} der langsamen Erhaltungsgrößen aus den Anfangswerten
+    initial, parameters, missing = [], [], set()
+    with open(file_path, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            point = json.loads(line)
+            states = point.get("states", {})
+            values = dict(point.get("parameters", {}))
+            for j, rate in enumerate(rate_names):
+                if rate in values:
+                    values.setdefault(f"k{j}", values[rate])
+            values.update({name: value for name, value in constants(states).items() if name not in values})
+            missing.update(S for S in species if S not in states)
+            missing.update(P for P in parameter_names if P not in values)
+            initial.append([states.get(S, np.nan) for S in species])
+            parameters.append([values.get(P, np.nan) for P in parameter_names])
+    if missing:
+        raise KeyError(", ".join(sorted(missing)))
+    return np.array(initial, dtype=float), np.array(parameters, dtype=float)
+
+def main(argv=None):
+    from network_formats import read_network, to_matrices, to_yaml_dict
+
+    parser = argparse.ArgumentParser(description="Integrate the LLN limit (and linear-noise covariance) for many initial conditions.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("points", help='JSON-lines file with {"states": {...}, "parameters": {...}} per trajectory')
+    parser.add_argument("-e", "--eliminate", type=int, nargs="+", help="indices to eliminate (crn_lln/crn_clt)")
+    parser.add_argument("--noise", action="store_true", help="also integrate the linear-noise covariance (needs crn_clt)")
+    parser.add_argument("--t-end", type=float, required=True, help="final time")
+    parser.add_argument("--outputs", type=int, default=101, help="number of equally spaced output times (default: 101)")
+    parser.add_argument("--rtol", type=float, default=1e-6)
+    parser.add_argument("--atol", type=float, default=1e-9)
+    parser.add_argument("--shared-step", action="store_true", help="one step size for the whole chunk")
+    parser.add_argument("--chunk", type=int, default=4096, help="trajectories per chunk (default: 4096)")
+    parser.add_argument("-o", "--output", required=True, help="output prefix; writes PREFIX_00000.npz, ... per chunk")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    network = read_network(args.input)
+    name, species, educts, products, scaling_species, scaling_rates = to_matrices(network)
+    rate_names = [reaction["rate"] for reaction in to_yaml_dict(network)["reactions"]]
+    fast_laws, slow_laws = conservation_laws(species, educts, products, scaling_species)
+    slow = [species[i] for i, kind in enumerate(scaling_species) if kind == 1]
+
+    def constants(states):
+        if not all(S in states for S in slow):
+            return {}
+        return {f"M{len(fast_laws) + i}": sum(vector[species.index(S)] * states[S] for S in slow)
+                for i, vector in enumerate(slow_laws)}
+
+    start = time.perf_counter()
+    system = LimitSystem(network, args.eliminate, args.noise)
+    print(f"✅ Generated right-hand side for {', '.join(system.species)} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    try:
+        initial, parameters = _read_points(args.points, system.species, system.parameter_names, rate_names, constants)
+    except KeyError as error:
+        sys.exit(f"❌ Missing value(s) for {error.args[0]}")
+
+    times = np.linspace(0.0, args.t_end, args.outputs)
+    start = time.perf_counter()
+    failed = 0
+    for number, block in enumerate(integrate_chunks(system, initial, parameters, times, args.chunk, rtol=args.rtol,
+                                                    atol=args.atol, shared_step=args.shared_step)):
+        path = f"{args.output}_{number:05d}.npz"
+        np.savez_compressed(path, species=np.array(system.species), parameters=np.array(system.parameter_names),
+                            initial=initial[block["start"]:block["stop"]], values=parameters[block["start"]:block["stop"]],
+                            **{key: value for key, value in block.items() if key not in ("start", "stop")})
+        failed += int((~block["ok"]).sum())
+        print(f"  {path}: trajectories {block['start']}–{block['stop'] - 1}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(f"{'✅' if not failed else '❌'} Integrated {len(initial)} trajectories in {elapsed:.2f} s"
+          + (f", {failed} failed" if failed else ""), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
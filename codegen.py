@@ -0,0 +1,310 @@
+import argparse
+import ctypes
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+
+import telemetry
+from lazy_import import lazy_import
+
+sp = lazy_import("sympy")
+
+# Zustandsvariablen: v_{S} (generator), v0, v1, ... bzw. Fluktuationen u0, u1, ... (crn_lln/crn_clt)
+STATE_PATTERN = re.compile(r"^[vu](\d+|_\{.*\})$")
+KINDS = ("generator", "lln", "clt")
+
+
+def _sort_key(symbol):
+    # Natürliche Sortierung, damit k10 nach k9 kommt
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", symbol.name)]
+
+def integer_scales(expressions):
+    """
+    Ersetzt Symbole, deren Name eine ganze Zahl ist (Skalierungen "0", "1", ... aus generator.compute_scaled_rate),
+    durch ihren Wert.
+    :param expressions: Dictionary {Name: SymPy-Ausdruck}.
+    :return: Dictionary mit den ersetzten Ausdrücken.
+    """
+    symbols = set().union(*(sp.sympify(expression).free_symbols for expression in expressions.values())) if expressions else set()
+    substitution = {symbol: sp.Integer(int(symbol.name)) for symbol in symbols if symbol.name.lstrip("-").isdigit()}
+    return {name: sp.sympify(expression).subs(substitution) for name, expression in expressions.items()}
+
+def split_symbols(expressions, states=None):
+    """
+    Teilt die freien Symbole in Zustände und Parameter.
+    :param expressions: Dictionary {Name: SymPy-Ausdruck}.
+    :param states: Optional die Zustandssymbole in der gewünschten Reihenfolge (Standard: STATE_PATTERN).
+    :return: Tupel (Zustände, Parameter), jeweils sortierte Listen von Symbolen.
+    """
+    symbols = set().union(*(expression.free_symbols for expression in expressions.values())) if expressions else set()
+    if states is None:
+        states = sorted((symbol for symbol in symbols if STATE_PATTERN.match(symbol.name)), key=_sort_key)
+    parameters = sorted((symbol for symbol in symbols if symbol not in states), key=_sort_key)
+    return list(states), parameters
+
+def _prepare(expressions, states, parameters):
+    # Symbole durch x_i bzw. p_i ersetzen und gemeinsame Teilausdrücke herausziehen
+    substitution = {symbol: sp.Symbol(f"x_{i}") for i, symbol in enumerate(states)}
+    substitution.update({symbol: sp.Symbol(f"p_{i}") for i, symbol in enumerate(parameters)})
+    renamed = [sp.sympify(expression).xreplace(substitution) for expression in expressions.values()]
+    return sp.cse(renamed, symbols=sp.numbered_symbols("t_"))
+
+def numpy_module_source(expressions, states, parameters, name="evaluate"):
+    """
+    Erzeugt den Quelltext eines eigenständigen Python-Moduls, das nur NumPy benötigt.
+
+    Die Funktion `name(x, p)` erwartet Zustände der Form (..., len(states)) und Parameter der Form (..., len(parameters));
+    beide werden gegeneinander gebroadcastet. Das Ergebnis hat die Form (..., len(expressions)).
+
+    :param expressions: Dictionary {Name der Ausgabe: SymPy-Ausdruck}.
+    :param states: Liste der Zustandssymbole.
+    :param parameters: Liste der Parametersymbole.
+    :param name: Name der erzeugten Funktion.
+    :return: Quelltext als Zeichenkette.
+    """
+    from sympy.printing.numpy import NumPyPrinter
+
+    printer = NumPyPrinter({"fully_qualified_modules": True, "allow_unknown_functions": False})
+    replacements, reduced = _prepare(expressions, states, parameters)
+    lines = [
+        '"""Automatisch erzeugt von codegen.py."""',
+        "import numpy",
+        "",
+        f"STATES = {[str(symbol) for symbol in states]!r}",
+        f"PARAMETERS = {[str(symbol) for symbol in parameters]!r}",
+        f"OUTPUTS = {list(expressions)!r}",
+        "",
+        "",
+        f"def {name}(x, p):",
+        '    """',
+        f"    :param x: Zustände, Form (..., {len(states)}) in der Reihenfolge von STATES.",
+        f"    :param p: Parameter, Form (..., {len(parameters)}) in der Reihenfolge von PARAMETERS.",
+        f"    :return: Array der Form (..., {len(expressions)}) in der Reihenfolge von OUTPUTS.",
+        '    """',
+        "    x = numpy.asarray(x, dtype=float)",
+        "    p = numpy.asarray(p, dtype=float)",
+        "    shape = numpy.broadcast_shapes(x.shape[:-1], p.shape[:-1])",
+    ]
+    lines += [f"    x_{i} = x[..., {i}]" for i in range(len(states))]
+    lines += [f"    p_{i} = p[..., {i}]" for i in range(len(parameters))]
+    lines += [f"    {symbol} = {printer.doprint(value)}" for symbol, value in replacements]
+    lines.append("    out = numpy.empty(shape + (%d,))" % len(reduced))
+    lines += [f"    out[..., {i}] = {printer.doprint(value)}" for i, value in enumerate(reduced)]
+    lines += ["    return out", ""]
+    return "\n".join(lines)
+
+def c_source(expressions, states, parameters, name="evaluate"):
+    """
+    Erzeugt C99-Quelltext mit dem C-Printer von SymPy.
+
+    `name(x, p, out)` berechnet einen Punkt, `name_batch(n, x, p, out)` n Punkte aus zeilenweise gespeicherten
+    Arrays der Länge n·len(states), n·len(parameters) und n·len(expressions).
+
+    :return: Quelltext als Zeichenkette.
+    """
+    replacements, reduced = _prepare(expressions, states, parameters)
+    lines = [
+        "/* Automatisch erzeugt von codegen.py. */",
+        "#include <math.h>",
+        "#include <stddef.h>",
+        "",
+        f"/* STATES: {', '.join(str(symbol) for symbol in states)} */",
+        f"/* PARAMETERS: {', '.join(str(symbol) for symbol in parameters)} */",
+        f"/* OUTPUTS: {', '.join(expressions)} */",
+        "",
+        f"void {name}(const double *x, const double *p, double *out)",
+        "{",
+    ]
+    lines += [f"    const double x_{i} = x[{i}];" for i in range(len(states))]
+    lines += [f"    const double p_{i} = p[{i}];" for i in range(len(parameters))]
+    lines += [f"    const double {symbol} = {sp.ccode(value, standard='C99')};" for symbol, value in replacements]
+    lines += [f"    out[{i}] = {sp.ccode(value, standard='C99')};" for i, value in enumerate(reduced)]
+    lines += [
+        "}",
+        "",
+        f"void {name}_batch(size_t n, const double *x, const double *p, double *out)",
+        "{",
+        "    for (size_t i = 0; i < n; i++)",
+        f"        {name}(x + i * {len(states)}, p + i * {len(parameters)}, out + i * {len(expressions)});",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+def load_module(source, module_name="generated_crn"):
+    """
+    Lädt ein mit `numpy_module_source` erzeugtes Modul aus dem Quelltext.
+    """
+    module = types.ModuleType(module_name)
+    exec(compile(source, f"<{module_name}>", "exec"), module.__dict__)
+    return module
+
+def compile_c(source, compiler=None):
+    """
+    Übersetzt C-Quelltext zu einer gemeinsam genutzten Bibliothek und lädt sie mit ctypes.
+    :param compiler: C-Compiler (Standard: $CC, cc oder gcc).
+    :return: ctypes.CDLL oder None, wenn kein Compiler gefunden wurde.
+    """
+    compiler = compiler or os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+    if not compiler:
+        return None
+    # Die geladene Bibliothek bleibt nach dem Löschen des Verzeichnisses eingeblendet
+    with tempfile.TemporaryDirectory(prefix="crn_codegen_") as directory:
+        source_path = os.path.join(directory, "generated.c")
+        library_path = os.path.join(directory, "generated.so")
+        with open(source_path, "w") as file:
+            file.write(source)
+        subprocess.run([compiler, "-O2", "-shared", "-fPIC", "-std=c99", source_path, "-o", library_path, "-lm"], check=True)
+        return ctypes.CDLL(library_path)
+
+def _random_points(states, parameters, points, seed):
+    # Positive Werte, damit Nenner und Wurzeln der Gesetze der großen Zahlen definiert bleiben
+    generator = random.Random(seed)
+    return [
+        ([generator.uniform(0.5, 2.0) for _ in states], [generator.uniform(0.5, 2.0) for _ in parameters])
+        for _ in range(points)
+    ]
+
+def check_generated(expressions, states, parameters, source=None, c_code=None, points=20, seed=0, rtol=1e-8, name="evaluate"):
+    """
+    Vergleicht erzeugten Code an zufälligen Punkten mit der symbolischen Auswertung der Ausdrücke.
+
+    :param expressions: Dictionary {Name der Ausgabe: SymPy-Ausdruck}.
+    :param states: Liste der Zustandssymbole.
+    :param parameters: Liste der Parametersymbole.
+    :param source: Quelltext aus `numpy_module_source` (optional).
+    :param c_code: Quelltext aus `c_source` (optional; wird nur geprüft, wenn ein C-Compiler vorhanden ist).
+    :param points: Anzahl der zufälligen Punkte.
+    :param seed: Startwert des Zufallsgenerators.
+    :param rtol: Zulässiger relativer Fehler.
+    :param name: Name der erzeugten Funktion.
+    :return: Dictionary {Backend: {"points", "max_error", "ok"}}.
+    """
+    import numpy
+
+    samples = _random_points(states, parameters, points, seed)
+    expected = numpy.array([
+        [
+            float(sp.N(sp.sympify(expression).subs(dict(zip(states, x)) | dict(zip(parameters, p)))))
+            for expression in expressions.values()
+        ]
+        for x, p in samples
+    ]).reshape(points, len(expressions))
+    x = numpy.array([x for x, _ in samples], dtype=float).reshape(points, len(states))
+    p = numpy.array([p for _, p in samples], dtype=float).reshape(points, len(parameters))
+
+    results = {}
+    if source is not None:
+        results["numpy"] = getattr(load_module(source), name)(x, p)
+    if c_code is not None:
+        library = compile_c(c_code)
+        if library is not None:
+            out = numpy.zeros((points, len(expressions)))
+            pointer = ctypes.POINTER(ctypes.c_double)
+            getattr(library, f"{name}_batch")(
+                ctypes.c_size_t(points),
+                numpy.ascontiguousarray(x).ctypes.data_as(pointer),
+                numpy.ascontiguousarray(p).ctypes.data_as(pointer),
+                out.ctypes.data_as(pointer),
+            )
+            results["c"] = out
+
+    report = {}
+    for backend, values in results.items():
+        error = numpy.abs(values - expected) / numpy.maximum(numpy.abs(expected), 1.0)
+        max_error = float(error.max()) if error.size else 0.0
+        report[backend] = {"points": points, "max_error": max_error, "ok": bool(max_error <= rtol)}
+    return report
+
+def collect_expressions(file_path, kind="generator", eliminate=None):
+    """
+    Berechnet die zu übersetzenden Koeffizienten eines Netzwerks.
+
+    - "generator": Koeffizienten von df_S in Hᴺf (generator.GeneratorQuery).
+    - "lln": Drift des Gesetzes der großen Zahlen, d. h. die Koeffizienten von fp_i in crn_lln.
+    - "clt": Drift (fp_i) und Diffusion (fpp_ij) des zentralen Grenzwertsatzes aus crn_clt.
+
+    :param file_path: Netzwerkdatei (.yaml, .json oder .crnb).
+    :param kind: "generator", "lln" oder "clt".
+    :param eliminate: Zu eliminierende Indizes für crn_lln/crn_clt (siehe dort).
+    :return: Dictionary {Name der Ausgabe: SymPy-Ausdruck}.
+    :raises ValueError: Wenn "lln" oder "clt" für ein Netzwerk mit symbolischen Skalierungen verlangt wird.
+    """
+    if kind == "generator":
+        import generator
+        from compiled_network import load_network
+
+        data = load_network(file_path)
+        slow_species = data["species"]["slow"]
+        fast_species = data["species"]["fast"]
+        derivatives = generator.init_slow_symbolic_derivatives(slow_species)
+        query = generator.GeneratorQuery(
+            data, sp.Symbol(data.get("natnum", "N")), slow_species, fast_species,
+            generator.init_slow_symbolic_variables(slow_species), derivatives,
+        )
+        expressions = {str(derivatives[slow]): coefficient for slow, coefficient in query.coefficients().items()}
+    else:
+        import network_formats
+
+        network = network_formats.read_network(file_path)
+        symbolic = sorted({
+            str(reaction["scale"]) for reaction in network_formats.to_yaml_dict(network)["reactions"]
+            if not str(reaction["scale"]).lstrip("-").isdigit()
+        })
+        if symbolic:
+            raise ValueError(f"-k {kind} needs integer scales for every reaction (crn_lln/crn_clt), "
+                             f"found {', '.join(symbolic)}; use -k generator for symbolic scales")
+        if kind == "lln":
+            mu = network_formats.crn_lln(network, eliminate=eliminate, verbose=False)
+            first = sorted((symbol for symbol in mu.free_symbols if re.match(r"^fp\d+$", symbol.name)), key=_sort_key)
+            expressions = {str(symbol): sp.simplify(mu.diff(symbol)) for symbol in first}
+        else:
+            drift, sigma = network_formats.crn_clt(network, eliminate=eliminate, verbose=False)
+            expressions = {str(symbol): value for symbol, value in list(drift.items()) + list(sigma.items())}
+    return integer_scales(expressions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate NumPy/C code for generator, LLN and CLT coefficients.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("-k", "--kind", choices=KINDS, default="generator")
+    parser.add_argument("-o", "--output", help="Python module to write (default: stdout)")
+    parser.add_argument("-c", "--c-output", help="also write C99 source to this file")
+    parser.add_argument("-n", "--name", default="evaluate", help="name of the generated function")
+    parser.add_argument("-e", "--eliminate", type=int, nargs="+", help="indices to eliminate (crn_lln/crn_clt)")
+    parser.add_argument("--check", type=int, default=0, metavar="POINTS",
+                        help="compare the generated code with the symbolic result at POINTS random points")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    try:
+        expressions = collect_expressions(args.input, args.kind, args.eliminate)
+    except ValueError as error:
+        sys.exit(f"❌ {error}")
+    states, parameters = split_symbols(expressions)
+    source = numpy_module_source(expressions, states, parameters, args.name)
+    c_code = c_source(expressions, states, parameters, args.name) if args.c_output else None
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(source)
+    else:
+        sys.stdout.write(source)
+    if c_code is not None:
+        with open(args.c_output, "w") as file:
+            file.write(c_code)
+    if args.check:
+        report = check_generated(expressions, states, parameters, source, c_code, args.check, name=args.name)
+        for backend, result in report.items():
+            print(f"{'✅' if result['ok'] else '❌'} {backend}: max. relative error {result['max_error']:.2e} "
+                  f"at {result['points']} points", file=sys.stderr)
+        if not all(result["ok"] for result in report.values()):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+import yaml
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+# Dateiformat (.crnb):
+#   8 Byte Magic | 8 Byte Headerlänge (little endian) | Header als JSON | Arrays, jeweils auf 64 Byte ausgerichtet
+MAGIC = b"CRNB0001"
+ALIGNMENT = 64
+
+# Kennzeichnung der Spezies wie bei scaling_species in functions_for_LLN_CLT: 1 = langsam, 0 = schnell
+SPECIES_SLOW = 1
+SPECIES_FAST = 0
+SPECIES_UNDECLARED = -1
+
+ARRAY_DTYPES = {
+    "species_kind": "<i1",
+    "rate_index": "<i4",
+    "scale_index": "<i4",
+    "educt_indptr": "<i8",
+    "educt_species": "<i4",
+    "educt_coeff": "<i4",
+    "product_indptr": "<i8",
+    "product_species": "<i4",
+    "product_coeff": "<i4",
+}
+
+
+def load_text_network(file_path):
+    """
+    Lädt ein Netzwerk im YAML- oder JSON-Format (wie crn.yaml bzw. die Ausgabe von yamljsonconvert.py).
+    Für YAML wird der C-Loader verwendet, falls verfügbar.
+    :param file_path: Pfad zur Datei.
+    :return: Dictionary mit den Netzwerkdaten.
+    """
+    with open(file_path, "r") as file:
+        if file_path.endswith(".json"):
+            return json.load(file)
+        return yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+def _intern(table, index, value):
+    """
+    Gibt den Index von value in table zurück und hängt value bei Bedarf an.
+    """
+    if value not in index:
+        index[value] = len(table)
+        table.append(value)
+    return index[value]
+
+def _compile_stoichiometry(reactions, key, species_index, species):
+    """
+    Erzeugt die CSR-Darstellung (indptr, species, coeff) der Edukte oder Produkte aller Reaktionen.
+    """
+    indptr = np.zeros(len(reactions) + 1, dtype=np.int64)
+    species_ids = []
+    coeffs = []
+    for j, reaction in enumerate(reactions):
+        entries = reaction.get(key) or {}
+        # Einträge nach Speziesindex sortiert, damit gleiche Netzwerke unabhängig von der Schlüsselreihenfolge gleich sind
+        for s, coeff in sorted((_intern(species, species_index, name), int(coeff)) for name, coeff in entries.items() if coeff):
+            species_ids.append(s)
+            coeffs.append(coeff)
+        indptr[j + 1] = len(species_ids)
+    return indptr, np.array(species_ids, dtype=np.int32), np.array(coeffs, dtype=np.int32)
+
+def content_hash(network):
+    """
+    Berechnet den inhaltsbasierten SHA-256-Hash eines kompilierten Netzwerks (Header ohne Hash und alle Arrays).
+    :param network: Kompiliertes Netzwerk.
+    :return: Hexstring.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(_header_fields(network), sort_keys=True).encode())
+    for name in ARRAY_DTYPES:
+        digest.update(np.ascontiguousarray(network[name], dtype=ARRAY_DTYPES[name]).tobytes())
+    return digest.hexdigest()
+
+def _header_fields(network):
+    fields = {
+        "name": network["name"],
+        "natnum": network["natnum"],
+        "species": list(network["species"]),
+        "rates": list(network["rates"]),
+        "scales": list(network["scales"]),
+    }
+    # Reaktionsnamen nur, wenn vorhanden, damit sich bestehende Hashes nicht ändern
+    if network.get("reaction_names") is not None:
+        fields["reaction_names"] = list(network["reaction_names"])
+    return fields
+
+def compile_network(data):
+    """
+    Kompiliert ein Netzwerk-Dictionary (Format von crn.yaml) in eine kompakte, array-basierte Darstellung.
+
+    Edukte und Produkte werden als dünnbesetzte Stöchiometrie im CSR-Format abgelegt
+    (`*_indptr`, `*_species`, `*_coeff`), Raten und Skalierungen als Tabellen mit Indexarrays.
+    Spezies, die in Reaktionen vorkommen, aber weder als langsam noch als schnell deklariert sind,
+    werden mit SPECIES_UNDECLARED markiert.
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :return: Dictionary mit NumPy-Arrays, Tabellen und `content_hash`.
+    """
+    slow_species = data.get("species", {}).get("slow", []) or []
+    fast_species = data.get("species", {}).get("fast", []) or []
+    species, kinds = [], []
+    for name in slow_species:
+        species.append(name)
+        kinds.append(SPECIES_SLOW)
+    for name in fast_species:
+        if name not in species:
+            species.append(name)
+            kinds.append(SPECIES_FAST)
+    return build_network(data.get("name", ""), data.get("natnum", "N"), species, kinds, data.get("reactions", []) or [])
+
+def build_network(name, natnum, species, species_kind, reactions, reaction_names=None):
+    """
+    Erzeugt ein kompiliertes Netzwerk aus Spezies in vorgegebener Reihenfolge und Reaktionen
+    im Format von crn.yaml (educts/products als Dictionaries, rate, scale).
+
+    Weitere in den Reaktionen vorkommende Spezies werden hinten angehängt und mit SPECIES_UNDECLARED markiert.
+
+    :param name: Name des Netzwerks.
+    :param natnum: Name des Skalierungsparameters.
+    :param species: Liste der Spezies.
+    :param species_kind: SPECIES_SLOW/SPECIES_FAST je Spezies.
+    :param reactions: Liste der Reaktionen.
+    :param reaction_names: Optionale Namen der Reaktionen (werden nur gespeichert, wenn angegeben).
+    :return: Kompiliertes Netzwerk.
+    """
+    species = list(species)
+    species_index = {s: i for i, s in enumerate(species)}
+    kinds = list(species_kind)
+
+    rates, rate_lookup = [], {}
+    scales, scale_lookup = [], {}
+    rate_index = np.array([_intern(rates, rate_lookup, str(r.get("rate", ""))) for r in reactions], dtype=np.int32)
+    scale_index = np.array([_intern(scales, scale_lookup, str(r.get("scale", ""))) for r in reactions], dtype=np.int32)
+
+    educt_indptr, educt_species, educt_coeff = _compile_stoichiometry(reactions, "educts", species_index, species)
+    product_indptr, product_species, product_coeff = _compile_stoichiometry(reactions, "products", species_index, species)
+    kinds += [SPECIES_UNDECLARED] * (len(species) - len(kinds))
+
+    network = {
+        "name": name,
+        "natnum": natnum,
+        "species": species,
+        "rates": rates,
+        "scales": scales,
+        "species_kind": np.array(kinds, dtype=np.int8),
+        "rate_index": rate_index,
+        "scale_index": scale_index,
+        "educt_indptr": educt_indptr,
+        "educt_species": educt_species,
+        "educt_coeff": educt_coeff,
+        "product_indptr": product_indptr,
+        "product_species": product_species,
+        "product_coeff": product_coeff,
+    }
+    if reaction_names is not None:
+        network["reaction_names"] = [str(n) for n in reaction_names]
+    network["content_hash"] = content_hash(network)
+    return network
+
+def save_network_binary(network, file_path):
+    """
+    Speichert ein kompiliertes Netzwerk als .crnb-Datei, deren Arrays per mmap ohne Kopie geladen werden können.
+    :param network: Kompiliertes Netzwerk (siehe `compile_network`).
+    :param file_path: Zielpfad.
+    """
+    arrays = {name: np.ascontiguousarray(network[name], dtype=dtype) for name, dtype in ARRAY_DTYPES.items()}
+    header = dict(_header_fields(network), content_hash=network.get("content_hash") or content_hash(network), arrays={})
+
+    # Offsets relativ zum Beginn des Datenbereichs
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"offset": offset, "count": int(array.size)}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header_bytes = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+
+    with open(file_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(header_bytes).to_bytes(8, "little"))
+        file.write(header_bytes)
+        file.write(b"\0" * (data_start - file.tell()))
+        for name, array in arrays.items():
+            file.write(array.tobytes())
+            file.write(b"\0" * (-array.nbytes % ALIGNMENT))
+
+def load_network_binary(file_path, use_mmap=True):
+    """
+    Lädt eine .crnb-Datei. Mit use_mmap=True sind die Arrays schreibgeschützte Sichten auf die
+    speichereingeblendete Datei, sodass mehrere Worker-Prozesse dieselben Seiten ohne Kopie teilen.
+    :param file_path: Pfad zur .crnb-Datei.
+    :param use_mmap: Arrays per mmap einblenden statt einzulesen.
+    :return: Kompiliertes Netzwerk.
+    """
+    with open(file_path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not a compiled CRN file")
+        header_length = int.from_bytes(file.read(8), "little")
+        header = json.loads(file.read(header_length))
+        data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+        if use_mmap:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            file.seek(0)
+            buffer = file.read()
+
+    network = {key: header[key] for key in ("name", "natnum", "species", "rates", "scales", "content_hash")}
+    if "reaction_names" in header:
+        network["reaction_names"] = header["reaction_names"]
+    for name, dtype in ARRAY_DTYPES.items():
+        info = header["arrays"][name]
+        network[name] = np.frombuffer(buffer, dtype=dtype, count=info["count"], offset=data_start + info["offset"])
+    return network
+
+def network_to_dict(network):
+    """
+    Wandelt ein kompiliertes Netzwerk zurück in das Dictionary-Format von crn.yaml, wie es generator.py erwartet.
+    :param network: Kompiliertes Netzwerk.
+    :return: Dictionary mit den Reaktionsdaten.
+    """
+    species = network["species"]
+    kind = network["species_kind"]
+    rates = network["rates"]
+    scales = network["scales"]
+
+    def side(prefix, j):
+        start, end = network[f"{prefix}_indptr"][j], network[f"{prefix}_indptr"][j + 1]
+        return {
+            species[s]: int(c)
+            for s, c in zip(network[f"{prefix}_species"][start:end], network[f"{prefix}_coeff"][start:end])
+        }
+
+    reactions = [
+        {
+            "educts": side("educt", j),
+            "products": side("product", j),
+            "rate": rates[network["rate_index"][j]],
+            "scale": scales[network["scale_index"][j]],
+        }
+        for j in range(len(network["rate_index"]))
+    ]
+    return {
+        "name": network["name"],
+        "natnum": network["natnum"],
+        "species": {
+            "slow": [s for s, k in zip(species, kind) if k == SPECIES_SLOW],
+            "fast": [s for s, k in zip(species, kind) if k == SPECIES_FAST],
+        },
+        "reactions": reactions,
+    }
+
+def network_to_stoichiometry(network):
+    """
+    Erzeugt die Edukt- und Produktmatrix (Spezies x Reaktionen) eines kompilierten Netzwerks als SymPy-Matrizen.
+    :param network: Kompiliertes Netzwerk.
+    :return: Tupel (educts, products).
+    """
+    from sympy import Matrix
+
+    def dense(prefix):
+        matrix = np.zeros((len(network["species"]), len(network["rate_index"])), dtype=np.int64)
+        indptr = network[f"{prefix}_indptr"]
+        columns = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        np.add.at(matrix, (network[f"{prefix}_species"], columns), network[f"{prefix}_coeff"])
+        return Matrix(matrix.tolist())
+
+    return dense("educt"), dense("product")
+
+def network_to_matrices(network):
+    """
+    Erzeugt aus einem kompilierten Netzwerk die Matrixdarstellung für crn_lln/crn_clt aus functions_for_LLN_CLT.
+    Die Skalierungen müssen dafür ganzzahlig sein.
+    :param network: Kompiliertes Netzwerk.
+    :return: Tupel (network_name, species, educts, products, scaling_species, scaling_rates).
+    """
+    try:
+        scaling_rates = [int(network["scales"][i]) for i in network["scale_index"]]
+    except ValueError:
+        raise ValueError("crn_lln/crn_clt require integer scales for every reaction")
+    scaling_species = [int(k == SPECIES_SLOW) for k in network["species_kind"]]
+    educts, products = network_to_stoichiometry(network)
+    return network["name"], list(network["species"]), educts, products, scaling_species, scaling_rates
+
+def load_network(file_path):
+    """
+    Lädt ein Netzwerk aus einer .yaml-, .json- oder .crnb-Datei im Dictionary-Format von crn.yaml.
+    JSON-Dateien im Format von MM.json oder JSON_init werden dabei umgewandelt (siehe network_formats).
+    :param file_path: Pfad zur Datei.
+    :return: Dictionary mit den Reaktionsdaten.
+    """
+    if file_path.endswith(".crnb"):
+        return network_to_dict(load_network_binary(file_path))
+    data = load_text_network(file_path)
+    from network_formats import READERS, detect_format
+
+    fmt = detect_format(data)
+    if fmt != "yaml":
+        return network_to_dict(READERS[fmt](data))
+    return data
+
+def convert_to_binary(source_path, target_path=None):
+    """
+    Konvertiert eine YAML- oder JSON-Netzwerkdatei (auch im Format von MM.json oder JSON_init, siehe `load_network`)
+    in das Binärformat.
+    :param source_path: Pfad zur Quelldatei.
+    :param target_path: Zielpfad (Standard: Quellpfad mit Endung .crnb).
+    :return: Der verwendete Zielpfad.
+    """
+    if target_path is None:
+        target_path = os.path.splitext(source_path)[0] + ".crnb"
+    save_network_binary(compile_network(load_network(source_path)), target_path)
+    return target_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python compiled_network.py <network.yaml|network.json> [target.crnb]")
+    target = convert_to_binary(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"✅ Saved compiled network to {target}")
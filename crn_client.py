@@ -0,0 +1,122 @@
+import http.client
+import json
+import os
+import socket
+
+from lazy_import import lazy_import
+
+sp = lazy_import("sympy")
+
+# Adresse des Servers, z. B. "http://127.0.0.1:8765" oder "unix:/tmp/crn.sock"
+DEFAULT_ADDRESS = os.environ.get("CRN_SERVER", "http://127.0.0.1:8765")
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _connection(address, timeout=None):
+    if address.startswith("unix:"):
+        return _UnixHTTPConnection(address[len("unix:"):], timeout=timeout)
+    host_port = address.split("://", 1)[-1].rstrip("/")
+    return http.client.HTTPConnection(host_port, timeout=timeout)
+
+def request(path, payload=None, address=None, timeout=None):
+    """
+    Sendet eine Anfrage an crn_server.py und gibt die JSON-Antwort zurück.
+    :param path: z. B. "/generator" oder "/stats".
+    :param payload: JSON-serialisierbare Jobparameter (None = GET).
+    :param address: Serveradresse (Standard: Umgebungsvariable CRN_SERVER).
+    :param timeout: Timeout in Sekunden (None = unbegrenzt).
+    :return: Dekodierte JSON-Antwort.
+    """
+    connection = _connection(address or DEFAULT_ADDRESS, timeout)
+    try:
+        if payload is None:
+            connection.request("GET", path)
+        else:
+            connection.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        body = json.loads(response.read())
+    finally:
+        connection.close()
+    if "error" in body:
+        raise RuntimeError(body["error"])
+    return body
+
+def _matrix_to_list(matrix):
+    return [[int(matrix[i, j]) for j in range(matrix.shape[1])] for i in range(matrix.shape[0])]
+
+def total_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables=None, slow_symbolic_derivatives=None, coalesce=False, *, by_sub_crns=False, address=None):
+    """
+    Wie generator.total_sum_of_reactions (gleiche Reihenfolge der Parameter bis coalesce), aber auf dem Server
+    berechnet. Die symbolischen Variablen werden serverseitig nach denselben Konventionen (v_{S}, df_{S}) erzeugt und
+    sind nur aus Kompatibilitätsgründen Parameter.
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen (siehe generator.coalesce_reactions).
+    :param by_sub_crns: Generator pro Sub-CRN berechnen (siehe generator.total_sum_of_reactions_by_sub_crns).
+    :return: Der vereinfachte approximierte Generator als SymPy-Ausdruck.
+    """
+    data = dict(data, natnum=str(natnum), species={"slow": list(slow_species), "fast": list(fast_species)})
+    result = request("/generator", {"data": data, "by_sub_crns": by_sub_crns, "coalesce": coalesce}, address)["result"]
+    return sp.sympify(result["srepr"])
+
+def total_sum_of_file(file_path, by_sub_crns=False, coalesce=False, address=None):
+    """
+    Berechnet Hᴺf für eine Netzwerkdatei, die der Server selbst lädt und zwischenspeichert.
+    :return: Der vereinfachte approximierte Generator als SymPy-Ausdruck.
+    """
+    payload = {"path": os.path.abspath(file_path), "by_sub_crns": by_sub_crns, "coalesce": coalesce}
+    result = request("/generator", payload, address)["result"]
+    return sp.sympify(result["srepr"])
+
+def _matrix_payload(network_name, species, educts, products, scaling_species, scaling_rates, eliminate):
+    return {
+        "network_name": network_name,
+        "species": list(species),
+        "educts": _matrix_to_list(educts),
+        "products": _matrix_to_list(products),
+        "scaling_species": [int(s) for s in scaling_species],
+        "scaling_rates": [int(r) for r in scaling_rates],
+        "eliminate": None if eliminate is None else [int(i) for i in eliminate],
+    }
+
+def crn_lln(network_name, species, educts, products, scaling_species, scaling_rates, eliminate=None, verbose=True, address=None):
+    """
+    Wie functions_for_LLN_CLT.crn_lln, aber auf dem Server berechnet. Da der Server nicht nachfragen kann,
+    müssen die zu eliminierenden Indizes über eliminate angegeben werden, falls sie benötigt werden.
+    :return: Der LLN-Grenzgenerator als SymPy-Ausdruck.
+    """
+    payload = _matrix_payload(network_name, species, educts, products, scaling_species, scaling_rates, eliminate)
+    result = sp.sympify(request("/lln", payload, address)["result"]["srepr"])
+    if verbose:
+        print(f'The LLN of the {network_name} is \n {result}')
+    return result
+
+def crn_clt(network_name, species, educts, products, scaling_species, scaling_rates, eliminate=None, verbose=True, address=None):
+    """
+    Wie functions_for_LLN_CLT.crn_clt, aber auf dem Server berechnet.
+    :return: Tupel (drift, sigma) von Dictionaries {Symbol: Ausdruck}.
+    """
+    payload = _matrix_payload(network_name, species, educts, products, scaling_species, scaling_rates, eliminate)
+    result = request("/clt", payload, address)["result"]
+    drift = {sp.Symbol(key): sp.sympify(value) for key, value in result["drift"].items()}
+    sigma = {sp.Symbol(key): sp.sympify(value) for key, value in result["sigma"].items()}
+    if verbose:
+        for key, value in drift.items():
+            print(f'The drift-proportion of {key} is {value}.')
+        for key, value in sigma.items():
+            print(f'The sigma-proportion of {key} is {value}.')
+    return drift, sigma
+
+def stats(address=None):
+    """
+    Gibt Cache- und Auslastungsstatistiken des Servers zurück.
+    """
+    return request("/stats", address=address)
@@ -0,0 +1,299 @@
+import argparse
+import hashlib
+import json
+import os
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from worker_pool import JobFailed, WorkerPool, parse_memory
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class LRUCache:
+    """
+    Threadsicherer LRU-Cache mit fester Maximalgröße.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _init_worker():
+    """
+    Lädt SymPy und die Engines einmal pro Worker-Prozess. Eingaben von stdin sind im Server nicht möglich,
+    fehlende eliminate-Indizes führen daher zu einem Fehler statt zu einer blockierenden Abfrage.
+    """
+    sys.stdin = open(os.devnull)
+    sys.stdout = open(os.devnull, "w")
+    import sympy  # noqa: F401
+    import generator  # noqa: F401
+    import functions_for_LLN_CLT  # noqa: F401
+
+def run_generator_job(data, by_sub_crns=False, coalesce=False):
+    """
+    Berechnet den approximierten Generator Hᴺf für ein Netzwerk-Dictionary (Format von crn.yaml).
+    :return: Dictionary mit dem Ergebnis als srepr und str.
+    """
+    import sympy as sp
+    import generator
+
+    slow_species = data["species"]["slow"]
+    fast_species = data["species"]["fast"]
+    natnum = sp.Symbol(data.get("natnum", "N"))
+    args = (
+        data, natnum, slow_species, fast_species,
+        generator.init_slow_symbolic_variables(slow_species),
+        generator.init_slow_symbolic_derivatives(slow_species),
+    )
+    if by_sub_crns:
+        result = generator.total_sum_of_reactions_by_sub_crns(*args, max_workers=1, coalesce=coalesce)
+    else:
+        result = generator.total_sum_of_reactions(*args, coalesce=coalesce)
+    return {"srepr": sp.srepr(result), "str": str(result)}
+
+def run_lln_job(network_name, species, educts, products, scaling_species, scaling_rates, eliminate=None):
+    """
+    Führt crn_lln für die Matrixdarstellung (Listen von Listen, Spezies x Reaktionen) aus.
+    :return: Dictionary mit dem Ergebnis als srepr und str.
+    """
+    import sympy as sp
+    from functions_for_LLN_CLT import crn_lln
+
+    try:
+        result = crn_lln(network_name, species, sp.Matrix(educts), sp.Matrix(products), scaling_species, scaling_rates,
+                         eliminate=eliminate, verbose=False)
+    except EOFError:
+        raise ValueError("this network needs the 'eliminate' indices of the slow species to eliminate")
+    return {"srepr": sp.srepr(result), "str": str(result)}
+
+def run_clt_job(network_name, species, educts, products, scaling_species, scaling_rates, eliminate=None):
+    """
+    Führt crn_clt für die Matrixdarstellung aus.
+    :return: Dictionary mit Drift- und Sigma-Anteilen (Schlüssel als str, Werte als srepr).
+    """
+    import sympy as sp
+    from functions_for_LLN_CLT import crn_clt
+
+    try:
+        drift, sigma = crn_clt(network_name, species, sp.Matrix(educts), sp.Matrix(products), scaling_species, scaling_rates,
+                               eliminate=eliminate, verbose=False)
+    except EOFError:
+        raise ValueError("this network needs the 'eliminate' indices of the slow species to eliminate")
+    return {
+        "drift": {str(key): sp.srepr(value) for key, value in drift.items()},
+        "sigma": {str(key): sp.srepr(value) for key, value in sigma.items()},
+    }
+
+JOBS = {
+    "generator": run_generator_job,
+    "lln": run_lln_job,
+    "clt": run_clt_job,
+}
+
+
+class ComputeService:
+    """
+    Hält einen Pool vorgewärmter Worker-Prozesse (mit Speicher- und CPU-Grenzen, siehe worker_pool), einen LRU-Cache
+    der Ergebnisse und geladenen Netzwerke und führt identische gleichzeitige Anfragen nur einmal aus.
+    """
+
+    def __init__(self, max_workers=None, cache_size=1024, max_memory=None, max_cpu=None):
+        self.executor = WorkerPool(max_workers, max_memory, max_cpu, initializer=_init_worker)
+        self.results = LRUCache(cache_size)
+        self.networks = LRUCache(cache_size)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def load_network(self, file_path):
+        """
+        Lädt eine Netzwerkdatei in das einheitliche Modell aus network_formats,
+        zwischengespeichert nach Pfad und Änderungszeit.
+        """
+        from network_formats import read_network
+
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        network = self.networks.get(key)
+        if network is None:
+            network = read_network(file_path)
+            self.networks.put(key, network)
+        return network
+
+    def _params_from_path(self, kind, params):
+        # Ersetzt "path" durch die Eingabe des Jobs, abgeleitet aus dem einmal geladenen Netzwerk
+        from network_formats import to_matrices, to_yaml_dict
+
+        params = dict(params)
+        network = self.load_network(params.pop("path"))
+        if kind == "generator":
+            params["data"] = to_yaml_dict(network)
+        else:
+            name, species, educts, products, scaling_species, scaling_rates = to_matrices(network)
+            params.update(
+                network_name=name, species=species, educts=[[int(x) for x in row] for row in educts.tolist()],
+                products=[[int(x) for x in row] for row in products.tolist()],
+                scaling_species=scaling_species, scaling_rates=scaling_rates,
+            )
+        return params
+
+    def submit(self, kind, params):
+        """
+        Führt einen Job aus oder liefert das zwischengespeicherte Ergebnis.
+        :param kind: "generator", "lln" oder "clt".
+        :param params: Schlüsselwortargumente des Jobs (JSON-serialisierbar).
+        :return: Ergebnis-Dictionary.
+        """
+        if kind not in JOBS:
+            raise ValueError(f"Unknown job '{kind}'")
+        if "path" in params:
+            params = self._params_from_path(kind, params)
+
+        key = hashlib.sha256(json.dumps([kind, params], sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            # Unter der Sperre prüfen, damit ein gerade fertig gewordener Job nicht erneut gestartet wird
+            cached = self.results.get(key)
+            if cached is not None:
+                return cached
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self.executor.submit(JOBS[kind], **params)
+                self._in_flight[key] = future
+        try:
+            result = future.result()
+            self.results.put(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self):
+        return {
+            "results": {"size": len(self.results), "hits": self.results.hits, "misses": self.results.misses},
+            "networks": {"size": len(self.networks)},
+            "in_flight": len(self._in_flight),
+            "workers": self.executor.stats(),
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON-Schnittstelle: POST /generator, /lln, /clt mit den Jobparametern als JSON, GET /stats.
+    Statt der Netzwerkdaten kann jeweils "path" (eine Datei in einem der Formate aus network_formats) angegeben werden.
+    """
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._reply(200, self.server.service.stats())
+        else:
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        kind = self.path.strip("/")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+            self._reply(200, {"result": self.server.service.submit(kind, params)})
+        except JobFailed as error:
+            self._reply(503, {"error": f"{type(error).__name__}: {error}", "reason": error.reason})
+        except Exception as error:
+            self._reply(400 if isinstance(error, (ValueError, KeyError, TypeError)) else 500,
+                        {"error": f"{type(error).__name__}: {error}"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, max_workers=None, cache_size=1024, verbose=False,
+          max_memory=None, max_cpu=None):
+    """
+    Startet den Rechenserver auf localhost (HTTP/JSON) oder auf einem Unix-Socket und blockiert bis Strg+C.
+    :param host: Hostname für HTTP.
+    :param port: Port für HTTP.
+    :param socket_path: Pfad eines Unix-Sockets (hat Vorrang vor host/port).
+    :param max_workers: Anzahl der Worker-Prozesse.
+    :param cache_size: Maximale Anzahl der zwischengespeicherten Ergebnisse.
+    :param verbose: Anfragen protokollieren.
+    :param max_memory: Speichergrenze pro Worker in Bytes (None = unbegrenzt).
+    :param max_cpu: CPU-Zeit pro Job in Sekunden (None = unbegrenzt).
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.service = ComputeService(max_workers, cache_size, max_memory, max_cpu)
+    server.verbose = verbose
+    print(f"✅ Serving on {socket_path or f'http://{host}:{port}'}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-lived compute server for generator, LLN and CLT jobs.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="serve on this Unix socket instead of TCP")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("--max-memory", type=parse_memory, help="address-space limit per worker, e.g. 4G")
+    parser.add_argument("--max-cpu", type=float, help="CPU-time limit per job in seconds")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.socket, args.jobs, args.cache_size, args.verbose, args.max_memory, args.max_cpu)
@@ -0,0 +1,282 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import telemetry
+from functions_for_LLN_CLT import conservation_laws, crn_lln, default_eliminate
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+sp = lazy_import("sympy")
+
+
+def _clear_caches():
+    # Beide Engines sollen kalt starten: Determinanten-Cache von generator, Knotenergebnisse und SymPy-Cache leeren
+    import generator
+    import task_graph
+    from sympy.core.cache import clear_cache
+
+    generator.clear_determinant_cache()
+    task_graph.clear_cache()
+    clear_cache()
+
+def measure(function, *args, memory=True, **kwargs):
+    """
+    Führt eine Engine zweimal mit leeren Caches aus: einmal für die Laufzeit und (mit memory=True) einmal unter
+    tracemalloc für den Spitzenwert des Speichers, da tracemalloc die Laufzeit verfälscht.
+    :return: Tupel (Ergebnis, {"time": Sekunden, "peak_memory": Bytes oder None}).
+    """
+    _clear_caches()
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    cost = {"time": time.perf_counter() - start, "peak_memory": None}
+    if memory:
+        _clear_caches()
+        tracemalloc.start()
+        try:
+            function(*args, **kwargs)
+            cost["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, cost
+
+def effective_exponents(data, scales=None):
+    """
+    Bestimmt je Reaktion den Exponenten g der skalierten Rate k·N**g auf der Zeitskala der langsamen Spezies wie in
+    generator.compute_scaled_rate: g = scale - 1 + Summe der Koeffizienten der langsamen Edukte.
+    :param data: Dictionary mit den Reaktionsdaten (Skalierungen wie in generator.py).
+    :param scales: Werte symbolischer Skalierungen {Name: ganze Zahl}.
+    :return: Liste der Exponenten in der Reihenfolge der Reaktionen.
+    :raises ValueError: Wenn eine symbolische Skalierung keinen Wert hat.
+    """
+    import generator
+
+    scales = scales or {}
+    slow_species = data["species"]["slow"]
+    exponents = []
+    for reaction in data["reactions"]:
+        scale = str(reaction["scale"])
+        if scale not in scales and not scale.lstrip("-").isdigit():
+            raise ValueError(f"symbolic scale '{scale}' needs a value")
+        value = int(scales.get(scale, scale))
+        exponents.append(value - 1 + generator.sum_slow_educt_coefficients(reaction, slow_species))
+    return exponents
+
+def lln_scaling_rates(exponents):
+    """
+    Übersetzt die Exponenten aus `effective_exponents` in scaling_rates für crn_lln, das die Raten unabhängig von
+    den Edukten mit N**max(0, s - 1) skaliert: s = g + 1.
+    :raises ValueError: Für g < 0 (die Reaktion verschwindet für N → ∞, crn_lln skaliert sie mit N**0).
+    """
+    vanishing = [j for j, exponent in enumerate(exponents) if exponent < 0]
+    if vanishing:
+        raise ValueError(f"reactions {vanishing} vanish as N → ∞ (negative exponent), which crn_lln cannot express")
+    return [exponent + 1 for exponent in exponents]
+
+def generator_scales(educts, scaling_species, scaling_rates):
+    """
+    Übersetzt scaling_rates von crn_lln (Matrixdarstellung wie in examples.py) in Skalierungen für generator.py mit
+    demselben Exponenten: scale = max(0, s - 1) + 1 - Summe der Koeffizienten der langsamen Edukte.
+    :return: Liste ganzer Zahlen in der Reihenfolge der Reaktionen.
+    """
+    slow_index = [i for i, kind in enumerate(scaling_species) if kind == 1]
+    return [
+        max(0, int(rate) - 1) + 1 - sum(int(educts[i, j]) for i in slow_index)
+        for j, rate in enumerate(scaling_rates)
+    ]
+
+def compare(network, eliminate=None, points=20, seed=0, rtol=1e-8, memory=True, scales=None):
+    """
+    Berechnet die Drift mit generator.total_sum_of_reactions und mit crn_lln und vergleicht die Koeffizienten von
+    df_S bzw. fp{i} an zufälligen Punkten (Raten und langsame Spezies gleichverteilt in [0.5, 2]).
+
+    Die Skalierungen des Netzwerks gelten wie in generator.py; crn_lln erhält die nach `lln_scaling_rates`
+    übersetzten scaling_rates, sodass beide Engines jede Rate mit demselben N**g skalieren. Symbolische
+    Skalierungen (z. B. b1 in kk1.yaml) werden dazu durch ganze Zahlen ersetzt (Standard 1).
+
+    Vom Generator wird nach dem Einsetzen eines Punktes der Grenzwert N → ∞ genommen, wie in crn_lln. Die Konstanten
+    M{i} von crn_lln werden aus den langsamen Spezies des Punktes berechnet. Erhaltungsgrößen nur schneller Spezies
+    kann generator.py nicht abbilden (det(M) = 0); solche Netzwerke gelten ebenso wie Reaktionen mit negativem
+    Exponenten als "not_comparable".
+
+    :param network: Kompiliertes Netzwerk (network_formats).
+    :param eliminate: Indizes für crn_lln (Standard: functions_for_LLN_CLT.default_eliminate).
+    :param scales: Werte symbolischer Skalierungen {Name: ganze Zahl}; fehlende werden auf 1 gesetzt.
+    :return: Dictionary mit status ("ok", "mismatch", "not_comparable", "error"), max_error, Laufzeit und Speicher
+             beider Engines und der schnelleren Engine.
+    """
+    from partition_scan import fast_matrix_pattern, structural_rank
+    from network_formats import from_yaml_dict, to_matrices, to_yaml_dict, total_sum_of_network
+
+    data = to_yaml_dict(network)
+    record = {"name": data.get("name"), "status": "ok"}
+    values = {str(reaction["scale"]): 1 for reaction in data["reactions"] if not str(reaction["scale"]).lstrip("-").isdigit()}
+    values.update(scales or {})
+    if values:
+        record["scales"] = values
+    try:
+        exponents = effective_exponents(data, values)
+    except ValueError as error:
+        record.update(status="error", error=str(error))
+        return record
+    data = dict(data, reactions=[
+        dict(reaction, scale=str(values.get(str(reaction["scale"]), reaction["scale"]))) for reaction in data["reactions"]
+    ])
+    network = from_yaml_dict(data)
+    try:
+        name, species, educts, products, scaling_species, _ = to_matrices(network)
+    except ValueError as error:
+        # z. B. weder langsam noch schnell deklarierte Spezies (crn.yaml), die nur generator.py erlaubt
+        record.update(status="not_comparable", reason=str(error))
+        return record
+    fast_laws, slow_laws = conservation_laws(species, educts, products, scaling_species)
+    try:
+        scaling_rates = lln_scaling_rates(exponents)
+    except ValueError as error:
+        record.update(status="not_comparable", reason=str(error))
+        return record
+    fast_species = data["species"]["fast"]
+    if structural_rank(fast_matrix_pattern(data["reactions"], fast_species)) < len(fast_species):
+        # z. B. eine schnelle Spezies, die nie verbraucht wird: weder det(M) noch der Ansatz von crn_lln existieren
+        record.update(status="not_comparable", reason="M is structurally singular (det(M) = 0 in generator.py)")
+        return record
+    if eliminate is None:
+        eliminate = default_eliminate(species, educts, products, scaling_species)
+    record["eliminate"] = list(eliminate)
+    matrices = (name, species, educts, products, scaling_species, scaling_rates)
+
+    try:
+        generator_result, record["generator"] = measure(total_sum_of_network, network, memory=memory)
+        lln_result, record["crn_lln"] = measure(crn_lln, *matrices, eliminate=eliminate, verbose=False, memory=memory)
+    except Exception as error:
+        if fast_laws:
+            # crn_lln scheitert hier oft schon am Ansatz; verglichen würde ohnehin nicht
+            record.update(status="not_comparable", reason="fast species satisfy conservation laws (det(M) = 0 in generator.py)",
+                          error=f"{type(error).__name__}: {error}")
+        else:
+            record.update(status="error", error=f"{type(error).__name__}: {error}")
+        return record
+    record["faster"] = min(("generator", "crn_lln"), key=lambda engine: record[engine]["time"])
+    if fast_laws:
+        record.update(status="not_comparable", reason="fast species satisfy conservation laws (det(M) = 0 in generator.py)")
+        return record
+
+    # Symbole beider Engines: Raten je Reaktion, langsame Spezies in der Reihenfolge von species
+    natnum = sp.Symbol(data.get("natnum", "N"))
+    slow_index = [i for i, kind in enumerate(scaling_species) if kind == 1]
+    relevant = [i for i in slow_index if i not in eliminate]
+    scale_values = {sp.Symbol(str(reaction["scale"])): int(reaction["scale"]) for reaction in data["reactions"]}
+    rate_pairs = [(sp.Symbol(reaction["rate"]), sp.Symbol(f"k{j}")) for j, reaction in enumerate(data["reactions"])]
+    generator_result = generator_result.xreplace(scale_values)
+    lln_result = sp.expand(lln_result)
+
+    rng = np.random.default_rng(seed)
+    worst = 0.0
+    for _ in range(points):
+        rates = rng.uniform(0.5, 2.0, len(rate_pairs))
+        state = rng.uniform(0.5, 2.0, len(slow_index))
+        generator_values = {symbol: float(value) for (symbol, _), value in zip(rate_pairs, rates)}
+        generator_values.update({sp.Symbol(f"v_{{{species[i]}}}"): float(value) for i, value in zip(slow_index, state)})
+        lln_values = {symbol: float(value) for (_, symbol), value in zip(rate_pairs, rates)}
+        lln_values.update({sp.Symbol(f"v{j}"): float(value) for j, value in enumerate(state)})
+        lln_values.update({
+            sp.Symbol(f"M{len(fast_laws) + i}"): float(np.dot([vector[j] for j in slow_index], state))
+            for i, vector in enumerate(slow_laws)
+        })
+        for i in relevant:
+            expected = generator_result.diff(sp.Symbol(f"df_{{{species[i]}}}")).xreplace(generator_values)
+            actual = lln_result.diff(sp.Symbol(f"fp{i}")).xreplace(lln_values)
+            # NaN, unendliche, komplexe oder nicht numerische Werte zählen als Abweichung (max() würde NaN übergehen)
+            try:
+                expected, actual = complex(sp.limit(expected, natnum, sp.oo)), complex(actual)
+            except (TypeError, ValueError):
+                error = math.inf
+            else:
+                error = abs(expected - actual) / max(1.0, abs(expected))
+                if expected.imag or actual.imag or not math.isfinite(error):
+                    error = math.inf
+            worst = max(worst, error)
+    record["max_error"] = worst
+    if worst > rtol:
+        record["status"] = "mismatch"
+    return record
+
+
+def _networks(inputs):
+    # Beispiele aus examples.py (Matrixform, Skalierungen wie in crn_lln) oder Netzwerkdateien (wie in generator.py)
+    import examples
+    from network_formats import from_matrices, read_network
+
+    for item in inputs:
+        if item in examples.EXAMPLES:
+            name, species, educts, products, scaling_species, scaling_rates = examples.EXAMPLES[item]
+            scales = generator_scales(educts, scaling_species, scaling_rates)
+            yield item, from_matrices(name, species, educts, products, scaling_species, scales)
+        else:
+            yield item, read_network(item)
+
+def main(argv=None):
+    import examples
+
+    parser = argparse.ArgumentParser(description="Check generator.py against crn_lln and compare their cost.")
+    parser.add_argument("inputs", nargs="*", help=f"example names ({', '.join(examples.EXAMPLES)}) or network files (default: all examples)")
+    parser.add_argument("-e", "--eliminate", action="append", default=[], metavar="INPUT=I,J",
+                        help="crn_lln eliminate indices for one input (default: chosen automatically)")
+    parser.add_argument("-s", "--scale", action="append", default=[], metavar="NAME=VALUE",
+                        help="integer value of a symbolic scale such as b1 (default: 1)")
+    parser.add_argument("-n", "--points", type=int, default=20, help="random evaluation points (default: 20)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rtol", type=float, default=1e-8)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    eliminate = {}
+    for spec in args.eliminate:
+        name, sep, indices = spec.partition("=")
+        if not sep:
+            sys.exit(f"❌ Invalid eliminate '{spec}', expected INPUT=I,J")
+        eliminate[name] = [int(i) for i in indices.split(",") if i]
+    scales = {}
+    for spec in args.scale:
+        name, sep, value = spec.partition("=")
+        if not sep or not value.lstrip("-").isdigit():
+            sys.exit(f"❌ Invalid scale '{spec}', expected NAME=INTEGER")
+        scales[name] = int(value)
+
+    stream = open(args.output, "w") if args.output else sys.stdout
+    failures = 0
+    try:
+        for name, network in _networks(args.inputs or list(examples.EXAMPLES)):
+            record = compare(network, eliminate.get(name), args.points, args.seed, args.rtol, not args.no_memory, scales)
+            record["input"] = name if name in examples.EXAMPLES else os.path.abspath(name)
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stream.flush()
+            failures += record["status"] in ("mismatch", "error")
+            if record["status"] == "error":
+                print(f"❌ {name}: {record['error']}", file=sys.stderr)
+                continue
+            timing = "".join(
+                f"  {engine} {record[engine]['time']:.2f} s" + (f" / {record[engine]['peak_memory'] / 2 ** 20:.1f} MiB"
+                                                                if record[engine]["peak_memory"] is not None else "")
+                for engine in ("generator", "crn_lln") if engine in record
+            )
+            if "faster" in record:
+                timing += f"  faster: {record['faster']}"
+            mark = {"ok": "✅", "mismatch": "❌", "not_comparable": "–"}[record["status"]]
+            detail = f"max error {record['max_error']:.1e}" if "max_error" in record else record.get("reason", "")
+            print(f"{mark} {name}: {record['status']} ({detail}){timing}", file=sys.stderr)
+    finally:
+        if args.output:
+            stream.close()
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
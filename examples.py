@@ -1,41 +1,75 @@
-import numpy as np
-from sympy as sp
 import json
+import sys
 
-with open("MM.json", "r") as f:
-    data = json.load(f) 
-print(data)
+from sympy import Matrix
 
-productM = Matrix([[r["products"][i] for i in r["species"] if i in r["products"].keys()]  for r in MM["reactions"]])
+
+def matrices_from_json(file_path):
+    """
+    Liest ein Netzwerk im Format von MM.json (Speziesliste, Edukte/Produkte als Liste von Dictionaries)
+    und erzeugt die Edukt- und Produktmatrix (Spezies x Reaktionen) für crn_lln/crn_clt.
+    :param file_path: Pfad zur JSON-Datei.
+    :return: Tupel (network_name, species, educts, products).
+    """
+    from compiled_network import network_to_stoichiometry
+    from network_formats import from_mm
+
+    with open(file_path, "r") as f:
+        network = from_mm(json.load(f))
+    educts, products = network_to_stoichiometry(network)
+    return network["name"], list(network["species"]), educts, products
 
 network_name_MM='Michaelis-Menten-Network'
-species_MM=['S_0','S_1','E_0','E_1']                               
-educts_MM=Matrix([[1,0,1,0],[0,0,0,1],[0,0,0,1]]).T                
-products_MM=Matrix([[0,0,0,1],[1,0,1,0],[0,1,1,0]]).T              
-scaling_species_MM=[1,1,0,0]                                       
-scaling_rates_MM=[0,1,1]   
-
-network_name_Hill='Hill_network'                        
-species_Hill=['S_0','S_1','E_0','E_1','E_2']                                                                            
-educts_Hill=Matrix([[1,0,1,0,0],[0,0,0,1,0],[1,0,0,1,0],[0,0,0,0,1],[0,0,0,0,1]]).T               
-products_Hill=Matrix([[0,0,0,1,0],[1,0,1,0,0],[0,0,0,0,1],[1,0,0,1,0],[0,1,0,1,0]]).T               
-scaling_species_Hill=[1,1,0,0,0]                                      
-scaling_rates_Hill=[1,2,2,1,1] 
-
-network_name_allos='Allosteric Activation'                         
-species_allos=['S','A','P','E','EA','EAS']                               
-educts_allos=Matrix([[0,1,0,1,0,0],[0,0,0,0,1,0],[1,0,0,0,1,0],[0,0,0,0,0,1],[0,0,0,0,0,1]]).T                  
-products_allos=Matrix([[0,0,0,0,1,0],[0,1,0,1,0,0],[0,0,0,0,0,1],[1,0,0,0,1,0],[0,0,1,0,1,0]]).T            
-scaling_species_allos=[1,1,1,0,0,0]                                       
-scaling_rates_allos=[0,1,0,1,1] 
-
-network_name_gen='gene expression'                         
-species_gen=['off','on','R','P']                               
-educts_gen=Matrix([[1,0,0,0],[0,1,0,0],[0,1,0,0],[0,0,1,0],[0,0,1,0],[0,0,0,1]]).T          #neutral model        
-products_gen=Matrix([[0,1,0,0],[1,0,0,0],[0,1,1,0],[0,0,0,0],[0,0,1,1],[0,0,0,0]]).T        #neutral model     
-#educts=Matrix([[1,0,0,0],[0,1,0,1],[0,1,0,0],[0,0,1,0],[0,0,1,0],[0,0,0,1]]).T         #negative model        
-#products=Matrix([[0,1,0,0],[1,0,0,1],[0,1,1,0],[0,0,0,0],[0,0,1,1],[0,0,0,0]]).T       #negative model   
-#educts=Matrix([[1,0,0,1],[0,1,0,0],[0,1,0,0],[0,0,1,0],[0,0,1,0],[0,0,0,1]]).T         #positive model        
-#products=Matrix([[0,1,0,1],[1,0,0,0],[0,1,1,0],[0,0,0,0],[0,0,1,1],[0,0,0,0]]).T       #positive model    
-scaling_species_gen=[0,0,0,1]                                       
-scaling_rates_gen=[1,1,1,1,1,0] 
\ No newline at end of file
+species_MM=['S_0','S_1','E_0','E_1']
+educts_MM=Matrix([[1,0,1,0],[0,0,0,1],[0,0,0,1]]).T
+products_MM=Matrix([[0,0,0,1],[1,0,1,0],[0,1,1,0]]).T
+scaling_species_MM=[1,1,0,0]
+scaling_rates_MM=[0,1,1]
+
+network_name_Hill='Hill_network'
+species_Hill=['S_0','S_1','E_0','E_1','E_2']
+educts_Hill=Matrix([[1,0,1,0,0],[0,0,0,1,0],[1,0,0,1,0],[0,0,0,0,1],[0,0,0,0,1]]).T
+products_Hill=Matrix([[0,0,0,1,0],[1,0,1,0,0],[0,0,0,0,1],[1,0,0,1,0],[0,1,0,1,0]]).T
+scaling_species_Hill=[1,1,0,0,0]
+scaling_rates_Hill=[1,2,2,1,1]
+
+network_name_allos='Allosteric Activation'
+species_allos=['S','A','P','E','EA','EAS']
+educts_allos=Matrix([[0,1,0,1,0,0],[0,0,0,0,1,0],[1,0,0,0,1,0],[0,0,0,0,0,1],[0,0,0,0,0,1]]).T
+products_allos=Matrix([[0,0,0,0,1,0],[0,1,0,1,0,0],[0,0,0,0,0,1],[1,0,0,0,1,0],[0,0,1,0,1,0]]).T
+scaling_species_allos=[1,1,1,0,0,0]
+scaling_rates_allos=[0,1,0,1,1]
+
+network_name_gen='gene expression'
+species_gen=['off','on','R','P']
+educts_gen=Matrix([[1,0,0,0],[0,1,0,0],[0,1,0,0],[0,0,1,0],[0,0,1,0],[0,0,0,1]]).T          #neutral model
+products_gen=Matrix([[0,1,0,0],[1,0,0,0],[0,1,1,0],[0,0,0,0],[0,0,1,1],[0,0,0,0]]).T        #neutral model
+#educts=Matrix([[1,0,0,0],[0,1,0,1],[0,1,0,0],[0,0,1,0],[0,0,1,0],[0,0,0,1]]).T         #negative model
+#products=Matrix([[0,1,0,0],[1,0,0,1],[0,1,1,0],[0,0,0,0],[0,0,1,1],[0,0,0,0]]).T       #negative model
+#educts=Matrix([[1,0,0,1],[0,1,0,0],[0,1,0,0],[0,0,1,0],[0,0,1,0],[0,0,0,1]]).T         #positive model
+#products=Matrix([[0,1,0,1],[1,0,0,0],[0,1,1,0],[0,0,0,0],[0,0,1,1],[0,0,0,0]]).T       #positive model
+scaling_species_gen=[0,0,0,1]
+scaling_rates_gen=[1,1,1,1,1,0]
+
+EXAMPLES = {
+    "MM": (network_name_MM, species_MM, educts_MM, products_MM, scaling_species_MM, scaling_rates_MM),
+    "Hill": (network_name_Hill, species_Hill, educts_Hill, products_Hill, scaling_species_Hill, scaling_rates_Hill),
+    "allos": (network_name_allos, species_allos, educts_allos, products_allos, scaling_species_allos, scaling_rates_allos),
+    "gen": (network_name_gen, species_gen, educts_gen, products_gen, scaling_species_gen, scaling_rates_gen),
+}
+
+
+if __name__ == "__main__":
+    import telemetry
+    from functions_for_LLN_CLT import crn_clt, crn_lln
+
+    telemetry.configure_from_env()
+
+    # Aufruf: python examples.py [MM|Hill|allos|gen] [--clt]
+    name = sys.argv[1] if len(sys.argv) > 1 else "MM"
+    if name not in EXAMPLES:
+        sys.exit(f"Unknown example '{name}'. Choose one of: {', '.join(EXAMPLES)}")
+    if "--clt" in sys.argv:
+        crn_clt(*EXAMPLES[name])
+    else:
+        crn_lln(*EXAMPLES[name])
@@ -1,8 +1,9 @@
-import numpy as np
-import sympy
-from sympy import *
-
-def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
+def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates,eliminate=None,verbose=True,progress=None,cancel=None):
+    from sympy import Eq, Matrix, cancel as cancel_fraction, diag, expand, lambdify, limit, oo, shape, simplify, solve, symbols
+    import telemetry #size of the intermediate expressions (see telemetry.configure)
+    report=print if verbose else (lambda *args, **kwargs: None) #console output only if verbose
+    from progress import tracker
+    notify=tracker(progress,cancel) #progress events and cancellation between the stages (see progress.Progress)
     reaction_number=shape(educts)[1] #number of reactions                            
     species_number=len(species)  #number of species                                   
     reaction_matrix=(products-educts).T  #reaction matrix                           
@@ -11,6 +12,7 @@ def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
     rates_scaled=[rates[i]*N**(max(0,scaling_rates[i]-1)) for i in range(reaction_number)] #scaled reaction rates
 
     #Calculates the constant linear combinations of species in the network
+    notify('crn_lln.conservation_laws',species=species_number,reactions=reaction_number)
     nullspace_reaction_matrix=reaction_matrix.nullspace()
     nullspace_reaction_matrix_as_matrix=Matrix([[nullspace_reaction_matrix[n][i] for i in range(species_number)] for n in range(len(nullspace_reaction_matrix))]).T
     index_fast_species = [i for i in range(len(scaling_species)) if scaling_species[i]==0]           
@@ -32,15 +34,15 @@ def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
             vz[j]=v[i_slow]
             i_slow=i_slow+1
     for i in range(len(constant_linear_combinations_fast)):
-        print(f'The constant linear combinations involving only fast species are {((constant_linear_combinations_fast[i].T)*(Matrix([[z[n]] for n in range(len(z))])))[0,0]}')
+        report(f'The constant linear combinations involving only fast species are {((constant_linear_combinations_fast[i].T)*(Matrix([[z[n]] for n in range(len(z))])))[0,0]}')
         if i<len(constant_linear_combinations_fast)-1:
-            print('and')
+            report('and')
     for i in range(len(nullspace_reaction_matrix)-len(constant_linear_combinations_fast)):
         z1=[i/N for i in z]
         v1z=v + z1
-        print(f'In addition, the constant linear combinations that include slow species are {((nullspace_reaction_matrix[i].T)*(Matrix([[v1z[n]] for n in range(len(v1z))])))[0,0]}')
+        report(f'In addition, the constant linear combinations that include slow species are {((nullspace_reaction_matrix[i].T)*(Matrix([[v1z[n]] for n in range(len(v1z))])))[0,0]}')
         if i<len(nullspace_reaction_matrix)-len(constant_linear_combinations_fast)-1:
-            print('and')
+            report('and')
     index_irrelevant_fast_species=[]
     stepvariable=len(index_fast_species)
     for i in range(len(constant_linear_combinations_fast)):
@@ -53,21 +55,27 @@ def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
     reduced_reactíon_matrix_fast=reaction_matrix.col([i for i in index_relevant_fast_species])
     #print(f'The reduced fast network is {reduced_reactíon_matrix_fast}')
     index_irrelevant_slow_species=[]
-    #Asks user which slow species can be eliminated from the network.
+    #Asks user which slow species can be eliminated from the network (unless given by eliminate).
     for i in range(len(nullspace_reaction_matrix)-len(constant_linear_combinations_fast)):
-        while True:
-            index_user=input(f'What index u want to eliminate for the {i+1} constant linear combination?')
-            if index_user.isdigit():
-                index_user=int(index_user)
-                if index_user in index_slow_species:
-                    if ((nullspace_reaction_matrix[i].T)*(Matrix([[vz[n]] for n in range(len(vz))])))[0,0].coeff(vz[index_user]) != 0:
-                        break
+        if eliminate is not None:
+            #Indices given by the caller instead of asking the user
+            index_user=int(eliminate[i])
+            if index_user not in index_slow_species or ((nullspace_reaction_matrix[i].T)*(Matrix([[vz[n]] for n in range(len(vz))])))[0,0].coeff(vz[index_user]) == 0:
+                raise ValueError(f'Index {index_user} is not a slow species occurring in the {i+1} constant linear combination')
+        else:
+            while True:
+                index_user=input(f'What index u want to eliminate for the {i+1} constant linear combination?')
+                if index_user.isdigit():
+                    index_user=int(index_user)
+                    if index_user in index_slow_species:
+                        if ((nullspace_reaction_matrix[i].T)*(Matrix([[vz[n]] for n in range(len(vz))])))[0,0].coeff(vz[index_user]) != 0:
+                            break
+                        else:
+                            print(f'Please enter an index which occurs in the {i+1} constant linear combinaation')
                     else:
-                        print(f'Please enter an index which occurs in the {i+1} constant linear combinaation')
+                        print("The index must occur in the network") 
                 else:
-                    print("The index must occur in the network") 
-            else:
-                print("Please enter a number")
+                    print("Please enter a number")
         index_irrelevant_slow_species.append(index_user)
     index_relevant_slow_species=[i for i in index_slow_species if i not in index_irrelevant_slow_species]
     reduced_reactíon_matrix_slow=reaction_matrix.col([i for i in index_relevant_slow_species])
@@ -115,6 +123,7 @@ def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
     #Calculates the generatorpart G0f for a function f only depending on slow species.
     G0f=0
     for n in range(len(fp)):
+        notify('crn_lln.G0f',n+1,len(fp))
         for i in range(reaction_number):
             G0f1=1
             for j in range(species_number):
@@ -128,6 +137,7 @@ def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
     #Calculates the generatorpart G1g for the ansatzfunction g.
     G1g=0
     for n in range(len(fp)):
+        notify('crn_lln.G1g',n+1,len(fp))
         for m in range(len(index_relevant_fast_species)):
             for i in range(reaction_number):
                 G1f1=1
@@ -137,19 +147,37 @@ def crn_lln(network_name,species,educts,products,scaling_species,scaling_rates):
                             G1f1=G1f1*(vector_Generator[j])
                 G1g+=G1f1*reduced_reactíon_matrix_fast[i,m]*a[m+n*len(index_relevant_fast_species)]*fp[n]*rates[i]
     #print(f'G1g = {G1g}')
+    telemetry.record('crn_lln.G1g',G1g)
 
     #Calculates the limit generator of the slow species (LLN) by solving a linear equation system.
+    notify('crn_lln.expand_g')
     Gf=expand((G0f+G1g))
     coeff=[Eq((Gf.coeff(fp[j])).coeff(z[i]),0) for j in range(len(fp)) for i in range(len(index_relevant_fast_species))]                     
+    notify('crn_lln.solve_g',equations=len(coeff),unknowns=len(a))
     sol_LLN=solve(coeff,a)
     a_sol=[sol_LLN[a[i]] for i in range(len(a))]
-    mu_LLN=simplify(lambdify(a,Gf)(*a_sol))
+    notify('crn_lln.simplify_g')
+    if telemetry.record('crn_lln.ansatz_g',[Gf]+a_sol,switchable=True):
+        mu_LLN=simplify(lambdify(a,Gf)(*a_sol))
+    else:
+        mu_LLN=cancel_fraction(Gf.xreplace(dict(zip(a,a_sol)))) #expression too large: only cancel instead of simplify
+    telemetry.record('crn_lln.mu_LLN',mu_LLN)
     mu_LLN_rates=lambdify(rates,mu_LLN)
+    notify('crn_lln.limit_g')
     mu_LLN_limit=simplify(limit(mu_LLN_rates(*rates_scaled),N,oo)) #takes the limit if the scaling of the rates is >1  
-    print(f'The LLN of the {network_name} is \n {mu_LLN_limit}') 
+    report(f'The LLN of the {network_name} is \n {mu_LLN_limit}') 
+    notify('crn_lln.done')
+    return mu_LLN_limit
   
 
-def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
+def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates,eliminate=None,verbose=True,progress=None,cancel=None,max_workers=1):
+    from sympy import Eq, Matrix, cancel as cancel_fraction, diag, expand, lambdify, limit, oo, shape, simplify, solve, symbols
+    import telemetry #size of the intermediate expressions (see telemetry.configure)
+    report=print if verbose else (lambda *args, **kwargs: None) #console output only if verbose
+    from progress import tracker
+    notify=tracker(progress,cancel) #progress events and cancellation between the stages (see progress.Progress)
+    from task_graph import map_nodes
+    simplify_all=lambda expressions,stage: map_nodes(simplify,expressions,max_workers,progress=notify,stage=stage) #independent simplifications, in parallel for max_workers!=1 (see task_graph)
     #Same part as in crn_LLN. We need this limit and the solutions for the ansatzfunction g for the CLT.
     reaction_number=shape(educts)[1] #number of reactions                            
     species_number=len(species)  #number of species                                   
@@ -159,6 +187,7 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
     rates_scaled=[rates[i]*N**(max(0,scaling_rates[i]-1)) for i in range(reaction_number)] #scaled reaction rates
 
     #Calculates the constant linear combinations of species in the network
+    notify('crn_clt.conservation_laws',species=species_number,reactions=reaction_number)
     nullspace_reaction_matrix=reaction_matrix.nullspace()
     nullspace_reaction_matrix_as_matrix=Matrix([[nullspace_reaction_matrix[n][i] for i in range(species_number)] for n in range(len(nullspace_reaction_matrix))]).T
     index_fast_species = [i for i in range(len(scaling_species)) if scaling_species[i]==0]           
@@ -180,15 +209,15 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
             vz[j]=v[i_slow]
             i_slow=i_slow+1
     for i in range(len(constant_linear_combinations_fast)):
-        print(f'The constant linear combinations involving only fast species are {((constant_linear_combinations_fast[i].T)*(Matrix([[z[n]] for n in range(len(z))])))[0,0]}')
+        report(f'The constant linear combinations involving only fast species are {((constant_linear_combinations_fast[i].T)*(Matrix([[z[n]] for n in range(len(z))])))[0,0]}')
         if i<len(constant_linear_combinations_fast)-1:
-            print('and')
+            report('and')
     for i in range(len(nullspace_reaction_matrix)-len(constant_linear_combinations_fast)):
         z1=[i/N for i in z]
         v1z=v + z1
-        print(f'In addition, the constant linear combinations that include slow species are {((nullspace_reaction_matrix[i].T)*(Matrix([[v1z[n]] for n in range(len(v1z))])))[0,0]}')
+        report(f'In addition, the constant linear combinations that include slow species are {((nullspace_reaction_matrix[i].T)*(Matrix([[v1z[n]] for n in range(len(v1z))])))[0,0]}')
         if i<len(nullspace_reaction_matrix)-len(constant_linear_combinations_fast)-1:
-            print('and')
+            report('and')
     index_irrelevant_fast_species=[]
     stepvariable=len(index_fast_species)
     for i in range(len(constant_linear_combinations_fast)):
@@ -201,21 +230,27 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
     reduced_reaction_matrix_fast=reaction_matrix.col([i for i in index_relevant_fast_species])
     #print(f'The reduced fast network is {reduced_reactíon_matrix_fast}')
     index_irrelevant_slow_species=[]
-    #Asks user which slow species can be eliminated from the network.
+    #Asks user which slow species can be eliminated from the network (unless given by eliminate).
     for i in range(len(nullspace_reaction_matrix)-len(constant_linear_combinations_fast)):
-        while True:
-            index_user=input(f'What index u want to eliminate for the {i+1} constant linear combination?')
-            if index_user.isdigit():
-                index_user=int(index_user)
-                if index_user in index_slow_species:
-                    if ((nullspace_reaction_matrix[i].T)*(Matrix([[vz[n]] for n in range(len(vz))])))[0,0].coeff(vz[index_user]) != 0:
-                        break
+        if eliminate is not None:
+            #Indices given by the caller instead of asking the user
+            index_user=int(eliminate[i])
+            if index_user not in index_slow_species or ((nullspace_reaction_matrix[i].T)*(Matrix([[vz[n]] for n in range(len(vz))])))[0,0].coeff(vz[index_user]) == 0:
+                raise ValueError(f'Index {index_user} is not a slow species occurring in the {i+1} constant linear combination')
+        else:
+            while True:
+                index_user=input(f'What index u want to eliminate for the {i+1} constant linear combination?')
+                if index_user.isdigit():
+                    index_user=int(index_user)
+                    if index_user in index_slow_species:
+                        if ((nullspace_reaction_matrix[i].T)*(Matrix([[vz[n]] for n in range(len(vz))])))[0,0].coeff(vz[index_user]) != 0:
+                            break
+                        else:
+                            print(f'Please enter an index which occurs in the {i+1} constant linear combinaation')
                     else:
-                        print(f'Please enter an index which occurs in the {i+1} constant linear combinaation')
+                        print("The index must occur in the network") 
                 else:
-                    print("The index must occur in the network") 
-            else:
-                print("Please enter a number")
+                    print("Please enter a number")
         index_irrelevant_slow_species.append(index_user)
     index_relevant_slow_species=[i for i in index_slow_species if i not in index_irrelevant_slow_species]
     reduced_reaction_matrix_slow=reaction_matrix.col([i for i in index_relevant_slow_species])
@@ -263,6 +298,7 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
     #Calculates the generatorpart G0f for a function f only depending on slow species.
     G0f=0
     for n in range(len(fp)):
+        notify('crn_clt.G0f',n+1,len(fp))
         for i in range(reaction_number):
             G0f1=1
             for j in range(species_number):
@@ -276,6 +312,7 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
     #Calculates the generatorpart G1g for the ansatzfunction g.
     G1g=0
     for n in range(len(fp)):
+        notify('crn_clt.G1g',n+1,len(fp))
         for m in range(len(index_relevant_fast_species)):
             for i in range(reaction_number):
                 G1f1=1
@@ -285,20 +322,30 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
                             G1f1=G1f1*(vector_Generator[j])
                 G1g+=G1f1*reduced_reaction_matrix_fast[i,m]*a[m+n*len(index_relevant_fast_species)]*fp[n]*rates[i]
     #print(f'G1g = {G1g}')
+    telemetry.record('crn_clt.G1g',G1g)
 
     #Calculates the limit generator of the slow species (LLN) by solving a linear equation system.
+    notify('crn_clt.expand_g')
     Gf=expand((G0f+G1g))
     coeff=[Eq((Gf.coeff(fp[j])).coeff(z[i]),0) for j in range(len(fp)) for i in range(len(index_relevant_fast_species))]                     
+    notify('crn_clt.solve_g',equations=len(coeff),unknowns=len(a))
     sol_LLN=solve(coeff,a)
     a_sol=[sol_LLN[a[i]] for i in range(len(a))]
-    mu_LLN=simplify(lambdify(a,Gf)(*a_sol))
+    notify('crn_clt.simplify_g')
+    if telemetry.record('crn_clt.ansatz_g',[Gf]+a_sol,switchable=True):
+        mu_LLN=simplify(lambdify(a,Gf)(*a_sol))
+    else:
+        mu_LLN=cancel_fraction(Gf.xreplace(dict(zip(a,a_sol)))) #expression too large: only cancel instead of simplify
+    telemetry.record('crn_clt.mu_LLN',mu_LLN)
     mu_LLN_rates=lambdify(rates,mu_LLN)
+    notify('crn_clt.limit_g')
     mu_LLN_limit=simplify(limit(mu_LLN_rates(*rates_scaled),N,oo)) #takes the limit if the scaling of the rates is >1  
     #print(f'The LLN of the {network_name} is \n {mu_LLN_limit}')  
     
     #Calculates the generatorpart L0f for a function f only depending on fluctuations of the slow species
     L0f=0
     for n in range(len(fpp)):
+        notify('crn_clt.L0f',n+1,len(fpp))
         for i in range(reaction_number):
             L0f1=1
             for j in range(species_number):
@@ -318,6 +365,7 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
     #Calculates the generatorpart L1g for the ansatzfunction g. 
     L1g=0
     for n in range(len(fpp)):
+        notify('crn_clt.L1g',n+1,len(fpp))
         for m in range(len(index_relevant_fast_species)):
             for i in range(reaction_number):
                 L1g1=1
@@ -337,6 +385,7 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
     #Calculates the generatorpart L2h for the ansatzfunction h.
     L2h=0
     for n in range(len(fpp)):
+        notify('crn_clt.L2h',n+1,len(fpp))
         for m in range(len(index_relevant_fast_species)):
             for i in range(reaction_number):
                 L2h1=1
@@ -366,29 +415,85 @@ def crn_clt(network_name,species,educts,products,scaling_species,scaling_rates):
                         if(reduced_reaction_matrix_fast[i,k]==0):
                             L2h+=L2h1*reduced_reaction_matrix_fast[i,m]*d[len(index_relevant_fast_species)-1+k+n*(len(index_relevant_fast_species)*(len(index_relevant_fast_species)+1)//2)]*(z[m]+z[k]-1)*fpp[n]*rates[i]
     #print(f'L2h = {L2h}')
+    telemetry.record('crn_clt.L2h',L2h)
 
 
     #Calculates the limit generator of the fluctuations of the slow species (CLT) by solving a linear equation system.
+    notify('crn_clt.expand_h')
     Lf=expand(lambdify(a,L0f+L1g+L2h)(*a_sol))
+    telemetry.record('crn_clt.Lf',Lf)
     d=[d[n] for n in range(len(d)) if Lf.coeff(d[n])!=0]
-    coeff_fp=[Eq(simplify((Lf.coeff(fp[j])).coeff(z[i])),0) for j in range(len(fp)) for i in range(len(index_relevant_fast_species))]                       
-    coeff_fpp=[Eq(simplify((Lf.coeff(fpp[j])).coeff(z[i])),0) for j in range(len(fpp)) for i in range(len(index_relevant_fast_species))]
-    coeff_fpp_2=[Eq(simplify((Lf.coeff(fpp[j])).coeff(z[i]*z[k])),0) for j in range(len(fpp)) for i in range(len(index_relevant_fast_species)) for k in range(len(index_relevant_fast_species)) if k>=i]
+    notify('crn_clt.ansatz_h',unknowns=len(b+c+d))
+    coeff_fp=[(Lf.coeff(fp[j])).coeff(z[i]) for j in range(len(fp)) for i in range(len(index_relevant_fast_species))]
+    coeff_fpp=[(Lf.coeff(fpp[j])).coeff(z[i]) for j in range(len(fpp)) for i in range(len(index_relevant_fast_species))]
+    coeff_fpp_2=[(Lf.coeff(fpp[j])).coeff(z[i]*z[k]) for j in range(len(fpp)) for i in range(len(index_relevant_fast_species)) for k in range(len(index_relevant_fast_species)) if k>=i]
+    coefficients=simplify_all(coeff_fp+coeff_fpp+coeff_fpp_2,'crn_clt.coeff_h')
+    coeff_fp=[Eq(coefficient,0) for coefficient in coefficients[:len(coeff_fp)]]
+    coeff_fpp=[Eq(coefficient,0) for coefficient in coefficients[len(coeff_fp):len(coeff_fp)+len(coeff_fpp)]]
+    coeff_fpp_2=[Eq(coefficient,0) for coefficient in coefficients[len(coeff_fp)+len(coeff_fpp):]]
+    notify('crn_clt.solve_h',equations=len(coeff_fp+coeff_fpp+coeff_fpp_2),unknowns=len(b+c+d))
     sol_CLT=solve(coeff_fp+coeff_fpp+coeff_fpp_2,b+c+d)
     b_sol=[sol_CLT[b[i]] for i in range(len(b))]
     c_sol=[sol_CLT[c[i]] for i in range(len(c))]
     d_sol=[sol_CLT[d[i]] for i in range(len(d))]
-    mu_CLT=simplify(lambdify(b+c+d,Lf)(*(b_sol+c_sol+d_sol)))
+    notify('crn_clt.simplify_h')
+    if telemetry.record('crn_clt.ansatz_h',b_sol+c_sol+d_sol,switchable=True):
+        mu_CLT=simplify(lambdify(b+c+d,Lf)(*(b_sol+c_sol+d_sol)))
+    else:
+        mu_CLT=cancel_fraction(Lf.xreplace(dict(zip(b+c+d,b_sol+c_sol+d_sol)))) #expression too large: only cancel instead of simplify
+    telemetry.record('crn_clt.mu_CLT',mu_CLT)
     mu_CLT_rates=lambdify(rates,mu_CLT)
+    notify('crn_clt.limit_h')
     mu_CLT_limit=simplify(limit(mu_CLT_rates(*rates_scaled),N,oo))  #takes the limit if the scaling of the rates is >1 
     mu_CLT_limit=mu_CLT_limit.expand()
     #returns the drift part of the limit generator for the slow fluctuation of every species
+    notify('crn_clt.coefficients',drift=len(fp),sigma=len(fpp))
+    drift=dict(zip(fp,simplify_all([mu_CLT_limit.coeff(fp[n]) for n in range(len(fp))],'crn_clt.simplify_drift')))
     for n in range(len(fp)):
-        print(f'The drift-proportion of {fp[n]} is {simplify(mu_CLT_limit.coeff(fp[n]))}.')
+        report(f'The drift-proportion of {fp[n]} is {drift[fp[n]]}.')
     #returns the diffusion part of the limit generator for the slow fluctuation of every species 
+    sigma={}
     for n in range(len(fpp)):
         if n%len(index_relevant_slow_species)==n//len(index_relevant_slow_species):
-            print(f'The sigma-proportion of {fpp[n]} is {simplify(mu_CLT_limit.coeff(fpp[n]))}.')
+            sigma[fpp[n]]=mu_CLT_limit.coeff(fpp[n])
         else:
             if n//len(index_relevant_slow_species)<n%len(index_relevant_slow_species):
-                print(f'The sigma-proportion of {fpp[n]} is {simplify(mu_CLT_limit.coeff(fpp[n])+mu_CLT_limit.coeff(fpp[n*n%len(index_relevant_slow_species)+n//len(index_relevant_slow_species)]))}.')
\ No newline at end of file
+                sigma[fpp[n]]=mu_CLT_limit.coeff(fpp[n])+mu_CLT_limit.coeff(fpp[n*n%len(index_relevant_slow_species)+n//len(index_relevant_slow_species)])
+    sigma=dict(zip(sigma,simplify_all(list(sigma.values()),'crn_clt.simplify_sigma')))
+    for key in sigma:
+        report(f'The sigma-proportion of {key} is {sigma[key]}.')
+    notify('crn_clt.done')
+    return drift,sigma
+
+
+def conservation_laws(species, educts, products, scaling_species):
+    """
+    Bestimmt die Erhaltungsgrößen wie crn_lln/crn_clt (in derselben Reihenfolge wie dort die Konstanten M0, M1, ...).
+
+    :return: Tupel (fast, slow): fast enthält die Koeffizientenvektoren der Kombinationen nur schneller Spezies
+             (über den schnellen Spezies), slow die übrigen Nullraumvektoren (über allen Spezies), mit denen
+             langsame Spezies eliminiert werden.
+    """
+    from sympy import Matrix
+
+    reaction_matrix = (Matrix(products) - Matrix(educts)).T
+    nullspace = reaction_matrix.nullspace()
+    if not nullspace:
+        return [], []
+    index_fast = [i for i, kind in enumerate(scaling_species) if kind == 0]
+    as_matrix = Matrix([[vector[i] for i in range(len(species))] for vector in nullspace]).T
+    slow_part = Matrix([[vector[i] for i in range(len(species)) if i not in index_fast] for vector in nullspace]).T
+    fast = [[float((as_matrix * vector)[i]) for i in index_fast] for vector in slow_part.nullspace()]
+    slow = [[float(value) for value in vector] for vector in nullspace[:len(nullspace) - len(fast)]]
+    return fast, slow
+
+def default_eliminate(species, educts, products, scaling_species):
+    """
+    Wählt für jede Erhaltungsgröße mit langsamen Spezies die letzte darin vorkommende, noch nicht gewählte
+    langsame Spezies (zulässige eliminate-Indizes für crn_lln/crn_clt).
+    """
+    chosen = []
+    for vector in conservation_laws(species, educts, products, scaling_species)[1]:
+        candidates = [i for i, kind in enumerate(scaling_species) if kind == 1 and vector[i] != 0 and i not in chosen]
+        chosen.append(candidates[-1])
+    return chosen
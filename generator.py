@@ -1,8 +1,17 @@
+import hashlib
+import json
+import os
 import yaml
-import sympy as sp
-from sympy import simplify
-from collections import defaultdict
-from sympy import sympify
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+import telemetry
+from progress import tracker
+from lazy_import import lazy_import
+from worker_pool import WorkerPool
+
+# SymPy wird erst bei der ersten symbolischen Berechnung geladen
+sp = lazy_import("sympy")
 
 
 def load_yaml(file_path):
@@ -12,7 +21,7 @@ def load_yaml(file_path):
     :return: Dictionary mit den geladenen Daten.
     """
     with open(file_path, "r") as file:
-        data = yaml.safe_load(file)
+        data = yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     return data
 
 def get_slow_educts(reaction, slow_species):
@@ -87,6 +96,32 @@ def compute_species_difference(reaction, species):
     products = reaction.get("products", {}).get(species, 0)
     return products - educts
 
+def reaction_propensity(reaction, slow_symbolic_variables, natnum, slow_species):
+    """
+    Berechnet die skalierte Propensität einer Reaktion: multiply_slow_species * compute_scaled_rate.
+    Für zusammengefasste Reaktionen (siehe `coalesce_reactions`) wird die aggregierte Propensität verwendet.
+    :param reaction: Ein Dictionary, das eine Reaktion oder eine Gruppe beschreibt.
+    :param slow_symbolic_variables: Dictionary der symbolischen Variablen für langsame Spezies.
+    :param natnum: Symbolische Variable für N.
+    :param slow_species: Liste der langsamen Spezies.
+    :return: Symbolischer Ausdruck der Propensität.
+    """
+    if "propensity" in reaction:
+        return reaction["propensity"]
+    return multiply_slow_species(reaction, slow_symbolic_variables) * compute_scaled_rate(reaction, natnum, slow_species)
+
+def reaction_change(reaction, species, slow_symbolic_variables, natnum, slow_species):
+    """
+    Berechnet compute_species_difference * reaction_propensity für eine langsame Spezies.
+    Für zusammengefasste Reaktionen wird die aggregierte Änderung der Gruppe verwendet.
+    :param reaction: Ein Dictionary, das eine Reaktion oder eine Gruppe beschreibt.
+    :param species: Die zu betrachtende langsame Spezies.
+    :return: Symbolischer Ausdruck der gewichteten Änderung.
+    """
+    if "change" in reaction:
+        return reaction["change"].get(species, 0)
+    return compute_species_difference(reaction, species) * reaction_propensity(reaction, slow_symbolic_variables, natnum, slow_species)
+
 def is_slow_only_reaction(reaction, fast_species): 
     """
     Prüft, ob eine Reaktion ausschließlich langsame Spezies konsumiert und produziert.
@@ -147,6 +182,77 @@ def consumes_and_produces_fast_species(reaction, consumed_species, produced_spec
     products = reaction.get("products", {}).keys()
     return consumed_species in educts and produced_species in products
 
+def fast_species_characters(fast_species):
+    """
+    Menge der Zeichen aller schnellen Speziesnamen für `reaction_signature`.
+    """
+    return frozenset(character for species in fast_species for character in species)
+
+def reaction_signature(reaction, slow_species, fast_species, characters=None):
+    """
+    Berechnet die Signatur einer Reaktion für `coalesce_reactions`: Edukte (schnelle Edukte und das Monom der
+    langsamen Edukte) sowie die schnellen Produkte. Reaktionen mit gleicher Signatur gehen in M, M{S,S'} und die
+    Summen nur über ihre Propensität und ihre Änderung der langsamen Spezies ein.
+
+    Da die Prüffunktionen (z. B. `consumes_fast_species_without_producing`) Namen auch als Teilstrings bzw.
+    zeichenweise vergleichen, zählen alle Eduktschlüssel und Produktschlüssel, die aus einem Zeichen eines
+    schnellen Speziesnamens bestehen, ebenfalls zur Signatur.
+
+    :param reaction: Ein Dictionary, das eine Reaktion beschreibt.
+    :param slow_species: Liste der langsamen Spezies.
+    :param fast_species: Liste der schnellen Spezies.
+    :param characters: Ergebnis von `fast_species_characters` (wird sonst hier berechnet; beim Aufruf für viele
+                       Reaktionen einmal vorab berechnen).
+    :return: Hashbare Signatur.
+    """
+    educts = reaction.get("educts", {})
+    products = reaction.get("products", {})
+    if characters is None:
+        characters = fast_species_characters(fast_species)
+    return (
+        frozenset(educts.keys()),
+        tuple(sorted((species, coeff) for species, coeff in educts.items() if species in slow_species)),
+        # Die Zeichen bilden nur den Vergleich `species in fast_species` der Prüffunktionen (z. B.
+        # consumes_fast_species) nach, wenn dort ein einzelner Speziesname als String übergeben wird
+        frozenset(species for species in products if species in fast_species or species in characters),
+    )
+
+def coalesce_reactions(reactions, natnum, slow_species, fast_species, slow_symbolic_variables):
+    """
+    Fasst strukturell gleiche Reaktionen (gleiche `reaction_signature`) zu je einer Gruppe zusammen.
+
+    Jede Gruppe erhält eine aggregierte Propensität (Summe der `reaction_propensity` ihrer Reaktionen) und je
+    langsamer Spezies eine aggregierte Änderung (Summe der `reaction_change`). Die Gruppen werden von
+    create_fast_species_matrix, create_modified_fast_species_matrix und den Teilsummen wie Reaktionen verwendet,
+    sodass Matrizen und Summen weniger Terme enthalten. Unter "members" stehen die Indizes der
+    zusammengefassten Reaktionen in `reactions`.
+
+    :param reactions: Liste der Reaktions-Dictionaries.
+    :param natnum: Symbolische Variable für N.
+    :param slow_species: Liste der langsamen Spezies.
+    :param fast_species: Liste der schnellen Spezies.
+    :param slow_symbolic_variables: Symbolische Variablen für langsame Spezies.
+    :return: Liste der Gruppen in der Reihenfolge ihres ersten Auftretens.
+    """
+    groups = {}
+    characters = fast_species_characters(fast_species)
+    for index, reaction in enumerate(reactions):
+        signature = reaction_signature(reaction, slow_species, fast_species, characters)
+        if signature not in groups:
+            groups[signature] = {
+                "educts": dict(reaction.get("educts", {})),
+                "products": {species: reaction["products"][species] for species in signature[2]},
+                "propensity": sp.S(0),
+                "change": {species: sp.S(0) for species in slow_species},
+                "members": [],
+            }
+        group = groups[signature]
+        group["propensity"] += reaction_propensity(reaction, slow_symbolic_variables, natnum, slow_species)
+        for species in slow_species:
+            group["change"][species] += reaction_change(reaction, species, slow_symbolic_variables, natnum, slow_species)
+        group["members"].append(index)
+    return list(groups.values())
+
 def create_fast_species_matrix(reactions, fast_species, slow_symbolic_variables, natnum, slow_species):
     """
     Erstellt eine quadratische Matrix M mit Indizes S, T für schnelle Spezies.
@@ -168,10 +274,7 @@ def create_fast_species_matrix(reactions, fast_species, slow_symbolic_variables,
     for S in fast_species:
         for reaction in reactions:
             if consumes_fast_species_without_producing(reaction, S):
-                term = (
-                    multiply_slow_species(reaction, slow_symbolic_variables) *
-                    compute_scaled_rate(reaction, natnum, slow_species)
-                )
+                term = reaction_propensity(reaction, slow_symbolic_variables, natnum, slow_species)
                 M[S][S] += term  # Summiere auf die Diagonale
 
     # Berechne die Nicht-Diagonal-Elemente M[S][T] (S ≠ T)
@@ -180,10 +283,7 @@ def create_fast_species_matrix(reactions, fast_species, slow_symbolic_variables,
             if S != T:
                 for reaction in reactions:
                     if consumes_and_produces_fast_species(reaction, S, T):
-                        term = (
-                            multiply_slow_species(reaction, slow_symbolic_variables) *
-                            compute_scaled_rate(reaction, natnum, slow_species)
-                        )
+                        term = reaction_propensity(reaction, slow_symbolic_variables, natnum, slow_species)
                         M[S][T] -= term  # Negative Summe für M[S][T]
 
     return M
@@ -217,9 +317,7 @@ def create_modified_fast_species_matrix(reactions, fast_species, slow_symbolic_v
     # Modifiziere die Spalte S_prime in der Matrix M
     for S_double_prime in fast_species:
         sum_term = sum(
-            multiply_slow_species(reaction, slow_symbolic_variables) *
-            compute_scaled_rate(reaction, natnum, slow_species) *
-            compute_species_difference(reaction, S)
+            reaction_change(reaction, S, slow_symbolic_variables, natnum, slow_species)
             for reaction in reactions if consumes_fast_species(reaction, S_double_prime)
         )
         M[S_double_prime][S_prime] = sum_term  # Setze den neuen Wert für M[S_double_prime][S_prime]
@@ -236,16 +334,44 @@ def get_matrix_determinant(matrix):
     # Extrahiere die schnelle Spezies als sortierte Liste für eine feste Reihenfolge
     fast_species = sorted(matrix.keys())
 
-    # Erstelle eine SymPy-Matrix aus der Dictionary-Struktur
-    M_list = [[matrix[S][T] for T in fast_species] for S in fast_species]
-    M_sympy = sp.Matrix(M_list)  # Konvertiere in SymPy-Matrix
+    # Erstelle die Zeilen als hashbares Tupel für den Determinanten-Cache
+    M_rows = tuple(tuple(matrix[S][T] for T in fast_species) for S in fast_species)
 
-    # Berechne die Determinante und vereinfache sie
-    determinant = M_sympy.det().simplify()
+    # Ist die Determinante zu groß (siehe telemetry), wird nur gekürzt. Die Prüfung steht außerhalb der Caches,
+    # damit ein gekürztes Ergebnis nicht für spätere Aufrufe mit anderen Einstellungen gespeichert bleibt
+    determinant = _raw_determinant(M_rows)
+    if not telemetry.record("determinant", determinant, switchable=True, size=len(M_rows)):
+        return sp.cancel(determinant)
+    return _cached_determinant(M_rows)  # Prüft, ob die Determinante genau 0 ist
 
-    return determinant  # Prüft, ob die Determinante genau 0 ist
+@lru_cache(maxsize=4096)
+def _raw_determinant(M_rows):
+    """
+    Berechnet die nicht vereinfachte Determinante; identische Matrizen werden aus einem LRU-Cache bedient.
+    :param M_rows: Matrixzeilen als Tupel von Tupeln symbolischer Ausdrücke.
+    """
+    return sp.Matrix([list(row) for row in M_rows]).det()  # Konvertiere in SymPy-Matrix
 
-def sum_over_slow_reactions(data, natnum, slow_species, slow_symbolic_variables, slow_symbolic_derivatives):
+@lru_cache(maxsize=4096)
+def _cached_determinant(M_rows):
+    """
+    Berechnet die vereinfachte Determinante; identische Matrizen (z. B. wiederholte Aufrufe im
+    selben Prozess) werden aus einem LRU-Cache bedient.
+    :param M_rows: Matrixzeilen als Tupel von Tupeln symbolischer Ausdrücke.
+    :return: Die vereinfachte Determinante.
+    """
+    determinant = _raw_determinant(M_rows).simplify()
+    telemetry.record("determinant.simplified", determinant, size=len(M_rows))
+    return determinant
+
+def clear_determinant_cache():
+    """
+    Leert die Determinanten-Caches von `get_matrix_determinant`.
+    """
+    _raw_determinant.cache_clear()
+    _cached_determinant.cache_clear()
+
+def sum_over_slow_reactions(data, natnum, slow_species, slow_symbolic_variables, slow_symbolic_derivatives, fast_species=None):
     """
     Berechnet die erste Teilsumme des approximierten Generators für ein gegebenes Reaktionsnetzwerk.
 
@@ -262,8 +388,12 @@ def sum_over_slow_reactions(data, natnum, slow_species, slow_symbolic_variables,
     :param slow_species: Liste der langsamen Spezies.
     :param slow_symbolic_variables: Symbolische Variablen der langsamen Spezies.
     :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies.
+    :param fast_species: Liste der schnellen Spezies (Standard: data["species"]["fast"]).
     :return: Die berechnete Summe als symbolischer Ausdruck.
     """
+    if fast_species is None:
+        fast_species = data["species"]["fast"]
+
     total_sum = 0
     # Iteriere über jede Reaktion
     for reaction in data["reactions"]:
@@ -271,17 +401,42 @@ def sum_over_slow_reactions(data, natnum, slow_species, slow_symbolic_variables,
         if is_slow_only_reaction(reaction, fast_species):
             # Summiere über alle langsamen Spezies
             for species in slow_species:
-                species_diff = compute_species_difference(reaction, species)
-                scaled_rate = compute_scaled_rate(reaction, natnum, slow_species)
-                slow_species_product = multiply_slow_species(reaction, slow_symbolic_variables)
+                weighted_change = reaction_change(reaction, species, slow_symbolic_variables, natnum, slow_species)
                 species_derivative = slow_symbolic_derivatives[species]
                 
                 # Berechne das Produkt und addiere es zur Gesamtsumme
-                total_sum += species_diff * scaled_rate * slow_species_product * species_derivative
+                total_sum += weighted_change * species_derivative
 
     return total_sum
 
-def sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives):
+def slow_fast_determinants(data, natnum, slow_species, fast_species, slow_symbolic_variables, progress=None, max_workers=1, determinant=None):
+    """
+    Berechnet det(M) und alle det(M{S,S'}) als unabhängige Knoten eines task_graph.TaskGraph.
+    :param progress: Callback oder progress.Progress; je Determinante ein Ereignis "generator.determinant".
+    :param max_workers: Anzahl der Prozesse (None = Anzahl der CPU-Kerne, 1 = seriell).
+    :param determinant: Funktion für die Determinante einer Dictionary-Matrix, auf Modulebene definiert
+                        (Standard: `get_matrix_determinant`, Alternative: modular_determinant.matrix_determinant).
+    :return: Tupel (det(M), {(S, S'): det(M{S,S'})}).
+    """
+    from task_graph import TaskGraph
+
+    determinant = determinant or get_matrix_determinant
+    graph = TaskGraph()
+    M = create_fast_species_matrix(data["reactions"], fast_species, slow_symbolic_variables, natnum, slow_species)
+    det_node = graph.add(determinant, (M,), stage="generator.determinant",
+                         info={"slow": None, "fast": None, "size": len(fast_species)})
+    modified_nodes = {}
+    for slow in slow_species:
+        for fast in fast_species:
+            M_modified = create_modified_fast_species_matrix(
+                data["reactions"], fast_species, slow_symbolic_variables, natnum, slow_species, slow, fast
+            )
+            modified_nodes[slow, fast] = graph.add(determinant, (M_modified,), stage="generator.determinant",
+                                                   info={"slow": slow, "fast": fast, "size": len(fast_species)})
+    determinants = graph.run(max_workers, progress=tracker(progress))
+    return determinants[det_node], {key: determinants[node] for key, node in modified_nodes.items()}
+
+def sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, progress=None, max_workers=1, determinant=None):
     """
     Berechnet die zweite Teilsumme des approximierten Generators für das gegebene Reaktionsnetzwerk.
 
@@ -294,7 +449,8 @@ def sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_specie
     - M die von `create_fast_species_matrix` erzeugte Matrix ist.
     - M{slow, fast} die von `create_modified_fast_species_matrix` erzeugte modifizierte Matrix ist, 
       in der die Spalte `fast` durch einen Vektor aus der b-Matrix ersetzt wurde.
-    - Die Determinanten werden mit `get_matrix_determinant` berechnet.
+    - Die Determinanten werden mit `get_matrix_determinant` berechnet (siehe `slow_fast_determinants`, mit
+      max_workers != 1 parallel).
 
     :param data: Dictionary mit den Reaktionsdaten.
     :param natnum: Symbolische Variable für die Skalierung (z. B. N).
@@ -302,24 +458,19 @@ def sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_specie
     :param fast_species: Liste der schnellen Spezies.
     :param slow_symbolic_variables: Symbolische Variablen der langsamen Spezies.
     :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies.
+    :param progress: Callback oder progress.Progress für Fortschrittsereignisse (siehe `total_sum_of_reactions`).
+    :param max_workers: Anzahl der Prozesse für die Determinanten (None = Anzahl der CPU-Kerne, 1 = seriell).
+    :param determinant: Determinanten-Engine (siehe `slow_fast_determinants`).
     :return: Die berechnete Summe als symbolischer Ausdruck.
     """
     total_sum = 0
+    det_M, determinants = slow_fast_determinants(data, natnum, slow_species, fast_species, slow_symbolic_variables, progress, max_workers, determinant)
 
-    # Berechne die ursprüngliche Matrix M einmal
-    M = create_fast_species_matrix(data["reactions"], fast_species, slow_symbolic_variables, natnum, slow_species)
-    det_M = get_matrix_determinant(M)
-    
     # Iteriere über alle langsamen Spezies S
     for slow in slow_species:
         # Iteriere über alle schnellen Spezies S'
         for fast in fast_species:
-            
-            # Berechne die modifizierte Matrix M{slow, fast}
-            M_modified = create_modified_fast_species_matrix(
-                data["reactions"], fast_species, slow_symbolic_variables, natnum, slow_species, slow, fast
-            )
-            det_M_modified = get_matrix_determinant(M_modified)
+            det_M_modified = determinants[slow, fast]
 
             # Berechne den Ausdruck det(M{slow, fast}) / det(M)
             determinant_ratio = det_M_modified / det_M if det_M != 0 else 0 
@@ -330,21 +481,26 @@ def sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_specie
                 # Prüfe, ob die Reaktion die schnelle Spezies erzeugt
                 if produces_fast_species(reaction, fast, fast_species):
                     
-                    # Berechne die verschiedenen Terme
-                    species_diff = compute_species_difference(reaction, slow)
-                    scaled_rate = compute_scaled_rate(reaction, natnum, slow_species)
-                    slow_species_product = multiply_slow_species(reaction, slow_symbolic_variables)
                     species_derivative = slow_symbolic_derivatives[slow]
-                    
-                    # Berechne den Summanden mit dem Determinantenverhältnis
-                    summand = scaled_rate * slow_species_product * (species_diff + determinant_ratio) * species_derivative
+
+                    if "change" in reaction:
+                        # Zusammengefasste Reaktionen (coalesce_reactions): Änderungen sind bereits gewichtet
+                        summand = (reaction["change"][slow] + reaction["propensity"] * determinant_ratio) * species_derivative
+                    else:
+                        # Berechne die verschiedenen Terme
+                        species_diff = compute_species_difference(reaction, slow)
+                        scaled_rate = compute_scaled_rate(reaction, natnum, slow_species)
+                        slow_species_product = multiply_slow_species(reaction, slow_symbolic_variables)
+
+                        # Berechne den Summanden mit dem Determinantenverhältnis
+                        summand = scaled_rate * slow_species_product * (species_diff + determinant_ratio) * species_derivative
                     
                     # Addiere zum Gesamtwert
                     total_sum += summand
     
     return total_sum
 
-def total_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives):
+def total_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, coalesce=False, progress=None, cancel=None, max_workers=1, determinant=None):
     """
     Berechnet die Gesamtreaktionssumme für den approximierten Generator H^Nf.
 
@@ -361,23 +517,195 @@ def total_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbol
     :param fast_species: Liste der schnellen Spezies.
     :param slow_symbolic_variables: Symbolische Variablen der langsamen Spezies.
     :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies.
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen (siehe `coalesce_reactions`).
+    :param progress: Callback, der vor jeder Stufe ("generator.coalesce", "generator.slow_reactions",
+                     "generator.determinant" je Paar (S, S'), "generator.simplify") und am Ende ("generator.done")
+                     ein Ereignis-Dictionary erhält (siehe progress.Progress).
+    :param cancel: progress.CancellationToken; bei Abbruch wird progress.Cancelled ausgelöst.
+    :param max_workers: Anzahl der Prozesse (None = Anzahl der CPU-Kerne, 1 = seriell). Parallel werden die
+                        Determinanten und, statt eines simplify über die ganze Summe, die Koeffizienten der df_S
+                        einzeln vereinfacht.
+    :param determinant: Determinanten-Engine (siehe `slow_fast_determinants`).
     :return: Die vereinfacht berechnete Gesamtreaktionssumme.
     """
+    report = tracker(progress, cancel)
+    if coalesce:
+        report("generator.coalesce", reactions=len(data["reactions"]))
+        groups = coalesce_reactions(data["reactions"], natnum, slow_species, fast_species, slow_symbolic_variables)
+        data = dict(data, reactions=groups)
+
     # Berechne die Summe der langsamen Reaktionen
-    slow_reactions_sum = sum_over_slow_reactions(data, natnum, slow_species, slow_symbolic_variables, slow_symbolic_derivatives)
+    report("generator.slow_reactions", reactions=len(data["reactions"]))
+    slow_reactions_sum = sum_over_slow_reactions(data, natnum, slow_species, slow_symbolic_variables, slow_symbolic_derivatives, fast_species)
     
     # Berechne die Summe der langsamen und schnellen Spezies-Reaktionen
-    slow_fast_species_reactions_sum = sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives)
+    slow_fast_species_reactions_sum = sum_over_slow_fast_species_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, report, max_workers, determinant)
     
     # Addiere beide Summen, um den approximierten Generator H^Nf zu berechnen
     total_sum = slow_reactions_sum + slow_fast_species_reactions_sum
     
     # Vereinfache den gesamten Ausdruck
-    simplified_total_sum = simplify(total_sum)
+    report("generator.simplify")
+    if max_workers == 1:
+        simplified_total_sum = sp.simplify(total_sum)
+    else:
+        # Hᴺf ist linear in den df_S: Koeffizienten unabhängig voneinander vereinfachen
+        from task_graph import map_nodes
+
+        derivatives = [slow_symbolic_derivatives[species] for species in slow_species]
+        # Ohne Reaktionen ist die Summe die Python-Zahl 0
+        total_sum = sp.sympify(total_sum)
+        coefficients = [total_sum.coeff(derivative) for derivative in derivatives]
+        coefficients = map_nodes(sp.simplify, coefficients, max_workers, progress=report, stage="generator.simplify")
+        simplified_total_sum = sp.Add(*(c * derivative for c, derivative in zip(coefficients, derivatives)))
+    report("generator.done")
     
     return simplified_total_sum
 
 
+def _expand_powers(expression):
+    # Ausmultiplizieren und Potenzen von N mit symbolischen Exponenten je Term zusammenfassen (N**(1-b)*N**(b-1) = 1)
+    return sp.powsimp(sp.expand(expression))
+
+class RationalGenerator:
+    """
+    Hᴺf in Bruchdarstellung mit gemeinsamem Nenner: Hᴺf = Σ_S numerators[S] / denominator · df_S.
+
+    Alle Summanden von `sum_over_slow_fast_species_reactions` enthalten det(M{S,S'}) / det(M). Mit dem Nenner
+    det(M) bleiben die Zähler Summen von Produkten und müssen nicht bei jeder Addition auf einen neuen Hauptnenner
+    gebracht werden; gemeinsame Faktoren von Zählern und Nenner werden einmal am Ende gekürzt (`cancel`).
+    """
+
+    def __init__(self, numerators, denominator, slow_symbolic_derivatives):
+        """
+        :param numerators: Dictionary {langsame Spezies: Zähler}.
+        :param denominator: Gemeinsamer Nenner.
+        :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies.
+        """
+        self.numerators = dict(numerators)
+        self.denominator = sp.sympify(denominator)
+        self.slow_symbolic_derivatives = slow_symbolic_derivatives
+
+    def coefficient(self, slow):
+        """
+        :return: Der Koeffizient von df_{slow} als Bruch.
+        """
+        return self.numerators[slow] / self.denominator
+
+    def as_expr(self):
+        """
+        :return: Symbolischer Ausdruck Σ_S numerators[S] / denominator · df_S.
+        """
+        return sp.Add(*(self.coefficient(slow) * self.slow_symbolic_derivatives[slow] for slow in self.numerators))
+
+    def cancel(self):
+        """
+        Bringt Zähler und Nenner auf Polynomform (verbleibende Brüche darin werden auf den Nenner verschoben) und
+        kürzt den größten gemeinsamen Teiler aller Zähler und des Nenners.
+        :return: Neuer, gekürzter RationalGenerator.
+        """
+        denominator, scale = sp.fraction(sp.together(self.denominator))
+        parts = {slow: sp.fraction(sp.together(numerator)) for slow, numerator in self.numerators.items()}
+        common = sp.lcm_list([scale] + [den for _, den in parts.values()])
+        # (num/den) / (denominator/scale) = num · (common/den) · scale / (denominator · common)
+        numerators = {slow: _expand_powers(num * sp.cancel(common / den) * scale) for slow, (num, den) in parts.items()}
+        denominator = _expand_powers(denominator * common)
+        divisor = sp.gcd_list([denominator] + [num for num in numerators.values() if num != 0])
+        if divisor not in (0, 1):
+            numerators = {slow: _expand_powers(sp.cancel(num / divisor)) for slow, num in numerators.items()}
+            denominator = _expand_powers(sp.cancel(denominator / divisor))
+        return RationalGenerator(numerators, denominator, self.slow_symbolic_derivatives)
+
+    def to_dict(self):
+        """
+        Kompakte, JSON-serialisierbare Darstellung: gemeinsame Erzeuger (srepr, z. B. Raten, v_{S}, Potenzen von N)
+        und je Polynom die Liste der Terme [Exponenten, Koeffizient]. Setzt Polynomform voraus (siehe `cancel`).
+        """
+        from sympy.polys.polyerrors import PolificationFailed
+
+        species = list(self.numerators)
+        expressions = [sp.sympify(expression) for expression in [self.denominator] + [self.numerators[slow] for slow in species]]
+        try:
+            polys, options = sp.parallel_poly_from_expr(expressions)
+            generators = options.gens
+            terms = [[[list(monomial), str(coefficient)] for monomial, coefficient in poly.terms() if coefficient != 0]
+                     for poly in polys]
+        except PolificationFailed:
+            # Nur Konstanten: keine Erzeuger
+            generators = []
+            terms = [[[[], str(expression)]] if expression != 0 else [] for expression in expressions]
+
+        return {
+            "generators": [sp.srepr(generator) for generator in generators],
+            "denominator": terms[0],
+            "numerators": dict(zip(species, terms[1:])),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Liest die Darstellung von `to_dict`.
+        """
+        generators = [sp.sympify(generator) for generator in data["generators"]]
+
+        def polynomial(terms):
+            return sp.Add(*(
+                sp.sympify(coefficient) * sp.Mul(*(g ** e for g, e in zip(generators, monomial)))
+                for monomial, coefficient in terms
+            ))
+
+        species = list(data["numerators"])
+        return cls({slow: polynomial(terms) for slow, terms in data["numerators"].items()},
+                   polynomial(data["denominator"]), init_slow_symbolic_derivatives(species))
+
+def rational_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, coalesce=False, progress=None, cancel=None, max_workers=1, determinant=None):
+    """
+    Berechnet Hᴺf wie `total_sum_of_reactions`, aber als RationalGenerator mit dem gemeinsamen Nenner det(M):
+    jeder Summand wird mit det(M) erweitert und zum Zähler seiner langsamen Spezies gelegt, gekürzt wird nur einmal
+    am Ende. Ist det(M) = 0, verschwinden wie dort die Determinantenverhältnisse und der Nenner ist 1.
+
+    :param progress: Callback für Fortschrittsereignisse (wie `total_sum_of_reactions`, mit "generator.cancel"
+                     statt "generator.simplify").
+    :param cancel: progress.CancellationToken.
+    :param max_workers: Anzahl der Prozesse für die Determinanten (siehe `slow_fast_determinants`).
+    :param determinant: Determinanten-Engine (siehe `slow_fast_determinants`).
+    :return: Gekürzter RationalGenerator.
+    """
+    report = tracker(progress, cancel)
+    if coalesce:
+        report("generator.coalesce", reactions=len(data["reactions"]))
+        data = dict(data, reactions=coalesce_reactions(data["reactions"], natnum, slow_species, fast_species, slow_symbolic_variables))
+
+    det_M, determinants = slow_fast_determinants(data, natnum, slow_species, fast_species, slow_symbolic_variables, report, max_workers, determinant)
+    denominator = det_M if det_M != 0 else sp.S(1)
+
+    # Summanden je langsamer Spezies sammeln und einmal addieren
+    report("generator.slow_reactions", reactions=len(data["reactions"]))
+    terms = {slow: [] for slow in slow_species}
+    for reaction in data["reactions"]:
+        if is_slow_only_reaction(reaction, fast_species):
+            for slow in slow_species:
+                terms[slow].append(reaction_change(reaction, slow, slow_symbolic_variables, natnum, slow_species) * denominator)
+    for slow in slow_species:
+        for fast in fast_species:
+            det_M_modified = determinants[slow, fast] if det_M != 0 else 0
+            for reaction in data["reactions"]:
+                if produces_fast_species(reaction, fast, fast_species):
+                    if "change" in reaction:
+                        terms[slow].append(reaction["change"][slow] * denominator + reaction["propensity"] * det_M_modified)
+                    else:
+                        scaled_rate = compute_scaled_rate(reaction, natnum, slow_species)
+                        slow_species_product = multiply_slow_species(reaction, slow_symbolic_variables)
+                        species_diff = compute_species_difference(reaction, slow)
+                        terms[slow].append(scaled_rate * slow_species_product * (species_diff * denominator + det_M_modified))
+
+    report("generator.cancel")
+    numerators = {slow: sp.Add(*terms[slow]) for slow in slow_species}
+    result = RationalGenerator(numerators, denominator, slow_symbolic_derivatives).cancel()
+    report("generator.done")
+    return result
+
+
 
 
 
@@ -591,7 +919,7 @@ def extract_sub_crns(data):
 def save_sub_crns_as_yaml(data, filename):
     """Speichert die extrahierten Sub-CRNs als separate YAML-Dateien."""
     sub_crns = extract_sub_crns(data)
-    base_name = filename.replace(".yaml", "")
+    base_name = os.path.splitext(filename)[0]
     
     for i, sub_crn in enumerate(sub_crns):
         sub_filename = f"{base_name}sub_{i+1}.yaml"
@@ -622,22 +950,380 @@ def check_all_sub_crns_for_fast_species(reactions, fast_species):
 
     return results
 
+###################################
+
+# Cache der Generator-Teilergebnisse je Sub-CRN (Schlüssel: sub_crn_cache_key); LRU mit höchstens
+# SUB_CRN_CACHE_SIZE Einträgen
+_sub_crn_cache = OrderedDict()
+SUB_CRN_CACHE_SIZE = 1024
+
+def store_sub_crn_result(key, result):
+    """
+    Legt das Generator-Teilergebnis eines Sub-CRNs ab, das anderweitig berechnet wurde (z. B. in
+    partition_scan), damit total_sum_of_reactions_by_sub_crns es wiederverwendet.
+    :param key: Schlüssel aus `sub_crn_cache_key`.
+    :param result: Beitrag des Sub-CRNs zu Hᴺf (wie total_sum_of_sub_crn).
+    """
+    _sub_crn_cache[key] = result
+    _sub_crn_cache.move_to_end(key)
+    while len(_sub_crn_cache) > SUB_CRN_CACHE_SIZE:
+        _sub_crn_cache.popitem(last=False)
+
+def _cached_sub_crn_result(key):
+    # Eintrag des Caches oder None; ein Treffer wird als zuletzt verwendet markiert
+    if key not in _sub_crn_cache:
+        return None
+    _sub_crn_cache.move_to_end(key)
+    return _sub_crn_cache[key]
+
+def parse_srepr(text):
+    """
+    Liest einen mit sp.srepr geschriebenen Ausdruck, ohne den Text auszuwerten: erlaubt sind nur Aufrufe von
+    SymPy-Klassen (Symbol, Integer, Add, ...) mit Zahlen, Zeichenketten, Wahrheitswerten und solchen Aufrufen als
+    Argumenten.
+    :param text: Inhalt einer srepr-Datei.
+    :return: Der SymPy-Ausdruck.
+    :raises ValueError: Wenn der Text kein solcher Ausdruck ist.
+    """
+    import ast
+
+    def build(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float, str)):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            return -build(node.operand)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            cls = getattr(sp, node.func.id, None)
+            if isinstance(cls, type) and issubclass(cls, sp.Basic):
+                return cls(*(build(arg) for arg in node.args), **{keyword.arg: build(keyword.value) for keyword in node.keywords})
+        raise ValueError(f"Unexpected element in srepr text: {ast.dump(node)[:80]}")
+
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as error:
+        raise ValueError(f"Invalid srepr text: {error}")
+    return build(tree.body)
+
+def group_sub_crns_by_fast_species(data):
+    """
+    Zerlegt das CRN in Sub-CRNs, deren schnelle Spezies paarweise disjunkt sind.
+
+    Ausgangspunkt sind die verbundenen Komponenten wie in `extract_sub_crns`. Komponenten, die sich
+    eine schnelle Spezies teilen, werden zusammengelegt. Damit tritt jede schnelle Spezies in genau einem
+    Sub-CRN auf und die Matrix M aus `create_fast_species_matrix` ist blockdiagonal mit einem Block pro Sub-CRN.
+    Reaktionen ohne Edukte oder Produkte bilden hier (anders als in `find_connected_components`) eigene
+    Komponenten, damit keine Reaktion verloren geht.
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :return: Liste von Sub-CRN-Dictionaries im Format von `extract_sub_crns`.
+    """
+    reactions = data["reactions"]
+    fast_species = set(data["species"]["fast"])
+    parent = list(range(len(reactions)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Verbinde Reaktionen über gemeinsame Komplexe und gemeinsame schnelle Spezies
+    first_reaction = {}
+    for idx, reaction in enumerate(reactions):
+        educts = frozenset(reaction.get("educts", {}).keys())
+        products = frozenset(reaction.get("products", {}).keys())
+        nodes = [("complex", c) for c in (educts, products) if c]
+        nodes += [("fast", s) for s in (educts | products) & fast_species]
+        for node in nodes:
+            if node in first_reaction:
+                parent[find(idx)] = find(first_reaction[node])
+            else:
+                first_reaction[node] = idx
+
+    groups = defaultdict(list)
+    for idx, reaction in enumerate(reactions):
+        groups[find(idx)].append(reaction)
+
+    sub_crns = []
+    for i, component in enumerate(groups.values()):
+        species_set = set()
+        for reaction in component:
+            species_set.update(reaction.get("educts", {}).keys())
+            species_set.update(reaction.get("products", {}).keys())
 
+        sub_crns.append({
+            "name": f"{data.get('name', 'CRN')}_sub_{i+1}",
+            "natnum": data.get("natnum", "N"),
+            "species": {
+                "slow": [s for s in data["species"]["slow"] if s in species_set],
+                "fast": [s for s in data["species"]["fast"] if s in species_set],
+            },
+            "reactions": component,
+        })
 
+    return sub_crns
 
+def sub_crn_cache_key(sub_crn):
+    """
+    Berechnet einen inhaltsbasierten Schlüssel für ein Sub-CRN (der Name geht nicht ein).
+    :param sub_crn: Sub-CRN-Dictionary.
+    :return: SHA-256-Hexstring.
+    """
+    content = {key: sub_crn.get(key) for key in ("natnum", "species", "reactions")}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
 
+def total_sum_of_sub_crn(sub_crn, natnum, slow_symbolic_variables, slow_symbolic_derivatives, coalesce=False):
+    """
+    Berechnet den approximierten Generator für ein einzelnes Sub-CRN (Arbeitsfunktion für den Prozesspool).
+    :param sub_crn: Sub-CRN-Dictionary.
+    :param natnum: Symbolische Variable für N.
+    :param slow_symbolic_variables: Symbolische Variablen der langsamen Spezies des Sub-CRNs.
+    :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies des Sub-CRNs.
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen.
+    :return: Der vereinfachte Beitrag des Sub-CRNs zu Hᴺf.
+    """
+    return total_sum_of_reactions(
+        sub_crn, natnum, sub_crn["species"]["slow"], sub_crn["species"]["fast"],
+        slow_symbolic_variables, slow_symbolic_derivatives, coalesce
+    )
+
+def total_sum_of_reactions_by_sub_crns(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, max_workers=None, cache_dir=None, coalesce=False):
+    """
+    Berechnet den approximierten Generator Hᴺf getrennt für jedes Sub-CRN und addiert die Beiträge.
+
+    Da die schnellen Spezies verschiedener Sub-CRNs (siehe `group_sub_crns_by_fast_species`) nicht
+    miteinander reagieren, ist M blockdiagonal. Nach der Cramerschen Regel hängt det(M{S,S'})/det(M) dann nur
+    vom Block ab, der S' enthält, sodass jedes Sub-CRN unabhängig (und parallel in einem Prozesspool)
+    berechnet werden kann. Ist det(M) eines Blocks 0, verschwinden nur die Quotienten dieses Blocks.
 
+    Die Ergebnisse werden pro Sub-CRN im Speicher (LRU, SUB_CRN_CACHE_SIZE) und optional als srepr-Dateien in
+    `cache_dir` abgelegt; diese werden mit `parse_srepr` gelesen, nicht ausgewertet.
 
+    :param data: Dictionary mit den Reaktionsdaten.
+    :param natnum: Symbolische Variable für die Skalierung (z. B. N).
+    :param slow_species: Liste der langsamen Spezies.
+    :param fast_species: Liste der schnellen Spezies.
+    :param slow_symbolic_variables: Symbolische Variablen der langsamen Spezies.
+    :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies.
+    :param max_workers: Anzahl der Prozesse (Standard: Anzahl der CPU-Kerne, 1 = seriell).
+    :param cache_dir: Optionales Verzeichnis für den persistenten Cache.
+    :param coalesce: Strukturell gleiche Reaktionen je Sub-CRN vorab zusammenfassen.
+    :return: Die Summe der Beiträge aller Sub-CRNs.
+    """
+    data = dict(data, species={"slow": list(slow_species), "fast": list(fast_species)})
+    sub_crns = group_sub_crns_by_fast_species(data)
+
+    # Beiträge dieses Aufrufs; unabhängig davon, ob sie später aus dem LRU-Cache verdrängt werden
+    contributions = {}
+    jobs = {}
+    for sub_crn in sub_crns:
+        key = sub_crn_cache_key(dict(sub_crn, natnum=str(natnum)))
+        if key in contributions or key in jobs:
+            continue
+        cached = _cached_sub_crn_result(key)
+        cache_file = os.path.join(cache_dir, f"{key}.srepr") if cache_dir else None
+        if cached is None and cache_file and os.path.exists(cache_file):
+            with open(cache_file, "r") as file:
+                cached = parse_srepr(file.read())
+            store_sub_crn_result(key, cached)
+        if cached is not None:
+            contributions[key] = cached
+        else:
+            slow = sub_crn["species"]["slow"]
+            jobs[key] = (
+                sub_crn,
+                natnum,
+                {species: slow_symbolic_variables[species] for species in slow},
+                {species: slow_symbolic_derivatives[species] for species in slow},
+                coalesce,
+            )
 
+    if len(jobs) > 1 and max_workers != 1:
+        with WorkerPool(min(len(jobs), max_workers or os.cpu_count() or 1)) as executor:
+            futures = {key: executor.submit(total_sum_of_sub_crn, *args) for key, args in jobs.items()}
+            results = {key: future.result() for key, future in futures.items()}
+    else:
+        results = {key: total_sum_of_sub_crn(*args) for key, args in jobs.items()}
 
+    for key, result in results.items():
+        contributions[key] = result
+        store_sub_crn_result(key, result)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(os.path.join(cache_dir, f"{key}.srepr"), "w") as file:
+                file.write(sp.srepr(result))
 
+    return sp.Add(*(contributions[sub_crn_cache_key(dict(sub_crn, natnum=str(natnum)))] for sub_crn in sub_crns))
 
 
 
 
+#####################################
 
+class GeneratorQuery:
+    """
+    Berechnet einzelne Koeffizienten des approximierten Generators Hᴺf bei Bedarf.
 
+    Hᴺf = Σ_S c_S · df_S. Für den Koeffizienten c_S einer langsamen Spezies S werden nur die Reaktionssummen für S
+    und die Determinanten det(M{S,S'}) der schnellen Spezies S' berechnet, die von einer Reaktion erzeugt werden
+    (siehe `produces_fast_species`); alle übrigen Beiträge sind 0. M und det(M) werden einmal beim ersten Bedarf
+    berechnet, alle Zwischenergebnisse werden in der Instanz gespeichert.
+    """
 
+    def __init__(self, data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, coalesce=False):
+        """
+        :param data: Dictionary mit den Reaktionsdaten.
+        :param natnum: Symbolische Variable für die Skalierung (z. B. N).
+        :param slow_species: Liste der langsamen Spezies.
+        :param fast_species: Liste der schnellen Spezies.
+        :param slow_symbolic_variables: Symbolische Variablen der langsamen Spezies.
+        :param slow_symbolic_derivatives: Symbolische Ableitungen der langsamen Spezies.
+        :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen (siehe `coalesce_reactions`).
+        """
+        self.natnum = natnum
+        self.slow_species = list(slow_species)
+        self.fast_species = list(fast_species)
+        self.slow_symbolic_variables = slow_symbolic_variables
+        self.slow_symbolic_derivatives = slow_symbolic_derivatives
+        self.reactions = data["reactions"]
+        if coalesce:
+            self.reactions = coalesce_reactions(self.reactions, natnum, slow_species, fast_species, slow_symbolic_variables)
+        self._M = None
+        self._det_M = None
+        self._producers = {}
+        self._determinants = {}
+        self._entries = {}
+        self._coefficients = {}
+
+    def _check_slow(self, slow):
+        if slow not in self.slow_symbolic_derivatives:
+            raise KeyError(f"'{slow}' is not a slow species")
+
+    def _check_fast(self, fast):
+        if fast not in self.fast_species:
+            raise KeyError(f"'{fast}' is not a fast species")
+
+    def matrix(self):
+        """
+        :return: Die Matrix M aus `create_fast_species_matrix` (wird einmal erstellt).
+        """
+        if self._M is None:
+            self._M = create_fast_species_matrix(
+                self.reactions, self.fast_species, self.slow_symbolic_variables, self.natnum, self.slow_species
+            )
+        return self._M
+
+    def determinant(self):
+        """
+        :return: det(M), vereinfacht.
+        """
+        if self._det_M is None:
+            self._det_M = get_matrix_determinant(self.matrix())
+        return self._det_M
+
+    def producers(self, fast):
+        """
+        :return: Die Reaktionen, die die schnelle Spezies erzeugen, ohne eine schnelle Spezies zu verbrauchen.
+        """
+        if fast not in self._producers:
+            self._producers[fast] = [
+                reaction for reaction in self.reactions if produces_fast_species(reaction, fast, self.fast_species)
+            ]
+        return self._producers[fast]
+
+    def modified_determinant(self, slow, fast):
+        """
+        Berechnet det(M{slow, fast}) wie `create_modified_fast_species_matrix`, ausgehend von der gespeicherten Matrix M.
+        :return: det(M{slow, fast}), vereinfacht.
+        """
+        self._check_slow(slow)
+        self._check_fast(fast)
+        key = (slow, fast)
+        if key not in self._determinants:
+            M = {S: dict(row) for S, row in self.matrix().items()}
+            for S_double_prime in self.fast_species:
+                M[S_double_prime][fast] = sum(
+                    reaction_change(reaction, slow, self.slow_symbolic_variables, self.natnum, self.slow_species)
+                    for reaction in self.reactions if consumes_fast_species(reaction, S_double_prime)
+                )
+            self._determinants[key] = get_matrix_determinant(M)
+        return self._determinants[key]
+
+    def ratio(self, slow, fast):
+        """
+        :return: det(M{slow, fast}) / det(M), bzw. 0 wenn det(M) = 0.
+        """
+        det_M = self.determinant()
+        if det_M == 0:
+            return 0
+        return self.modified_determinant(slow, fast) / det_M
+
+    def entry(self, slow, fast):
+        """
+        Berechnet den Beitrag der Reaktionen, die die schnelle Spezies `fast` erzeugen, zum Koeffizienten von df_{slow}
+        (der Summand von `sum_over_slow_fast_species_reactions` ohne df_{slow}).
+        Die Determinanten werden nur berechnet, wenn es solche Reaktionen gibt.
+        :return: Symbolischer Ausdruck.
+        """
+        self._check_slow(slow)
+        self._check_fast(fast)
+        key = (slow, fast)
+        if key not in self._entries:
+            total = 0
+            producers = self.producers(fast)
+            if producers:
+                determinant_ratio = self.ratio(slow, fast)
+                for reaction in producers:
+                    if "change" in reaction:
+                        total += reaction["change"][slow] + reaction["propensity"] * determinant_ratio
+                    else:
+                        scaled_rate = compute_scaled_rate(reaction, self.natnum, self.slow_species)
+                        slow_species_product = multiply_slow_species(reaction, self.slow_symbolic_variables)
+                        total += scaled_rate * slow_species_product * (compute_species_difference(reaction, slow) + determinant_ratio)
+            self._entries[key] = total
+        return self._entries[key]
+
+    def coefficient(self, slow):
+        """
+        Berechnet den vereinfachten Koeffizienten von df_{slow} in Hᴺf.
+        :param slow: Eine langsame Spezies.
+        :return: Symbolischer Ausdruck.
+        """
+        self._check_slow(slow)
+        if slow not in self._coefficients:
+            slow_reactions_sum = sum(
+                reaction_change(reaction, slow, self.slow_symbolic_variables, self.natnum, self.slow_species)
+                for reaction in self.reactions if is_slow_only_reaction(reaction, self.fast_species)
+            )
+            fast_sum = sum(self.entry(slow, fast) for fast in self.fast_species)
+            self._coefficients[slow] = sp.simplify(slow_reactions_sum + fast_sum)
+        return self._coefficients[slow]
+
+    def coefficients(self, slow_species=None):
+        """
+        :param slow_species: Liste der gewünschten langsamen Spezies (Standard: alle).
+        :return: Dictionary {Spezies: Koeffizient von df_{Spezies}}.
+        """
+        return {slow: self.coefficient(slow) for slow in (self.slow_species if slow_species is None else slow_species)}
+
+    def generator(self, slow_species=None):
+        """
+        Setzt Hᴺf aus den Koeffizienten zusammen; mit slow_species nur den Anteil dieser Spezies.
+        :return: Symbolischer Ausdruck Σ_S c_S · df_S.
+        """
+        return sp.Add(*(
+            coefficient * self.slow_symbolic_derivatives[slow]
+            for slow, coefficient in self.coefficients(slow_species).items()
+        ))
+
+def generator_coefficients(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, species, coalesce=False):
+    """
+    Berechnet nur die Koeffizienten von df_S für die angegebenen langsamen Spezies (siehe `GeneratorQuery`).
+    :param species: Liste der gewünschten langsamen Spezies.
+    :return: Dictionary {Spezies: Koeffizient von df_{Spezies}}.
+    """
+    query = GeneratorQuery(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, coalesce)
+    return query.coefficients(species)
 
 
 
@@ -646,60 +1332,71 @@ def check_all_sub_crns_for_fast_species(reactions, fast_species):
 
 
 
-# Laden der Daten
+def main():
+    """
+    Interaktiver Einstiegspunkt: fragt nach einer CRN-Datei, speichert die Sub-CRNs und gibt Hᴺf aus.
+    """
+    telemetry.configure_from_env()
 
-#data = load_yaml("crn.yaml")
+    # Laden der Daten
 
-# Nutzer nach CRN-Datei fragen
-filename = input("\nWhich CRN would you like to load? ") + ".yaml"
-data = load_yaml(filename)
+    #data = load_yaml("crn.yaml")
 
-# Name des geladenen CRNs ausgeben
-print(f"\nLoaded CRN: {data.get('name', 'Unbekannt')}")
+    # Nutzer nach CRN-Datei fragen
+    filename = input("\nWhich CRN would you like to load? ")
+    if not os.path.splitext(filename)[1]:
+        filename += ".yaml"
 
+    # .yaml, .json und kompilierte .crnb-Dateien werden gleichermaßen akzeptiert
+    from compiled_network import load_network
+    data = load_network(filename)
 
-slow_species = data["species"]["slow"]
-fast_species = data["species"]["fast"]
-natnum = sp.Symbol(data["natnum"])
-slow_symbolic_variables = init_slow_symbolic_variables(slow_species)
-slow_symbolic_derivatives = init_slow_symbolic_derivatives(slow_species)
+    # Name des geladenen CRNs ausgeben
+    print(f"\nLoaded CRN: {data.get('name', 'Unbekannt')}")
 
-#print(fast_species)
-#print(slow_species)
 
+    slow_species = data["species"]["slow"]
+    fast_species = data["species"]["fast"]
+    natnum = sp.Symbol(data["natnum"])
+    slow_symbolic_variables = init_slow_symbolic_variables(slow_species)
+    slow_symbolic_derivatives = init_slow_symbolic_derivatives(slow_species)
 
-print("\nIs this CRN connected? ", is_crn_connected(data["reactions"]))
-print(f"\nNumber of connected sub-CRNs: {count_connected_components(data['reactions'])}")
+    #print(fast_species)
+    #print(slow_species)
 
-#M = create_fast_species_matrix(data["reactions"], fast_species, slow_symbolic_variables, natnum, slow_species)
-#det_M = get_matrix_determinant(M)
 
-#print(det_M.simplify())
+    print("\nIs this CRN connected? ", is_crn_connected(data["reactions"]))
+    print(f"\nNumber of connected sub-CRNs: {count_connected_components(data['reactions'])}")
 
+    #M = create_fast_species_matrix(data["reactions"], fast_species, slow_symbolic_variables, natnum, slow_species)
+    #det_M = get_matrix_determinant(M)
 
-#results = check_under_crns_for_fast_species(data["reactions"], fast_species)
+    #print(det_M.simplify())
 
-#print(results)
 
+    #results = check_under_crns_for_fast_species(data["reactions"], fast_species)
 
+    #print(results)
 
 
 
 
-save_sub_crns_as_yaml(data, filename)
 
 
-results = check_all_sub_crns_for_fast_species(data["reactions"], fast_species)
+    save_sub_crns_as_yaml(data, filename)
 
-print(results)
 
+    results = check_all_sub_crns_for_fast_species(data["reactions"], fast_species)
 
+    print(results)
 
-toto = total_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives)
 
-print("\nApproximate generator Hᴺf is given by")
-sp.pprint(sympify(toto).simplify())  # Schöne symbolische Ausgabe
 
+    toto = total_sum_of_reactions(data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives)
 
+    print("\nApproximate generator Hᴺf is given by")
+    sp.pprint(sp.sympify(toto).simplify())  # Schöne symbolische Ausgabe
 
 
+if __name__ == "__main__":
+    main()
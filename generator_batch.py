@@ -0,0 +1,228 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+
+import telemetry
+from compiled_network import load_network
+from worker_pool import JobFailed, WorkerPool, parse_memory
+
+
+def expand_inputs(patterns):
+    """
+    Expandiert Dateinamen und Glob-Muster (z. B. "kk*.yaml") zu einer sortierten Liste ohne Duplikate.
+    :param patterns: Liste von Pfaden oder Mustern.
+    :return: Liste der Dateipfade.
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+def file_hash(file_path):
+    """
+    Berechnet den SHA-256-Hash des Dateiinhalts, damit geänderte Dateien beim Fortsetzen neu berechnet werden.
+    """
+    with open(file_path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def run_options(by_sub_crns=False, coalesce=False, rational=False):
+    """
+    Die Optionen, die das Ergebnis eines Netzwerks bestimmen; sie werden in jedem Eintrag gespeichert und gehören zum
+    Schlüssel beim Fortsetzen.
+    :return: Dictionary {Option: Wert} (rational entfällt mit by_sub_crns, siehe `process_network`).
+    """
+    return {"by_sub_crns": bool(by_sub_crns), "coalesce": bool(coalesce), "rational": bool(rational and not by_sub_crns)}
+
+def _options_key(options):
+    return json.dumps(options, sort_keys=True) if options is not None else None
+
+def finished_inputs(output_path):
+    """
+    Liest eine vorhandene JSON-Lines-Ausgabe und gibt die erfolgreich bearbeiteten Eingaben zurück. Einträge mit
+    status "error" oder "failed" zählen nicht, damit sie beim Fortsetzen erneut berechnet werden.
+    Eine nach einem Absturz abgeschnittene letzte Zeile wird ignoriert.
+    :param output_path: Pfad der JSON-Lines-Datei.
+    :return: Menge von (Pfad, Dateihash, Optionen); Optionen als JSON-Zeichenkette von `run_options`
+             (None für Einträge ohne gespeicherte Optionen).
+    """
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path, "r") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add((record.get("input"), record.get("file_hash"), _options_key(record.get("options"))))
+    return done
+
+def truncate_partial_line(output_path):
+    """
+    Entfernt eine nach einem Absturz abgeschnittene letzte Zeile (ohne abschließenden Zeilenumbruch), damit neue
+    Einträge nicht an sie angehängt werden.
+    :param output_path: Pfad der JSON-Lines-Datei.
+    """
+    if not output_path or not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as file:
+        content = file.read()
+        if content and not content.endswith(b"\n"):
+            file.truncate(content.rfind(b"\n") + 1)
+
+def process_network(file_path, by_sub_crns=False, coalesce=False, rational=False):
+    """
+    Berechnet den approximierten Generator für eine Netzwerkdatei ohne Benutzereingaben oder Dateiausgaben.
+    :param file_path: Pfad zur .yaml-, .json- oder .crnb-Datei.
+    :param by_sub_crns: Generator pro Sub-CRN berechnen (siehe total_sum_of_reactions_by_sub_crns).
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen (siehe generator.coalesce_reactions).
+    :param rational: Ergebnis mit gemeinsamem Nenner berechnen und kompakt speichern (siehe
+                     generator.rational_sum_of_reactions); wird mit by_sub_crns ignoriert.
+    :return: Dictionary mit Ergebnis, Zeitmessungen und Komponenteninformationen.
+    """
+    record = {"input": os.path.abspath(file_path), "file_hash": file_hash(file_path),
+              "options": run_options(by_sub_crns, coalesce, rational), "status": "ok"}
+    timings = {}
+    start = time.perf_counter()
+    try:
+        import sympy as sp
+        import generator
+
+        data = load_network(file_path)
+        timings["load"] = time.perf_counter() - start
+        record["name"] = data.get("name")
+
+        slow_species = data["species"]["slow"]
+        fast_species = data["species"]["fast"]
+        natnum = sp.Symbol(data.get("natnum", "N"))
+        slow_symbolic_variables = generator.init_slow_symbolic_variables(slow_species)
+        slow_symbolic_derivatives = generator.init_slow_symbolic_derivatives(slow_species)
+
+        step = time.perf_counter()
+        record["components"] = {
+            "connected": generator.is_crn_connected(data["reactions"]),
+            "count": generator.count_connected_components(data["reactions"]),
+            "fast_species_check": generator.check_all_sub_crns_for_fast_species(data["reactions"], fast_species),
+            "sub_crns": [
+                {"name": sub_crn["name"], "species": sub_crn["species"], "reactions": len(sub_crn["reactions"])}
+                for sub_crn in generator.extract_sub_crns(dict(data, natnum=str(natnum)))
+            ],
+        }
+        if coalesce:
+            groups = generator.coalesce_reactions(data["reactions"], natnum, slow_species, fast_species, slow_symbolic_variables)
+            record["components"]["coalesced"] = [group["members"] for group in groups]
+        timings["analysis"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        args = (data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives)
+        if by_sub_crns:
+            # Der Batch ist bereits über Netzwerke parallelisiert, daher die Sub-CRNs hier seriell
+            result = generator.total_sum_of_reactions_by_sub_crns(*args, max_workers=1, coalesce=coalesce)
+        elif rational:
+            result = generator.rational_sum_of_reactions(*args, coalesce=coalesce)
+        else:
+            result = generator.total_sum_of_reactions(*args, coalesce=coalesce)
+        timings["generator"] = time.perf_counter() - step
+
+        if isinstance(result, generator.RationalGenerator):
+            record["result"] = {"str": str(result.as_expr()), "rational": result.to_dict()}
+        else:
+            record["result"] = {"str": str(result), "srepr": sp.srepr(result), "latex": sp.latex(result)}
+    except MemoryError:
+        raise  # der Worker-Pool meldet die Speichergrenze und ersetzt den Worker
+    except Exception as error:
+        record["status"] = "error"
+        record["error"] = f"{type(error).__name__}: {error}"
+    timings["total"] = time.perf_counter() - start
+    record["timings"] = timings
+    return record
+
+def run_batch(paths, output=None, max_workers=None, by_sub_crns=False, resume=True, coalesce=False, max_memory=None, max_cpu=None, rational=False):
+    """
+    Bearbeitet mehrere Netzwerkdateien in einem Prozesspool (worker_pool.WorkerPool) und schreibt pro Netzwerk
+    eine JSON-Zeile, sobald es fertig ist. Mit resume=True werden bereits in `output` mit denselben Optionen
+    (`run_options`) erfolgreich bearbeitete Eingaben übersprungen.
+    Überschreitet ein Netzwerk eine Grenze, wird es mit status "failed" und dem Grund protokolliert.
+    :param paths: Liste der Dateipfade.
+    :param output: Pfad der JSON-Lines-Datei (None = stdout).
+    :param max_workers: Anzahl der Prozesse (Standard: Anzahl der CPU-Kerne).
+    :param by_sub_crns: Generator pro Sub-CRN berechnen.
+    :param resume: Bereits bearbeitete Eingaben überspringen.
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen.
+    :param max_memory: Speichergrenze pro Worker in Bytes (None = unbegrenzt).
+    :param max_cpu: CPU-Zeit pro Netzwerk in Sekunden (None = unbegrenzt).
+    :param rational: Ergebnisse mit gemeinsamem Nenner speichern (siehe `process_network`).
+    :return: Anzahl der neu bearbeiteten Netzwerke.
+    """
+    done = finished_inputs(output) if resume else set()
+    truncate_partial_line(output)
+    options = run_options(by_sub_crns, coalesce, rational)
+    pending, hashes, unreadable = [], {}, []
+    for path in paths:
+        try:
+            hashes[path] = file_hash(path)
+            if (os.path.abspath(path), hashes[path], _options_key(options)) not in done:
+                pending.append(path)
+        except OSError as error:
+            # Fehlende oder unlesbare Dateien werden protokolliert, statt den ganzen Batch abzubrechen
+            unreadable.append({"input": os.path.abspath(path), "file_hash": None, "options": options, "status": "error",
+                               "error": f"{type(error).__name__}: {error}"})
+
+    stream = open(output, "a") if output else sys.stdout
+    try:
+        for record in unreadable:
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+        with WorkerPool(max_workers, max_memory, max_cpu) as executor:
+            futures = {executor.submit(process_network, path, by_sub_crns, coalesce, rational): path for path in pending}
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except JobFailed as error:
+                    path = futures[future]
+                    record = {"input": os.path.abspath(path), "file_hash": hashes[path], "options": options, "status": "failed",
+                              "reason": error.reason, "error": error.message}
+                except Exception as error:
+                    # Abgestürzte Worker werden protokolliert, damit der Batch weiterläuft
+                    path = futures[future]
+                    record = {"input": os.path.abspath(path), "file_hash": hashes[path], "options": options, "status": "error",
+                              "error": f"{type(error).__name__}: {error}"}
+                stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+                stream.flush()
+    finally:
+        if output:
+            stream.close()
+    return len(pending) + len(unreadable)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute the approximate generator for many CRN files.")
+    parser.add_argument("inputs", nargs="+", help="network files or glob patterns, e.g. 'kk*.yaml'")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--by-sub-crns", action="store_true", help="compute the generator per sub-CRN")
+    parser.add_argument("--coalesce", action="store_true", help="merge structurally identical reactions first")
+    parser.add_argument("--rational", action="store_true",
+                        help="store numerators per df_S over the common denominator det(M) instead of srepr/latex")
+    parser.add_argument("--no-resume", action="store_true", help="recompute inputs already present in the output")
+    parser.add_argument("--max-memory", type=parse_memory, help="address-space limit per worker, e.g. 4G")
+    parser.add_argument("--max-cpu", type=float, help="CPU-time limit per network in seconds")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    paths = expand_inputs(args.inputs)
+    count = run_batch(paths, args.output, args.jobs, args.by_sub_crns, resume=not args.no_resume, coalesce=args.coalesce,
+                      max_memory=args.max_memory, max_cpu=args.max_cpu, rational=args.rational)
+    print(f"✅ Processed {count} of {len(paths)} networks", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
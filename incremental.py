@@ -0,0 +1,344 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import telemetry
+from compiled_network import load_network
+from lazy_import import lazy_import
+
+sp = lazy_import("sympy")
+
+
+def reaction_key(reaction):
+    """
+    :return: Hashbarer Schlüssel einer Reaktion aus Edukten, Produkten, Rate und Skalierung.
+    """
+    return json.dumps(
+        {
+            "educts": reaction.get("educts") or {},
+            "products": reaction.get("products") or {},
+            "rate": reaction["rate"],
+            "scale": str(reaction["scale"]),
+        },
+        sort_keys=True,
+    )
+
+def diff_networks(base, variant):
+    """
+    Vergleicht zwei Netzwerke im Dictionary-Format von crn.yaml.
+
+    Reaktionen werden als Multimenge über `reaction_key` verglichen, die Reihenfolge spielt also keine Rolle.
+
+    :param base: Ausgangsnetzwerk.
+    :param variant: Geändertes Netzwerk.
+    :return: Dictionary mit "species" (True, wenn sich natnum oder die Aufteilung in langsam/schnell geändert hat),
+             "removed" und "added" (Listen von Reaktionen).
+    """
+    species_changed = (
+        base.get("natnum", "N") != variant.get("natnum", "N")
+        or list(base["species"].get("slow") or []) != list(variant["species"].get("slow") or [])
+        or list(base["species"].get("fast") or []) != list(variant["species"].get("fast") or [])
+    )
+    base_keys = Counter(reaction_key(reaction) for reaction in base["reactions"])
+    variant_keys = Counter(reaction_key(reaction) for reaction in variant["reactions"])
+    removed_keys = base_keys - variant_keys
+    added_keys = variant_keys - base_keys
+
+    def pick(reactions, counts):
+        counts = Counter(counts)
+        picked = []
+        for reaction in reactions:
+            key = reaction_key(reaction)
+            if counts[key]:
+                counts[key] -= 1
+                picked.append(reaction)
+        return picked
+
+    return {
+        "species": species_changed,
+        "removed": pick(base["reactions"], removed_keys),
+        "added": pick(variant["reactions"], added_keys),
+    }
+
+
+class IncrementalGenerator:
+    """
+    Approximierter Generator Hᴺf eines Netzwerks mit gespeicherten Zwischenergebnissen für Varianten.
+
+    Gespeichert werden M (siehe generator.create_fast_species_matrix), die Spalten b_S, die in M{S,S'} die Spalte S'
+    ersetzen (siehe generator.create_modified_fast_species_matrix), det(M) und die benötigten det(M{S,S'}).
+    `update` vergleicht eine Variante mit diesem Netzwerk und ändert nur die Beiträge der entfernten bzw.
+    hinzugekommenen Reaktionen. Ändert sich dabei nur eine Zeile r einer Matrix A (eine Rang-1-Änderung
+    A + e_r·uᵀ, z. B. eine geänderte schnelle Reaktion), so folgt die neue Determinante aus der Entwicklung
+    nach Zeile r mit den gespeicherten Kofaktoren von A: det(A') = Σ_T A'[r][T]·C[r][T]. Die Kofaktoren
+    hängen nicht von Zeile r ab und werden je Zeile einmal berechnet und für alle Varianten wiederverwendet.
+    Bei mehreren geänderten Zeilen wird die Determinante neu berechnet.
+    """
+
+    def __init__(self, data):
+        """
+        :param data: Dictionary mit den Reaktionsdaten.
+        """
+        import generator
+
+        self.data = data
+        self.natnum = sp.Symbol(data.get("natnum", "N"))
+        self.slow_species = list(data["species"].get("slow") or [])
+        self.fast_species = list(data["species"].get("fast") or [])
+        self.slow_symbolic_variables = generator.init_slow_symbolic_variables(self.slow_species)
+        self.slow_symbolic_derivatives = generator.init_slow_symbolic_derivatives(self.slow_species)
+        self.M = {S: {T: sp.S(0) for T in self.fast_species} for S in self.fast_species}
+        self.b = {slow: {S: sp.S(0) for S in self.fast_species} for slow in self.slow_species}
+        for reaction in data["reactions"]:
+            self._apply(reaction, 1)
+        self._det_M = None
+        self._determinants = {}
+        self._cofactors = {}
+        self._result = None
+        self.stats = Counter()
+
+    def _apply(self, reaction, sign):
+        # Beitrag einer Reaktion zu M und b wie in create_fast_species_matrix/create_modified_fast_species_matrix
+        import generator
+
+        consumed = [S for S in self.fast_species if generator.consumes_fast_species(reaction, S)]
+        if not consumed:
+            return
+        propensity = generator.reaction_propensity(reaction, self.slow_symbolic_variables, self.natnum, self.slow_species)
+        for S in self.fast_species:
+            if generator.consumes_fast_species_without_producing(reaction, S):
+                self.M[S][S] += sign * propensity
+            for T in self.fast_species:
+                if S != T and generator.consumes_and_produces_fast_species(reaction, S, T):
+                    self.M[S][T] -= sign * propensity
+        for slow in self.slow_species:
+            change = generator.reaction_change(reaction, slow, self.slow_symbolic_variables, self.natnum, self.slow_species)
+            for S in consumed:
+                self.b[slow][S] += sign * change
+
+    def _matrix(self, key):
+        # key None: M, sonst (slow, fast): M{slow, fast}
+        if key is None:
+            return self.M
+        slow, fast = key
+        return {S: dict(row, **{fast: self.b[slow][S]}) for S, row in self.M.items()}
+
+    def _rows(self, key):
+        matrix = self._matrix(key)
+        return [[matrix[S][T] for T in self.fast_species] for S in self.fast_species]
+
+    def cofactors(self, key, row):
+        """
+        Berechnet die Kofaktoren C[row][T] von M (key None) bzw. M{slow, fast} (key (slow, fast)).
+        :return: Liste der Kofaktoren in der Reihenfolge der schnellen Spezies.
+        """
+        import generator
+
+        if (key, row) not in self._cofactors:
+            rows = self._rows(key)
+            i = self.fast_species.index(row)
+            cofactors = []
+            for j in range(len(self.fast_species)):
+                # Minor als Dictionary-Matrix mit den Schlüsseln 0, 1, ... (get_matrix_determinant sortiert sie)
+                minor_rows = [[value for column, value in enumerate(values) if column != j] for r, values in enumerate(rows) if r != i]
+                minor = {r: dict(enumerate(values)) for r, values in enumerate(minor_rows)}
+                cofactors.append((-1) ** (i + j) * (generator.get_matrix_determinant(minor) if minor else sp.S(1)))
+            self._cofactors[(key, row)] = cofactors
+            self.stats["cofactor rows"] += 1
+        return self._cofactors[(key, row)]
+
+    def _compute_determinant(self, key):
+        import generator
+
+        self.stats["full"] += 1
+        return generator.get_matrix_determinant(self._matrix(key))
+
+    def determinant(self, key=None):
+        """
+        :param key: None für det(M), (slow, fast) für det(M{slow, fast}).
+        :return: Die vereinfachte Determinante.
+        """
+        if key is None:
+            if self._det_M is None:
+                self._det_M = self._compute_determinant(None)
+            return self._det_M
+        if key not in self._determinants:
+            self._determinants[key] = self._compute_determinant(key)
+        return self._determinants[key]
+
+    def _updated_determinant(self, variant, key):
+        # Determinante der Variante aus der des Ausgangsnetzwerks (gleiche Matrix oder Änderung einer Zeile)
+        old, new = self._matrix(key), variant._matrix(key)
+        changed = [S for S in self.fast_species if any(sp.S(new[S][T] - old[S][T]) != 0 for T in self.fast_species)]
+        if not changed:
+            variant.stats["reused"] += 1
+            return self.determinant(key)
+        if len(changed) == 1:
+            variant.stats["rank-one"] += 1
+            cofactors = self.cofactors(key, changed[0])
+            return sp.simplify(sp.Add(*(new[changed[0]][T] * C for T, C in zip(self.fast_species, cofactors))))
+        return variant._compute_determinant(key)
+
+    def _needed(self):
+        # Nur für erzeugte schnelle Spezies wird det(M{S,S'}) gebraucht (siehe generator.GeneratorQuery.entry)
+        import generator
+
+        if self.determinant() == 0:
+            return []
+        producing = [
+            fast for fast in self.fast_species
+            if any(generator.produces_fast_species(reaction, fast, self.fast_species) for reaction in self.data["reactions"])
+        ]
+        return [(slow, fast) for slow in self.slow_species for fast in producing]
+
+    def result(self, coalesce=False):
+        """
+        Setzt Hᴺf wie generator.total_sum_of_reactions aus den gespeicherten Determinanten zusammen.
+        :param coalesce: Nicht unterstützt, da M, b_S und die Kofaktoren je Reaktion aktualisiert werden
+                         (siehe generator.coalesce_reactions); nur vorhanden, um den Aufruf abzuweisen.
+        :return: Der vereinfachte approximierte Generator als SymPy-Ausdruck.
+        :raises ValueError: Wenn coalesce gesetzt ist.
+        """
+        import generator
+
+        if coalesce:
+            raise ValueError("the incremental generator works per reaction and does not support coalesce")
+        if self._result is None:
+            det_M = self.determinant()
+            needed = self._needed()
+            total = generator.sum_over_slow_reactions(
+                self.data, self.natnum, self.slow_species, self.slow_symbolic_variables,
+                self.slow_symbolic_derivatives, self.fast_species,
+            )
+            for slow in self.slow_species:
+                for fast in self.fast_species:
+                    determinant_ratio = self.determinant((slow, fast)) / det_M if (slow, fast) in needed else 0
+                    for reaction in self.data["reactions"]:
+                        if generator.produces_fast_species(reaction, fast, self.fast_species):
+                            scaled_rate = generator.compute_scaled_rate(reaction, self.natnum, self.slow_species)
+                            slow_species_product = generator.multiply_slow_species(reaction, self.slow_symbolic_variables)
+                            species_diff = generator.compute_species_difference(reaction, slow)
+                            total += scaled_rate * slow_species_product * (species_diff + determinant_ratio) * self.slow_symbolic_derivatives[slow]
+            self._result = sp.simplify(total)
+        return self._result
+
+    def update(self, variant_data):
+        """
+        Berechnet Hᴺf einer Variante und verwendet dabei die Zwischenergebnisse dieses Netzwerks.
+
+        Hat sich die Aufteilung der Spezies oder natnum geändert, wird die Variante vollständig neu berechnet.
+        Das Ausgangsnetzwerk bleibt unverändert und kann für weitere Varianten verwendet werden; die
+        Kofaktoren bleiben dabei gespeichert.
+
+        :param variant_data: Dictionary mit den Reaktionsdaten der Variante.
+        :return: Neue Instanz für die Variante; ihr Ergebnis ist bereits berechnet, `stats` zählt die
+                 wiederverwendeten ("reused"), aktualisierten ("rank-one") und neu berechneten ("full") Determinanten.
+        """
+        diff = diff_networks(self.data, variant_data)
+        if diff["species"]:
+            variant = IncrementalGenerator(variant_data)
+            variant.result()
+            return variant
+
+        variant = IncrementalGenerator.__new__(IncrementalGenerator)
+        variant.__dict__.update(self.__dict__)
+        variant.data = variant_data
+        variant.M = {S: dict(row) for S, row in self.M.items()}
+        variant.b = {slow: dict(column) for slow, column in self.b.items()}
+        variant._determinants = {}
+        variant._cofactors = {}
+        variant._result = None
+        variant.stats = Counter(removed=len(diff["removed"]), added=len(diff["added"]))
+        for reaction in diff["removed"]:
+            variant._apply(reaction, -1)
+        for reaction in diff["added"]:
+            variant._apply(reaction, 1)
+
+        variant._det_M = self._updated_determinant(variant, None)
+        base_needed = set(self._needed())
+        for key in variant._needed():
+            if key in base_needed:
+                variant._determinants[key] = self._updated_determinant(variant, key)
+        variant.result()
+        return variant
+
+
+def _record(path, generator_state, start):
+    result = generator_state.result()
+    return {
+        "input": os.path.abspath(path),
+        "result": {"str": str(result), "srepr": sp.srepr(result)},
+        "stats": dict(generator_state.stats),
+        "time": time.perf_counter() - start,
+    }
+
+def watch(path, base=None, interval=1.0, callback=print):
+    """
+    Beobachtet eine Netzwerkdatei und berechnet Hᴺf bei jeder Speicherung neu (Abfrage der Änderungszeit).
+    Jede Version wird mit dem Ausgangsnetzwerk verglichen, damit dessen Kofaktoren wiederverwendet werden.
+
+    :param path: Pfad zur beobachteten Datei.
+    :param base: IncrementalGenerator des Ausgangsnetzwerks (Standard: die Datei beim Start).
+    :param interval: Abfrageintervall in Sekunden.
+    :param callback: Wird mit dem Ergebnis-Dictionary jeder Version aufgerufen.
+    """
+    mtime = None
+    while True:
+        try:
+            current = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            current = None
+        if current is not None and current != mtime:
+            mtime = current
+            start = time.perf_counter()
+            try:
+                data = load_network(path)
+                if base is None:
+                    base = IncrementalGenerator(data)
+                    callback(_record(path, base, start))
+                else:
+                    callback(_record(path, base.update(data), start))
+            except Exception as error:
+                # Halb gespeicherte oder fehlerhafte Dateien: beim nächsten Speichern erneut versuchen
+                callback({"input": os.path.abspath(path), "error": f"{type(error).__name__}: {error}"})
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute the approximate generator of network variants incrementally.")
+    parser.add_argument("base", help="base network file (.yaml, .json or .crnb)")
+    parser.add_argument("variants", nargs="*", help="variant network files, each compared with the base")
+    parser.add_argument("-w", "--watch", metavar="FILE", help="recompute FILE against the base whenever it is saved")
+    parser.add_argument("-i", "--interval", type=float, default=1.0, help="polling interval for --watch in seconds")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    stream = open(args.output, "w") if args.output else sys.stdout
+
+    def emit(record):
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+
+    try:
+        start = time.perf_counter()
+        base = IncrementalGenerator(load_network(args.base))
+        emit(_record(args.base, base, start))
+        for path in args.variants:
+            start = time.perf_counter()
+            emit(_record(path, base.update(load_network(path)), start))
+        if args.watch:
+            print(f"👀 Watching {args.watch} (Ctrl+C to stop)", file=sys.stderr)
+            watch(args.watch, base, args.interval, emit)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.output:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
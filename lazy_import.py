@@ -0,0 +1,25 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Importiert ein Modul erst beim ersten Attributzugriff (über importlib.util.LazyLoader).
+
+    Damit zahlen Kommandos, die keine symbolischen oder numerischen Schritte ausführen,
+    nicht die Importzeit von SymPy bzw. NumPy.
+
+    :param name: Name des Moduls, z. B. "sympy".
+    :return: Das (noch nicht ausgeführte) Modulobjekt.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,407 @@
+import argparse
+import math
+import random
+import sys
+import time
+
+import telemetry
+from lazy_import import lazy_import
+from worker_pool import WorkerPool
+
+np = lazy_import("numpy")
+sp = lazy_import("sympy")
+
+# Primzahlen unter 2**31: das Produkt zweier Reste passt in int64
+PRIME_BOUND = 2 ** 31
+# Auswertungspunkte pro Block bei paralleler Auswertung
+CHUNK = 4096
+
+
+def _primes(start=PRIME_BOUND):
+    p = start
+    while True:
+        p = sp.prevprime(p)
+        yield int(p)
+
+def _inverse(a, p):
+    # Modulares Inverses elementweise (kleiner Satz von Fermat)
+    result = np.ones_like(a)
+    base = a % p
+    exponent = p - 2
+    while exponent:
+        if exponent & 1:
+            result = result * base % p
+        base = base * base % p
+        exponent >>= 1
+    return result
+
+def _det_mod(A, p):
+    """
+    Determinanten eines Stapels von Matrizen modulo p (Gauß-Elimination, vektorisiert über den Stapel).
+    :param A: int64-Array der Form (B, n, n) mit Einträgen in [0, p).
+    :return: int64-Array der Form (B,).
+    """
+    A = A.copy()
+    batch, n, _ = A.shape
+    det = np.ones(batch, dtype=np.int64)
+    rows = np.arange(batch)
+    for c in range(n):
+        nonzero = A[:, c:, c] != 0
+        det[~nonzero.any(axis=1)] = 0
+        pivot = c + np.argmax(nonzero, axis=1)
+        swap = pivot != c
+        if swap.any():
+            upper = A[rows[swap], c].copy()
+            A[rows[swap], c] = A[rows[swap], pivot[swap]]
+            A[rows[swap], pivot[swap]] = upper
+            det[swap] = (p - det[swap]) % p
+        diagonal = A[:, c, c]
+        det = det * diagonal % p
+        if c + 1 < n:
+            factors = A[:, c + 1:, c] * _inverse(diagonal, p)[:, None] % p
+            A[:, c + 1:, c:] = (A[:, c + 1:, c:] - factors[:, :, None] * A[:, None, c, c:] % p) % p
+    return det
+
+def _evaluate_chunk(entries, max_exponents, points, p):
+    """
+    Wertet die skalierte Matrix an Punkten modulo p aus und berechnet ihre Determinanten (Arbeitsfunktion für
+    den Prozesspool).
+    :param entries: Einträge zeilenweise als Listen von (ganzzahliger Koeffizient, Exponententupel).
+    :param max_exponents: Größter Exponent je Variable.
+    :param points: int64-Array der Form (B, Variablen).
+    :return: int64-Array der Form (B,).
+    """
+    points = np.asarray(points, dtype=np.int64) % p
+    batch, n = len(points), len(entries)
+    powers = []
+    for i, exponent in enumerate(max_exponents):
+        table = [np.ones(batch, dtype=np.int64)]
+        for _ in range(exponent):
+            table.append(table[-1] * points[:, i] % p)
+        powers.append(table)
+    monomials = {}
+    A = np.zeros((batch, n, n), dtype=np.int64)
+    for r, row in enumerate(entries):
+        for c, terms in enumerate(row):
+            value = np.zeros(batch, dtype=np.int64)
+            for coefficient, monomial in terms:
+                if monomial not in monomials:
+                    product = np.ones(batch, dtype=np.int64)
+                    for i, exponent in enumerate(monomial):
+                        if exponent:
+                            product = product * powers[i][exponent] % p
+                    monomials[monomial] = product
+                value = (value + coefficient % p * monomials[monomial]) % p
+            A[:, r, c] = value
+    return _det_mod(A, p)
+
+
+class ModularMatrix:
+    """
+    Quadratische Matrix mit polynomiellen Einträgen für die Auswertung modulo Primzahlen.
+
+    Variablen sind die Erzeuger der Einträge als Polynome (Raten, v_{S} und Potenzen von N mit symbolischen
+    Exponenten als eigene Variablen). Rationale Koeffizienten werden zeilenweise auf ganze Zahlen gebracht;
+    `scale` ist das Produkt dieser Faktoren, also det(skalierte Matrix) = scale · det(Matrix).
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows: Matrixzeilen als Listen symbolischer Ausdrücke.
+        :raises ValueError: Wenn ein Eintrag kein Polynom mit rationalen Koeffizienten ist.
+        """
+        from sympy.polys.polyerrors import CoercionFailed, PolificationFailed, PolynomialError
+
+        self.size = len(rows)
+        flat = [sp.sympify(entry) for row in rows for entry in row]
+        try:
+            polys, options = sp.parallel_poly_from_expr(flat, domain="QQ")
+            self.gens = list(options.gens)
+            terms = [poly.terms() for poly in polys]
+        except PolificationFailed:
+            # Nur Konstanten: keine Erzeuger
+            if not all(entry.is_Rational for entry in flat):
+                raise ValueError("matrix entries are not polynomials with rational coefficients")
+            self.gens = []
+            terms = [[((), entry)] if entry != 0 else [] for entry in flat]
+        except (CoercionFailed, PolynomialError) as error:
+            raise ValueError(f"matrix entries are not polynomials with rational coefficients: {error}")
+
+        self.scale = 1
+        self.entries = []
+        for r in range(self.size):
+            row = [terms[r * self.size + column] for column in range(self.size)]
+            factor = math.lcm(1, *(int(sp.Rational(coefficient).q) for entry in row for _, coefficient in entry))
+            self.scale *= factor
+            self.entries.append([
+                [(int(sp.Rational(coefficient) * factor), tuple(monomial)) for monomial, coefficient in entry if coefficient != 0]
+                for entry in row
+            ])
+
+        # Gradschranken je Variable: Summe der Zeilen- bzw. Spaltenmaxima, die kleinere von beiden
+        variables = len(self.gens)
+        degree = [[[max((m[i] for _, m in entry), default=0) for entry in row] for row in self.entries] for i in range(variables)]
+        self.bounds = [
+            min(sum(max(row, default=0) for row in degree[i]),
+                sum(max((degree[i][r][c] for r in range(self.size)), default=0) for c in range(self.size)))
+            for i in range(variables)
+        ]
+        self.max_exponents = [max((max(row, default=0) for row in degree[i]), default=0) for i in range(variables)]
+
+    def evaluate(self, points, p, executor=None):
+        """
+        :param points: Punkte, Form (B, len(gens)).
+        :param p: Primzahl.
+        :param executor: Optionaler Executor; dann wird blockweise (CHUNK Punkte) parallel ausgewertet.
+        :return: det(skalierte Matrix) modulo p an jedem Punkt, int64-Array der Form (B,).
+        """
+        points = np.asarray(points, dtype=np.int64).reshape(-1, len(self.gens))
+        if executor is None or len(points) <= CHUNK:
+            return _evaluate_chunk(self.entries, self.max_exponents, points, p)
+        futures = [
+            executor.submit(_evaluate_chunk, self.entries, self.max_exponents, points[start:start + CHUNK], p)
+            for start in range(0, len(points), CHUNK)
+        ]
+        return np.concatenate([future.result() for future in futures])
+
+
+def _newton_to_monomial(betas, values, p):
+    # Interpolation vom Grad len(betas)-1 über Newtonsche dividierte Differenzen, vektorisiert über die Spalten
+    c = [np.asarray(value, dtype=np.int64) % p for value in values]
+    for j in range(1, len(betas)):
+        for i in range(len(betas) - 1, j - 1, -1):
+            c[i] = (c[i] - c[i - 1]) % p * pow((betas[i] - betas[i - j]) % p, -1, p) % p
+    poly = [c[-1]]
+    for i in range(len(betas) - 2, -1, -1):
+        shifted = [np.zeros_like(c[0])] + poly
+        for e, coefficient in enumerate(poly):
+            shifted[e] = (shifted[e] - betas[i] * coefficient % p) % p
+        shifted[0] = (shifted[0] + c[i]) % p
+        poly = shifted
+    return poly
+
+def _transposed_vandermonde(nodes, values, p):
+    """
+    Löst Σ_m c_m · nodes_m^j = values_j (j = 0 … T-1) modulo p in O(T²) über das Knotenpolynom P(z) = Π (z - nodes_m).
+    """
+    nodes = np.asarray(nodes, dtype=np.int64)
+    size = len(nodes)
+    master = np.zeros(size + 1, dtype=np.int64)
+    master[0] = 1
+    for node in nodes:
+        master[1:] = (master[1:] - int(node) * master[:-1] % p) % p
+    master = master[::-1]  # master[j] ist der Koeffizient von z^j
+    quotient = np.ones(size, dtype=np.int64)
+    numerator = quotient * int(values[size - 1]) % p
+    derivative = quotient.copy()
+    for j in range(size - 1, 0, -1):
+        quotient = (master[j] + nodes * quotient) % p
+        numerator = (numerator + quotient * int(values[j - 1])) % p
+        derivative = (derivative * nodes + quotient) % p
+    return numerator * _inverse(derivative, p) % p
+
+def _monomial_values(monomials, point, p):
+    return [math.prod(pow(x, e, p) for x, e in zip(point, monomial)) % p for monomial in monomials]
+
+def _power_points(base, count, p):
+    # Punkte base^j für j = 0 … count-1
+    rows, current = [], [1] * len(base)
+    for _ in range(count):
+        rows.append(current)
+        current = [x * b % p for x, b in zip(current, base)]
+    return rows
+
+def _distinct_nodes(monomials, variables, p, rng):
+    while True:
+        base = [rng.randrange(2, p) for _ in range(variables)]
+        nodes = _monomial_values(monomials, base, p)
+        if len(set(nodes)) == len(nodes):
+            return base, nodes
+
+def _sparse_interpolation(matrix, p, rng, executor=None):
+    """
+    Zippels probabilistische dünne Interpolation modulo p: Variable für Variable wird das Gerüst der Monome
+    erweitert. Für jede neue Variable x_k werden die Koeffizienten des bisherigen Gerüsts an bounds[k]+1 Werten
+    von x_k aus transponierten Vandermonde-Systemen bestimmt und dann in x_k interpoliert.
+    :return: Dictionary {Exponententupel: Rest modulo p} der skalierten Determinante.
+    """
+    variables = len(matrix.gens)
+    anchor = [rng.randrange(1, p) for _ in range(variables)]
+    skeleton = {(): int(matrix.evaluate([anchor], p, executor)[0])}
+    for k in range(variables):
+        monomials = [monomial for monomial, value in skeleton.items() if value]
+        if not monomials:
+            return {}
+        base, nodes = _distinct_nodes(monomials, k, p, rng)
+        betas = rng.sample(range(1, p), matrix.bounds[k] + 1)
+        powers = _power_points(base, len(monomials), p)
+        points = [row + [beta] + anchor[k + 1:] for beta in betas for row in powers]
+        values = matrix.evaluate(points, p, executor).reshape(len(betas), len(monomials))
+        coefficients = [_transposed_vandermonde(nodes, values[b], p) for b in range(len(betas))]
+        poly = _newton_to_monomial(betas, coefficients, p)
+        skeleton = {
+            monomial + (e,): int(poly[e][t])
+            for t, monomial in enumerate(monomials) for e in range(len(poly)) if poly[e][t]
+        }
+    return skeleton
+
+def _coefficients(matrix, monomials, p, rng, executor=None):
+    # Koeffizienten bei bekanntem Träger aus einem transponierten Vandermonde-System
+    if not monomials:
+        return []
+    base, nodes = _distinct_nodes(monomials, len(matrix.gens), p, rng)
+    values = matrix.evaluate(_power_points(base, len(monomials), p), p, executor)
+    return [int(value) for value in _transposed_vandermonde(nodes, values, p)]
+
+def _rational_reconstruction(a, modulus):
+    # Bruch n/d mit |n|, d ≤ sqrt(modulus/2) und n ≡ a·d (mod modulus), sonst None
+    bound = math.isqrt(modulus // 2)
+    r0, r1, s0, s1 = modulus, a % modulus, 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+    if s1 == 0 or abs(s1) > bound or math.gcd(r1, abs(s1)) != 1:
+        return None
+    return sp.Rational(r1, s1)
+
+def _check(matrix, polynomial, p, rng):
+    # Vergleicht das Ergebnis an einem zufälligen Punkt mit der direkten Auswertung modulo einer neuen Primzahl
+    point = [rng.randrange(1, p) for _ in matrix.gens]
+    expected = int(matrix.evaluate([point], p)[0])
+    actual = 0
+    for monomial, coefficient in polynomial.items():
+        value = int(coefficient.p) % p * pow(int(coefficient.q) % p, -1, p) % p
+        actual = (actual + value * _monomial_values([monomial], point, p)[0]) % p
+    return actual == expected
+
+def interpolate_determinant(matrix, seed=0, max_workers=1, attempts=3):
+    """
+    Berechnet die Determinante exakt aus Auswertungen modulo Primzahlen.
+
+    Mit der ersten Primzahl werden Monome und Reste durch dünne Interpolation bestimmt, mit jeder weiteren nur
+    die Koeffizienten dieser Monome. Die Reste werden mit dem Chinesischen Restsatz kombiniert und rational
+    rekonstruiert, bis sich das Ergebnis nicht mehr ändert; eine Probe an einem zufälligen Punkt modulo einer
+    weiteren Primzahl sichert das Ergebnis ab (sonst neuer Versuch).
+
+    :param matrix: ModularMatrix.
+    :param seed: Startwert der Zufallspunkte.
+    :param max_workers: Anzahl der Prozesse für die Auswertung (None = Anzahl der CPU-Kerne, 1 = seriell).
+    :param attempts: Anzahl der Versuche.
+    :return: Dictionary {Exponententupel der Erzeuger: rationaler Koeffizient} von det(Matrix).
+    :raises RuntimeError: Wenn kein Versuch die Probe besteht.
+    """
+    rng = random.Random(seed)
+    primes = _primes()
+    executor = WorkerPool(max_workers) if max_workers != 1 else None
+    try:
+        for _ in range(attempts):
+            p = next(primes)
+            skeleton = _sparse_interpolation(matrix, p, rng, executor)
+            monomials = list(skeleton)
+            residues = [skeleton[monomial] for monomial in monomials]
+            modulus, previous = p, None
+            while True:
+                values = [_rational_reconstruction(residue, modulus) for residue in residues]
+                if None not in values and values == previous:
+                    break
+                previous = values
+                p = next(primes)
+                # Chinesischer Restsatz: x ≡ residue (mod modulus), x ≡ new (mod p)
+                factor = pow(modulus % p, -1, p)
+                residues = [
+                    residue + modulus * ((new - residue) * factor % p)
+                    for residue, new in zip(residues, _coefficients(matrix, monomials, p, rng, executor))
+                ]
+                modulus *= p
+            polynomial = {monomial: value / matrix.scale for monomial, value in zip(monomials, values) if value != 0}
+            if _check(matrix, {m: c * matrix.scale for m, c in polynomial.items()}, next(primes), rng):
+                return polynomial
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    raise RuntimeError("modular determinant failed the probe in every attempt")
+
+def matrix_determinant(matrix, max_workers=1):
+    """
+    Alternative zu generator.get_matrix_determinant mit derselben Schnittstelle (z. B. als determinant= von
+    generator.total_sum_of_reactions): det einer Dictionary-Matrix {S: {T: Wert}} über Auswertung modulo
+    Primzahlen, dünne Interpolation und rationale Rekonstruktion statt symbolischer Entwicklung.
+
+    Das Ergebnis ist exakt und ausmultipliziert; Potenzen von N mit symbolischen Exponenten werden je Term
+    zusammengefasst. Einträge, die keine Polynome mit rationalen Koeffizienten sind, werden an
+    get_matrix_determinant übergeben.
+
+    :param matrix: Dictionary-basierte symbolische Matrix {S: {T: Wert}}.
+    :param max_workers: Anzahl der Prozesse für die Auswertung.
+    :return: Die Determinante als symbolischer Ausdruck.
+    """
+    fast_species = sorted(matrix.keys())
+    rows = [[matrix[S][T] for T in fast_species] for S in fast_species]
+    if not rows:
+        return sp.S(1)
+    try:
+        modular = ModularMatrix(rows)
+    except ValueError:
+        import generator
+
+        return generator.get_matrix_determinant(matrix)
+    polynomial = interpolate_determinant(modular, max_workers=max_workers)
+    return sp.Add(*(
+        sp.powsimp(coefficient * sp.Mul(*(g ** e for g, e in zip(modular.gens, monomial))))
+        for monomial, coefficient in polynomial.items()
+    ))
+
+
+def _same_value(a, b, rng, points=3):
+    # Exakter Vergleich zweier Ausdrücke an zufälligen ganzzahligen Punkten (auch für symbolische Exponenten)
+    symbols = sorted(sp.sympify(a).free_symbols | sp.sympify(b).free_symbols, key=str)
+    for _ in range(points):
+        values = {symbol: sp.Integer(rng.randrange(2, 50)) for symbol in symbols}
+        if sp.nsimplify(sp.sympify(a).xreplace(values) - sp.sympify(b).xreplace(values)) != 0:
+            return False
+    return True
+
+def main(argv=None):
+    import generator
+    from network_formats import generator_arguments, read_network
+
+    parser = argparse.ArgumentParser(description="Compute det(M) and det(M{S,S'}) by modular evaluation and interpolation.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of processes for the determinants")
+    parser.add_argument("--check", action="store_true", help="compare with get_matrix_determinant at random integer points")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    data, natnum, slow_species, fast_species, slow_symbolic_variables, _ = generator_arguments(read_network(args.input))
+    start = time.perf_counter()
+    det_M, determinants = generator.slow_fast_determinants(
+        data, natnum, slow_species, fast_species, slow_symbolic_variables, max_workers=args.jobs, determinant=matrix_determinant
+    )
+    elapsed = time.perf_counter() - start
+    terms = sum(len(sp.Add.make_args(value)) for value in [det_M, *determinants.values()])
+    print(f"✅ {1 + len(determinants)} determinants with {terms} terms in {elapsed:.2f} s", file=sys.stderr)
+    print(f"det(M) = {det_M}")
+    for (slow, fast), value in determinants.items():
+        print(f"det(M{{{slow},{fast}}}) = {value}")
+    if args.check:
+        from task_graph import clear_cache
+
+        clear_cache()
+        start = time.perf_counter()
+        expected_M, expected = generator.slow_fast_determinants(
+            data, natnum, slow_species, fast_species, slow_symbolic_variables, max_workers=args.jobs
+        )
+        elapsed = time.perf_counter() - start
+        rng = random.Random(0)
+        wrong = [key for key in expected if not _same_value(expected[key], determinants[key], rng)]
+        if not _same_value(expected_M, det_M, rng):
+            wrong.insert(0, "M")
+        print(f"{'❌' if wrong else '✅'} get_matrix_determinant: {elapsed:.2f} s"
+              + (f", mismatch for {wrong}" if wrong else ", all equal"), file=sys.stderr)
+        if wrong:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+
+from compiled_network import (
+    SPECIES_FAST,
+    SPECIES_SLOW,
+    SPECIES_UNDECLARED,
+    build_network,
+    compile_network,
+    load_network_binary,
+    load_text_network,
+    network_to_dict,
+    network_to_matrices,
+    save_network_binary,
+)
+
+# Einheitliches Netzwerkmodell: das kompilierte, array-basierte Netzwerk aus compiled_network.
+# Hier liegen Leser und Schreiber für die vier Eingabeformate des Projekts:
+#   "yaml"     – Dictionary wie crn.yaml (species: {slow, fast}, educts/products als Dictionaries, rate, scale)
+#   "template" – Vorlage von JSON_init/JSON_fill (Schlüssel S{k}/E{k}, rate_unscaled, scaling)
+#   "mm"       – Format von MM.json (Speziesliste, educts/products als Listen einzelner Dictionaries)
+#   "matrix"   – Matrixdarstellung von functions_for_LLN_CLT (educts/products als SymPy-Matrizen, scaling_species)
+FORMATS = ("yaml", "template", "mm", "matrix")
+
+_TEMPLATE_KEY = re.compile(r"([SE])(\d+)$")
+
+# Abgeleitete Darstellungen je content_hash, damit ein Netzwerk nur einmal umgewandelt wird
+# (LRU wie crn_server.LRUCache, damit lang laufende Prozesse nicht unbegrenzt wachsen)
+_views = OrderedDict()
+VIEWS_SIZE = 256
+
+
+def _view(network, kind, build):
+    key = (network["content_hash"], kind)
+    if key in _views:
+        _views.move_to_end(key)
+    else:
+        _views[key] = build(network)
+        while len(_views) > VIEWS_SIZE:
+            _views.popitem(last=False)
+    return _views[key]
+
+def _kind_list(network):
+    return [int(k) for k in network["species_kind"]]
+
+def _side(network, prefix, j):
+    start, end = network[f"{prefix}_indptr"][j], network[f"{prefix}_indptr"][j + 1]
+    return [
+        (network["species"][s], int(c))
+        for s, c in zip(network[f"{prefix}_species"][start:end], network[f"{prefix}_coeff"][start:end])
+    ]
+
+def _reaction_count(network):
+    return len(network["rate_index"])
+
+def _reaction_names(network):
+    return network.get("reaction_names") or [str(j + 1) for j in range(_reaction_count(network))]
+
+
+# ---------- crn.yaml ----------
+
+def from_yaml_dict(data):
+    """
+    Liest ein Netzwerk-Dictionary im Format von crn.yaml.
+    :param data: Dictionary mit den Reaktionsdaten.
+    :return: Kompiliertes Netzwerk.
+    """
+    return compile_network(data)
+
+def to_yaml_dict(network):
+    """
+    Schreibt ein Netzwerk im Format von crn.yaml (einmal je Netzwerk, das Ergebnis nicht verändern).
+    :param network: Kompiliertes Netzwerk.
+    :return: Dictionary mit den Reaktionsdaten.
+    """
+    # Nicht deklarierte Spezies stehen im YAML-Format nur in den Reaktionen
+    return _view(network, "yaml", network_to_dict)
+
+
+# ---------- Vorlage von JSON_init ----------
+
+def _template_coeff(value, where):
+    # Werte wie in JSON_fill.fix_reaction: "" steht für 0, Ziffernstrings und Floats werden ganzzahlig
+    if value in ("", None):
+        return 0
+    if isinstance(value, str):
+        if not value.isdigit():
+            raise ValueError(f"Invalid coefficient '{value}' in {where}")
+        return int(value)
+    return int(value)
+
+def from_template(data):
+    """
+    Liest eine Vorlage im Format von JSON_init (dicht oder dünnbesetzt, gefüllt mit JSON_fill).
+
+    Die Spezies heißen S1..S{slow_species_count} (langsam) und E1..E{fast_species_count} (schnell).
+    Enthält die Vorlage einen Schlüssel "species" mit den Listen "slow" und "fast", so werden
+    S{k} bzw. E{k} auf die dort angegebenen Namen abgebildet.
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :return: Kompiliertes Netzwerk.
+    """
+    reactions = data.get("reactions", []) or []
+    names = data.get("species") or {}
+    counts = {"S": data.get("slow_species_count"), "E": data.get("fast_species_count")}
+    for prefix in ("S", "E"):
+        if counts[prefix] is None:
+            # Ohne Kopfzeilen: Anzahl aus den vorkommenden Schlüsseln bestimmen
+            counts[prefix] = max(
+                [int(m.group(2)) for r in reactions for side in ("educts", "products")
+                 for m in map(_TEMPLATE_KEY.match, r.get(side, {})) if m and m.group(1) == prefix],
+                default=0,
+            )
+        counts[prefix] = int(counts[prefix])
+    slow = list(names.get("slow") or [f"S{k + 1}" for k in range(counts["S"])])
+    fast = list(names.get("fast") or [f"E{k + 1}" for k in range(counts["E"])])
+    rename = {f"S{k + 1}": s for k, s in enumerate(slow)}
+    rename.update({f"E{k + 1}": s for k, s in enumerate(fast)})
+
+    converted = []
+    for j, reaction in enumerate(reactions):
+        entry = {"rate": reaction.get("rate_unscaled", ""), "scale": reaction.get("scaling", "")}
+        for side in ("educts", "products"):
+            entry[side] = {}
+            for key, value in (reaction.get(side) or {}).items():
+                if key not in rename:
+                    raise ValueError(f"Unknown species '{key}' in {side} of reaction {reaction.get('index', j + 1)}")
+                coeff = _template_coeff(value, f"{side}[{key}] of reaction {reaction.get('index', j + 1)}")
+                if coeff:
+                    entry[side][rename[key]] = coeff
+        converted.append(entry)
+
+    indices = [str(r.get("index", j + 1)) for j, r in enumerate(reactions)]
+    return build_network(
+        data.get("name", ""), data.get("natnum", "N"),
+        slow + fast, [SPECIES_SLOW] * len(slow) + [SPECIES_FAST] * len(fast), converted,
+        None if indices == [str(j + 1) for j in range(len(reactions))] else indices,
+    )
+
+def to_template(network, sparse=False):
+    """
+    Schreibt ein Netzwerk als Vorlage im Format von JSON_init mit ganzzahligen Werten (wie nach JSON_fill).
+
+    Heißen die Spezies nicht S1, S2, ... bzw. E1, E2, ..., so wird die Zuordnung unter "species" abgelegt.
+    Wie im Format von crn.yaml stehen die langsamen Spezies dabei vor den schnellen.
+
+    :param network: Kompiliertes Netzwerk.
+    :param sparse: Nur Einträge != 0 schreiben (wie JSON_stream init).
+    :return: Dictionary mit den Reaktionsdaten.
+    """
+    kinds = _kind_list(network)
+    if SPECIES_UNDECLARED in kinds:
+        undeclared = [s for s, k in zip(network["species"], kinds) if k == SPECIES_UNDECLARED]
+        raise ValueError(f"The template format needs every species to be slow or fast, undeclared: {undeclared}")
+    slow = [s for s, k in zip(network["species"], kinds) if k == SPECIES_SLOW]
+    fast = [s for s, k in zip(network["species"], kinds) if k == SPECIES_FAST]
+    rename = {s: f"S{k + 1}" for k, s in enumerate(slow)}
+    rename.update({s: f"E{k + 1}" for k, s in enumerate(fast)})
+    keys = [f"S{k + 1}" for k in range(len(slow))] + [f"E{k + 1}" for k in range(len(fast))]
+
+    reactions = []
+    for j, index in enumerate(_reaction_names(network)):
+        reaction = {"index": int(index) if index.isdigit() else index}
+        for side, prefix in (("educts", "educt"), ("products", "product")):
+            values = {rename[s]: c for s, c in _side(network, prefix, j)}
+            reaction[side] = values if sparse else {key: values.get(key, 0) for key in keys}
+        reaction["rate_unscaled"] = network["rates"][network["rate_index"][j]]
+        reaction["scaling"] = network["scales"][network["scale_index"][j]]
+        reactions.append(reaction)
+
+    data = {
+        "reactions_count": len(reactions),
+        "slow_species_count": len(slow),
+        "fast_species_count": len(fast),
+    }
+    if sparse:
+        data["sparse"] = True
+    if network["name"]:
+        data["name"] = network["name"]
+    if network["natnum"] != "N":
+        data["natnum"] = network["natnum"]
+    if slow + fast != keys:
+        data["species"] = {"slow": slow, "fast": fast}
+    data["reactions"] = reactions
+    return data
+
+
+# ---------- MM.json ----------
+
+def from_mm(data):
+    """
+    Liest ein Netzwerk im Format von MM.json.
+
+    Die Einteilung in langsam und schnell steht optional unter "scaling_species" (1 = langsam, 0 = schnell,
+    wie in functions_for_LLN_CLT). Fehlt sie, gelten Spezies mit E am Anfang als schnell, alle übrigen als langsam.
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :return: Kompiliertes Netzwerk.
+    """
+    species = list(data["species"])
+    scaling_species = data.get("scaling_species")
+    if scaling_species is None:
+        kinds = [SPECIES_FAST if s.startswith("E") else SPECIES_SLOW for s in species]
+    else:
+        kinds = [SPECIES_SLOW if int(k) == 1 else SPECIES_FAST for k in scaling_species]
+
+    def side(entries):
+        counts = {}
+        for entry in entries or []:
+            for key, value in entry.items():
+                counts[key] = counts.get(key, 0) + int(value)
+        return counts
+
+    reactions = data.get("reactions", []) or []
+    converted = [
+        {"educts": side(r.get("educts")), "products": side(r.get("products")),
+         "rate": r.get("rate_unscaled", ""), "scale": r.get("scaling", "")}
+        for r in reactions
+    ]
+    names = [str(r.get("name", j + 1)) for j, r in enumerate(reactions)]
+    return build_network(
+        data.get("name", ""), data.get("natnum", "N"), species, kinds, converted,
+        None if names == [str(j + 1) for j in range(len(reactions))] else names,
+    )
+
+def to_mm(network):
+    """
+    Schreibt ein Netzwerk im Format von MM.json. Die Einteilung in langsam und schnell wird nur dann
+    unter "scaling_species" abgelegt, wenn sie nicht der Namenskonvention (E = schnell) entspricht.
+    :param network: Kompiliertes Netzwerk.
+    :return: Dictionary mit den Reaktionsdaten.
+    """
+    kinds = _kind_list(network)
+    if SPECIES_UNDECLARED in kinds:
+        raise ValueError("The MM.json format needs every species to be slow or fast")
+    data = {"name": network["name"], "species": list(network["species"])}
+    if network["natnum"] != "N":
+        data["natnum"] = network["natnum"]
+    if kinds != [SPECIES_FAST if s.startswith("E") else SPECIES_SLOW for s in network["species"]]:
+        data["scaling_species"] = [int(k == SPECIES_SLOW) for k in kinds]
+    data["reactions"] = [
+        {
+            "name": name,
+            "educts": [{s: c} for s, c in _side(network, "educt", j)],
+            "products": [{s: c} for s, c in _side(network, "product", j)],
+            "rate_unscaled": network["rates"][network["rate_index"][j]],
+            "scaling": network["scales"][network["scale_index"][j]],
+        }
+        for j, name in enumerate(_reaction_names(network))
+    ]
+    return data
+
+
+# ---------- Matrixdarstellung von functions_for_LLN_CLT ----------
+
+def from_matrices(network_name, species, educts, products, scaling_species, scaling_rates):
+    """
+    Liest die Matrixdarstellung von crn_lln/crn_clt (Spezies x Reaktionen).
+
+    crn_lln/crn_clt benennen die Raten selbst (k0, k1, ...); diese Namen werden übernommen.
+
+    :return: Kompiliertes Netzwerk.
+    """
+    rows, columns = educts.shape
+    if products.shape != (rows, columns) or len(species) != rows:
+        raise ValueError("educts and products must be species x reactions matrices of the same shape")
+    if len(scaling_species) != rows or len(scaling_rates) != columns:
+        raise ValueError("scaling_species must have one entry per species and scaling_rates one per reaction")
+    if any(int(k) not in (0, 1) for k in scaling_species):
+        raise ValueError("scaling_species may only contain 0 (fast) and 1 (slow)")
+
+    def side(matrix, j):
+        return {species[i]: int(matrix[i, j]) for i in range(rows) if matrix[i, j] != 0}
+
+    reactions = [
+        {"educts": side(educts, j), "products": side(products, j), "rate": f"k{j}", "scale": str(int(scaling_rates[j]))}
+        for j in range(columns)
+    ]
+    kinds = [SPECIES_SLOW if int(k) == 1 else SPECIES_FAST for k in scaling_species]
+    return build_network(network_name, "N", list(species), kinds, reactions)
+
+def to_matrices(network):
+    """
+    Schreibt die Matrixdarstellung für crn_lln/crn_clt. Das Ergebnis wird je Netzwerk nur einmal berechnet.
+    Alle Spezies müssen langsam oder schnell und alle Skalierungen ganzzahlig sein.
+    :param network: Kompiliertes Netzwerk.
+    :return: Tupel (network_name, species, educts, products, scaling_species, scaling_rates).
+    """
+    if SPECIES_UNDECLARED in _kind_list(network):
+        raise ValueError("crn_lln/crn_clt need every species to be slow or fast")
+    name, species, educts, products, scaling_species, scaling_rates = _view(network, "matrix", network_to_matrices)
+    # Kopien der veränderlichen Teile, damit der Zwischenspeicher nicht verändert werden kann
+    return name, list(species), educts.copy(), products.copy(), list(scaling_species), list(scaling_rates)
+
+
+# ---------- Eingaben der Engines ----------
+
+def generator_arguments(network):
+    """
+    Erzeugt die Argumente für generator.total_sum_of_reactions bzw. total_sum_of_reactions_by_sub_crns.
+    Das Reaktions-Dictionary wird je Netzwerk nur einmal erzeugt.
+    :param network: Kompiliertes Netzwerk.
+    :return: Tupel (data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives).
+    """
+    import sympy as sp
+    import generator
+
+    data = to_yaml_dict(network)
+    slow_species = data["species"]["slow"]
+    fast_species = data["species"]["fast"]
+    return (
+        data, sp.Symbol(data["natnum"]), slow_species, fast_species,
+        generator.init_slow_symbolic_variables(slow_species),
+        generator.init_slow_symbolic_derivatives(slow_species),
+    )
+
+def total_sum_of_network(network, by_sub_crns=False, **kwargs):
+    """
+    Berechnet den approximierten Generator Hᴺf eines kompilierten Netzwerks.
+    :param network: Kompiliertes Netzwerk.
+    :param by_sub_crns: Über die Sub-CRNs getrennt rechnen (siehe generator.total_sum_of_reactions_by_sub_crns).
+    :param kwargs: Weitere Schlüsselwortargumente der jeweiligen Funktion, z. B. coalesce.
+    :return: Der vereinfachte approximierte Generator als SymPy-Ausdruck.
+    """
+    import generator
+
+    if by_sub_crns:
+        return generator.total_sum_of_reactions_by_sub_crns(*generator_arguments(network), **kwargs)
+    return generator.total_sum_of_reactions(*generator_arguments(network), **kwargs)
+
+def crn_lln(network, **kwargs):
+    """
+    Führt functions_for_LLN_CLT.crn_lln für ein kompiliertes Netzwerk aus (Schlüsselwortargumente wie dort).
+    """
+    from functions_for_LLN_CLT import crn_lln as lln
+
+    return lln(*to_matrices(network), **kwargs)
+
+def crn_clt(network, **kwargs):
+    """
+    Führt functions_for_LLN_CLT.crn_clt für ein kompiliertes Netzwerk aus (Schlüsselwortargumente wie dort).
+    """
+    from functions_for_LLN_CLT import crn_clt as clt
+
+    return clt(*to_matrices(network), **kwargs)
+
+
+# ---------- Dateien ----------
+
+READERS = {"yaml": from_yaml_dict, "template": from_template, "mm": from_mm}
+WRITERS = {"yaml": to_yaml_dict, "template": to_template, "mm": to_mm}
+
+def detect_format(data):
+    """
+    Erkennt das Format eines geladenen Dictionaries.
+    :return: "yaml", "template" oder "mm".
+    """
+    species = data.get("species")
+    if isinstance(species, list):
+        return "mm"
+    if "reactions_count" in data or "slow_species_count" in data or "fast_species_count" in data:
+        return "template"
+    reactions = data.get("reactions") or []
+    if reactions and "rate_unscaled" in reactions[0]:
+        return "template"
+    return "yaml"
+
+def read_network(file_path, fmt=None):
+    """
+    Liest eine Netzwerkdatei (.yaml, .json in einem der Formate oder .crnb) in das einheitliche Modell.
+    :param file_path: Pfad zur Datei.
+    :param fmt: Optional das Format ("yaml", "template", "mm"), sonst automatisch erkannt.
+    :return: Kompiliertes Netzwerk.
+    """
+    if file_path.endswith(".crnb"):
+        return load_network_binary(file_path)
+    data = load_text_network(file_path)
+    return READERS[fmt or detect_format(data)](data)
+
+def write_network(network, file_path, fmt="yaml"):
+    """
+    Schreibt ein Netzwerk als .crnb (Binärformat) oder als YAML/JSON im gewünschten Format.
+    :param network: Kompiliertes Netzwerk.
+    :param file_path: Zielpfad; die Endung bestimmt YAML, JSON oder Binärformat.
+    :param fmt: "yaml", "template" oder "mm".
+    """
+    if file_path.endswith(".crnb"):
+        save_network_binary(network, file_path)
+        return
+    data = WRITERS[fmt](network)
+    with open(file_path, "w") as file:
+        if file_path.endswith(".json"):
+            json.dump(data, file, indent=4, ensure_ascii=False)
+        else:
+            import yaml
+
+            yaml.safe_dump(data, file, sort_keys=False, allow_unicode=True)
+
+
+if __name__ == "__main__":
+    # Aufruf: python network_formats.py <quelle> <ziel> [yaml|template|mm]
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python network_formats.py <source> <target> [yaml|template|mm]")
+    target_format = sys.argv[3] if len(sys.argv) > 3 else ("mm" if sys.argv[2].endswith(".json") else "yaml")
+    if target_format not in WRITERS:
+        sys.exit(f"Unknown format '{target_format}'. Choose one of: {', '.join(WRITERS)}")
+    write_network(read_network(sys.argv[1]), sys.argv[2], target_format)
+    print(f"✅ Saved {os.path.basename(sys.argv[1])} as {target_format} to {sys.argv[2]}")
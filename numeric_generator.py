@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import telemetry
+from compiled_network import load_network
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# Bis zu dieser Anzahl schneller Spezies werden alle Punkte gemeinsam dicht gelöst, darüber einzeln mit dünnbesetzter LU
+DENSE_LIMIT = 64
+
+
+class NumericGenerator:
+    """
+    Numerische Auswertung des approximierten Generators Hᴺf für konkrete Raten und Zustände.
+
+    Statt der Determinantenquotienten det(M{S,S'}) / det(M) wird das lineare System M·x = b_S gelöst: Nach der
+    Cramerschen Regel ist x[S'] = det(M{S,S'}) / det(M), da M{S,S'} aus M entsteht, indem die Spalte S' durch
+    b_S (siehe generator.create_modified_fast_species_matrix) ersetzt wird. Die Struktur von M, b_S und den
+    Summen wird einmal mit denselben Prüffunktionen wie in generator bestimmt; pro Punkt werden nur
+    die Propensitäten berechnet und M zusammengesetzt. Ist M an einem Punkt singulär, werden die Quotienten
+    wie in generator.sum_over_slow_fast_species_reactions zu 0.
+    """
+
+    def __init__(self, data):
+        """
+        :param data: Dictionary mit den Reaktionsdaten.
+        """
+        import generator
+
+        self.natnum = data.get("natnum", "N")
+        self.slow_species = list(data["species"]["slow"])
+        self.fast_species = list(data["species"]["fast"])
+        reactions = data["reactions"]
+        slow_index = {species: i for i, species in enumerate(self.slow_species)}
+        fast_index = {species: i for i, species in enumerate(self.fast_species)}
+
+        # Propensität: rate · N^(scale - 1 + Σ langsame Eduktkoeffizienten) · Π v_S^Koeffizient
+        self.rates = [reaction["rate"] for reaction in reactions]
+        self.scales = [str(reaction["scale"]) for reaction in reactions]
+        self.slow_orders = np.array([generator.sum_slow_educt_coefficients(reaction, self.slow_species) for reaction in reactions], dtype=float)
+        self.exponents = np.zeros((len(reactions), len(self.slow_species)))
+        self.changes = np.zeros((len(reactions), len(self.slow_species)))
+        for j, reaction in enumerate(reactions):
+            for species, coeff in generator.get_slow_educts(reaction, self.slow_species).items():
+                self.exponents[j, slow_index[species]] = coeff
+            for species in self.slow_species:
+                self.changes[j, slow_index[species]] = generator.compute_species_difference(reaction, species)
+
+        # Einträge von M als (Zeile, Spalte, Vorzeichen, Reaktion), Einträge von b als (Zeile, Reaktion)
+        entries, b_entries, producers, slow_only = [], [], [], []
+        for j, reaction in enumerate(reactions):
+            for S in self.fast_species:
+                if generator.consumes_fast_species_without_producing(reaction, S):
+                    entries.append((fast_index[S], fast_index[S], 1.0, j))
+                if generator.consumes_fast_species(reaction, S):
+                    b_entries.append((fast_index[S], j))
+                if generator.produces_fast_species(reaction, S, self.fast_species):
+                    producers.append((j, fast_index[S]))
+            # consumes_and_produces_fast_species vergleicht exakte Schlüssel
+            educts = [S for S in reaction.get("educts", {}) if S in fast_index]
+            products = [T for T in reaction.get("products", {}) if T in fast_index]
+            entries += [(fast_index[S], fast_index[T], -1.0, j) for S in educts for T in products if S != T]
+            if generator.is_slow_only_reaction(reaction, self.fast_species):
+                slow_only.append(j)
+
+        rows, columns, signs, entry_reactions = zip(*entries) if entries else ((), (), (), ())
+        b_rows, b_reactions = zip(*b_entries) if b_entries else ((), ())
+        producer_reactions, producer_species = zip(*producers) if producers else ((), ())
+        self.rows = np.array(rows, dtype=np.intp)
+        self.columns = np.array(columns, dtype=np.intp)
+        self.signs = np.array(signs, dtype=float)
+        self.entry_reactions = np.array(entry_reactions, dtype=np.intp)
+        self.b_rows = np.array(b_rows, dtype=np.intp)
+        self.b_reactions = np.array(b_reactions, dtype=np.intp)
+        self.producer_reactions = np.array(producer_reactions, dtype=np.intp)
+        self.producer_species = np.array(producer_species, dtype=np.intp)
+        self.slow_only = np.array(slow_only, dtype=np.intp)
+
+    def parameter_names(self):
+        """
+        :return: Die benötigten Parameter: natnum, die Raten und die nicht ganzzahligen Skalierungen.
+        """
+        names = [self.natnum]
+        for name in self.rates + [scale for scale in self.scales if not scale.lstrip("-").isdigit()]:
+            if name not in names:
+                names.append(name)
+        return names
+
+    def propensities(self, states, parameters):
+        """
+        :param states: Array (Punkte, langsame Spezies).
+        :param parameters: Dictionary {Name: Zahl oder Array (Punkte,)}.
+        :return: Array (Punkte, Reaktionen) der skalierten Propensitäten.
+        """
+        missing = [name for name in self.parameter_names() if name not in parameters]
+        if missing:
+            raise KeyError(f"Missing parameter(s): {', '.join(missing)}")
+        points = states.shape[0]
+
+        def column(name):
+            return np.broadcast_to(np.asarray(parameters[name], dtype=float), (points,))
+
+        natnum = column(self.natnum)
+        rates = np.stack([column(name) for name in self.rates], axis=1) if self.rates else np.zeros((points, 0))
+        scales = np.stack([
+            np.full(points, float(scale)) if scale.lstrip("-").isdigit() else column(scale) for scale in self.scales
+        ], axis=1) if self.scales else np.zeros((points, 0))
+        values = rates * natnum[:, None] ** (scales - 1 + self.slow_orders)
+        for i in np.flatnonzero(self.exponents.any(axis=0)):
+            values = values * states[:, i, None] ** self.exponents[:, i]
+        return values
+
+    def _ratios(self, propensities):
+        # x[Punkt, S', S] = det(M{S,S'}) / det(M), bei singulärem M 0
+        points = propensities.shape[0]
+        n = len(self.fast_species)
+        x = np.zeros((points, n, len(self.slow_species)))
+        if n == 0 or points == 0:
+            return x, np.zeros(points, dtype=bool)
+        b = np.zeros((points, n, len(self.slow_species)))
+        np.add.at(b, (slice(None), self.b_rows), propensities[:, self.b_reactions, None] * self.changes[self.b_reactions])
+        singular = np.zeros(points, dtype=bool)
+        values = propensities[:, self.entry_reactions] * self.signs
+
+        if n <= DENSE_LIMIT:
+            M = np.zeros((points, n, n))
+            np.add.at(M, (slice(None), self.rows, self.columns), values)
+            try:
+                return np.linalg.solve(M, b), singular
+            except np.linalg.LinAlgError:
+                # Mindestens ein Punkt ist singulär: einzeln lösen
+                for point in range(points):
+                    try:
+                        x[point] = np.linalg.solve(M[point], b[point])
+                    except np.linalg.LinAlgError:
+                        singular[point] = True
+                return x, singular
+
+        from scipy.sparse import csc_matrix
+        from scipy.sparse.linalg import splu
+
+        for point in range(points):
+            M = csc_matrix((values[point], (self.rows, self.columns)), shape=(n, n))
+            try:
+                x[point] = splu(M).solve(b[point])
+            except RuntimeError:
+                singular[point] = True
+        return x, singular
+
+    def drift(self, states, parameters, return_singular=False):
+        """
+        Berechnet die Koeffizienten von df_S in Hᴺf für viele Punkte auf einmal.
+
+        :param states: Array (Punkte, langsame Spezies) in der Reihenfolge von slow_species, ein einzelner
+                       Zustand (langsame Spezies,) oder ein Dictionary {Spezies: Zahl oder Array}.
+        :param parameters: Dictionary {Name: Zahl oder Array (Punkte,)} für natnum, Raten und symbolische Skalierungen.
+        :param return_singular: Zusätzlich angeben, an welchen Punkten M singulär war.
+        :return: Array (Punkte, langsame Spezies), bzw. Tupel (Array, Maske der singulären Punkte).
+        """
+        if isinstance(states, dict):
+            states = np.stack(np.broadcast_arrays(*(np.asarray(states[S], dtype=float) for S in self.slow_species)), axis=-1)
+        states = np.atleast_2d(np.asarray(states, dtype=float))
+        points = max([states.shape[0]] + [np.size(value) for value in parameters.values()])
+        states = np.broadcast_to(states, (points, len(self.slow_species)))
+
+        propensities = self.propensities(states, parameters)
+        ratios, singular = self._ratios(propensities)
+        drift = propensities[:, self.slow_only] @ self.changes[self.slow_only]
+        producers = propensities[:, self.producer_reactions]
+        drift += producers @ self.changes[self.producer_reactions]
+        drift += np.einsum("bp,bps->bs", producers, ratios[:, self.producer_species, :])
+        return (drift, singular) if return_singular else drift
+
+
+def _assignments(specs):
+    values = {}
+    for spec in specs:
+        name, sep, value = spec.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid assignment '{spec}', expected NAME=VALUE")
+        values[name] = float(value)
+    return values
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the approximate generator numerically.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="NAME=VALUE", help="natnum, rate or scale value")
+    parser.add_argument("-s", "--state", action="append", default=[], metavar="SPECIES=VALUE", help="slow species value")
+    parser.add_argument("--points", help='JSON-lines file with {"states": {...}, "parameters": {...}} per point '
+                                         "(missing entries are taken from -s/-p)")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    engine = NumericGenerator(load_network(args.input))
+    try:
+        states, parameters = _assignments(args.state), _assignments(args.param)
+        points = [{"states": {}, "parameters": {}}]
+        if args.points:
+            with open(args.points, "r") as file:
+                points = [json.loads(line) for line in file if line.strip()]
+        missing = sorted({
+            name for point in points
+            for name in [S for S in engine.slow_species if S not in {**states, **point.get("states", {})}]
+            + [P for P in engine.parameter_names() if P not in {**parameters, **point.get("parameters", {})}]
+        })
+        if missing:
+            raise KeyError(", ".join(missing))
+        state_rows = [[{**states, **point.get("states", {})}[S] for S in engine.slow_species] for point in points]
+        batch = {
+            name: np.array([{**parameters, **point.get("parameters", {})}[name] for point in points], dtype=float)
+            for name in engine.parameter_names()
+        }
+    except KeyError as error:
+        sys.exit(f"❌ Missing value(s) for {error.args[0]}")
+    except ValueError as error:
+        sys.exit(f"❌ {error}")
+
+    start = time.perf_counter()
+    drift, singular = engine.drift(np.array(state_rows, dtype=float).reshape(len(points), -1), batch, return_singular=True)
+    elapsed = time.perf_counter() - start
+    stream = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for i, (row, flag) in enumerate(zip(drift, singular)):
+            record = {
+                "states": dict(zip(engine.slow_species, state_rows[i])),
+                "parameters": {name: float(values[i]) for name, values in batch.items()},
+                "drift": dict(zip(engine.slow_species, map(float, row))),
+                "singular": bool(flag),
+                "input": os.path.abspath(args.input),
+            }
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            stream.close()
+    print(f"✅ Evaluated {len(points)} points in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
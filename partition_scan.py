@@ -0,0 +1,294 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import as_completed
+
+import telemetry
+from compiled_network import load_network
+from lazy_import import lazy_import
+from worker_pool import WorkerPool
+
+sp = lazy_import("sympy")
+
+# Ergebnisse je Sub-CRN (Schlüssel: generator.sub_crn_cache_key): (Beitrag zu Hᴺf, det(M) des Blocks ist 0),
+# als LRU mit höchstens BLOCK_CACHE_SIZE Einträgen
+_block_cache = OrderedDict()
+BLOCK_CACHE_SIZE = 1024
+
+# Varianten der Bedingung von `check_all_sub_crns_for_fast_species` für die Suche (siehe `enumerate_fast_sets`)
+FAST_CHECKS = ("report", "strict", "off")
+
+
+def declared_species(data):
+    """
+    :return: Die als langsam oder schnell deklarierten Spezies in der Reihenfolge der Datei.
+    """
+    species = []
+    for name in list(data["species"].get("slow") or []) + list(data["species"].get("fast") or []):
+        if name not in species:
+            species.append(name)
+    return species
+
+def _checked_reactions(reactions):
+    # Die Reaktionen, die check_all_sub_crns_for_fast_species prüft: Komplexe auf beiden Seiten nicht leer
+    return [
+        reaction for reaction in reactions
+        if reaction.get("educts", {}) and reaction.get("products", {})
+    ]
+
+def _completions(free, fast_count, size, min_fast, min_slow):
+    # Anzahl der Aufteilungen, die aus fast_count schnellen Spezies durch Verteilen von `free` weiteren entstehen
+    return sum(
+        math.comb(free, extra) for extra in range(free + 1)
+        if fast_count + extra >= min_fast and size - fast_count - extra >= min_slow
+    )
+
+def enumerate_fast_sets(data, species=None, fast_check="report", min_fast=1, min_slow=1, stats=None):
+    """
+    Zählt die Mengen schneller Spezies auf; alle übrigen Spezies aus `species` sind langsam.
+
+    Mit fast_check="strict" werden nur Mengen geliefert, bei denen jede Reaktion der Sub-CRNs eine schnelle
+    Spezies in den Edukten und in den Produkten enthält (wie `check_all_sub_crns_for_fast_species`).
+    Diese Bedingung wird schon während der Tiefensuche geprüft: Ein Zweig wird verworfen, sobald alle
+    Spezies einer Edukt- oder Produktseite einer Reaktion langsam gewählt wurden. Da schon eine einzige rein
+    langsame Reaktion (z. B. P -> empty in g_neu.yaml) jede Aufteilung verwirft, wird mit "report" (Standard)
+    und "off" nicht beschnitten.
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :param species: Zu verteilende Spezies (Standard: alle deklarierten Spezies).
+    :param fast_check: "strict" zum Beschneiden, sonst ("report", "off") alle Mengen aufzählen.
+    :param min_fast: Mindestanzahl schneller Spezies.
+    :param min_slow: Mindestanzahl langsamer Spezies.
+    :param stats: Optionales Dictionary; unter "cut" wird die Anzahl der beim Beschneiden verworfenen
+                  Aufteilungen addiert.
+    :return: Generator von Listen schneller Spezies.
+    """
+    species = declared_species(data) if species is None else list(species)
+    stats = {} if stats is None else stats
+    stats.setdefault("cut", 0)
+    position = {name: i for i, name in enumerate(species)}
+    sides = []
+    if fast_check == "strict":
+        for reaction in _checked_reactions(data["reactions"]):
+            for side in ("educts", "products"):
+                indices = sorted(position[name] for name in reaction[side] if name in position)
+                # Eine Seite ohne wählbare Spezies kann nie eine schnelle Spezies enthalten
+                if not indices:
+                    stats["cut"] += _completions(len(species), 0, len(species), min_fast, min_slow)
+                    return
+                sides.append(indices)
+    # Eine Seite ist entschieden, sobald ihre letzte Spezies gewählt ist
+    sides_by_last = {}
+    for indices in sides:
+        sides_by_last.setdefault(indices[-1], []).append(indices)
+
+    chosen = [False] * len(species)
+
+    def search(i, fast_count):
+        if fast_count + (len(species) - i) < min_fast or len(species) - fast_count < min_slow:
+            return
+        if i == len(species):
+            yield [name for name, fast in zip(species, chosen) if fast]
+            return
+        for fast in (True, False):
+            chosen[i] = fast
+            if all(any(chosen[j] for j in indices) for indices in sides_by_last.get(i, [])):
+                yield from search(i + 1, fast_count + fast)
+            else:
+                stats["cut"] += _completions(len(species) - i - 1, fast_count + fast, len(species), min_fast, min_slow)
+        chosen[i] = False
+
+    yield from search(0, 0)
+
+def fast_matrix_pattern(reactions, fast_species):
+    """
+    Bestimmt die Einträge von M (siehe generator.create_fast_species_matrix), die nicht identisch 0 sind,
+    mit denselben Prüffunktionen, aber ohne symbolische Ausdrücke.
+    :return: Dictionary {S: Menge der Spalten T mit M[S][T] != 0}.
+    """
+    import generator
+
+    pattern = {S: set() for S in fast_species}
+    for reaction in reactions:
+        for S in fast_species:
+            if generator.consumes_fast_species_without_producing(reaction, S):
+                pattern[S].add(S)
+            for T in fast_species:
+                if S != T and generator.consumes_and_produces_fast_species(reaction, S, T):
+                    pattern[S].add(T)
+    return pattern
+
+def structural_rank(pattern):
+    """
+    Berechnet den strukturellen Rang (maximales Matching im bipartiten Graphen Zeilen/Spalten).
+    Ist er kleiner als die Anzahl der Zeilen, so ist det(M) für alle Raten identisch 0.
+    :param pattern: Dictionary {Zeile: Menge der Spalten mit Eintrag != 0}.
+    :return: Größe des maximalen Matchings.
+    """
+    match = {}
+
+    def augment(row, visited):
+        for column in pattern[row]:
+            if column not in visited:
+                visited.add(column)
+                if column not in match or augment(match[column], visited):
+                    match[column] = row
+                    return True
+        return False
+
+    return sum(augment(row, set()) for row in pattern)
+
+def candidate_partitions(data, species=None, fast_check="report", min_fast=1, min_slow=1, stats=None):
+    """
+    Liefert alle Aufteilungen in langsame und schnelle Spezies, die die strukturellen Tests bestehen,
+    und die verworfenen Aufteilungen mit Grund. Es wird dabei nichts symbolisch berechnet.
+    Mit fast_check="report" erhält jeder Kandidat unter "fast_species_check" das Ergebnis von
+    `check_all_sub_crns_for_fast_species`, ohne dass deswegen Aufteilungen verworfen werden.
+    :param stats: Optionales Dictionary wie in `enumerate_fast_sets`.
+    :return: Tupel (Liste der Kandidaten, Liste der verworfenen Aufteilungen), jeweils Dictionaries mit slow/fast.
+    """
+    import generator
+
+    if fast_check not in FAST_CHECKS:
+        raise ValueError(f"fast_check must be one of {', '.join(FAST_CHECKS)}")
+    species = declared_species(data) if species is None else list(species)
+    candidates, pruned = [], []
+    for fast_species in enumerate_fast_sets(data, species, fast_check, min_fast, min_slow, stats):
+        partition = {"slow": [s for s in species if s not in fast_species], "fast": fast_species}
+        if fast_check != "off":
+            passed = all(generator.check_all_sub_crns_for_fast_species(data["reactions"], fast_species).values())
+            if fast_check == "report":
+                partition["fast_species_check"] = passed
+        if fast_check == "strict" and not passed:
+            pruned.append(dict(partition, reason="sub-CRN reaction without fast species"))
+        elif structural_rank(fast_matrix_pattern(data["reactions"], fast_species)) < len(fast_species):
+            pruned.append(dict(partition, reason="M is structurally singular"))
+        else:
+            candidates.append(partition)
+    return candidates, pruned
+
+def _evaluate_block(sub_crn, natnum):
+    """
+    Berechnet den Beitrag eines Sub-CRNs und ob det(M) des Blocks verschwindet (Arbeitsfunktion für den Pool).
+    """
+    import generator
+
+    slow = sub_crn["species"]["slow"]
+    fast = sub_crn["species"]["fast"]
+    slow_symbolic_variables = generator.init_slow_symbolic_variables(slow)
+    result = generator.total_sum_of_sub_crn(
+        sub_crn, natnum, slow_symbolic_variables, generator.init_slow_symbolic_derivatives(slow)
+    )
+    # Gleiche Matrix wie in total_sum_of_sub_crn, det(M) kommt daher aus dem Determinanten-Cache
+    M = generator.create_fast_species_matrix(sub_crn["reactions"], fast, slow_symbolic_variables, natnum, slow)
+    return result, bool(fast) and generator.get_matrix_determinant(M) == 0
+
+def scan_partitions(data, species=None, fast_check="report", min_fast=1, min_slow=1, max_workers=None, stats=None):
+    """
+    Durchsucht alle zulässigen Aufteilungen eines Netzwerks in langsame und schnelle Spezies.
+
+    Zuerst werden Aufteilungen mit den strukturellen Tests aus `candidate_partitions` verworfen. Für die übrigen
+    wird Hᴺf über die Sub-CRNs berechnet (siehe generator.total_sum_of_reactions_by_sub_crns). Jedes Sub-CRN,
+    das in mehreren Aufteilungen gleich vorkommt, wird nur einmal berechnet; die verschiedenen Sub-CRNs
+    werden parallel in einem Prozesspool (worker_pool.WorkerPool) berechnet und zusätzlich mit generator.store_sub_crn_result abgelegt,
+    sodass auch spätere Aufrufe von total_sum_of_reactions_by_sub_crns sie wiederverwenden.
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :param species: Zu verteilende Spezies (Standard: alle deklarierten Spezies).
+    :param fast_check: "report", "strict" oder "off" (siehe `candidate_partitions`).
+    :param min_fast: Mindestanzahl schneller Spezies.
+    :param min_slow: Mindestanzahl langsamer Spezies.
+    :param max_workers: Anzahl der Prozesse (Standard: Anzahl der CPU-Kerne, 1 = seriell).
+    :param stats: Optionales Dictionary; unter "cut" steht danach die Anzahl der schon in der Suche verworfenen
+                  Aufteilungen, die nicht als Datensatz erscheinen.
+    :return: Liste von Dictionaries (slow, fast, status, ...) für alle aufgezählten Aufteilungen.
+    """
+    import generator
+
+    natnum = sp.Symbol(data.get("natnum", "N"))
+    candidates, pruned = candidate_partitions(data, species, fast_check, min_fast, min_slow, stats)
+
+    # Verschiedene Sub-CRNs aller Kandidaten sammeln
+    blocks = {}
+    partition_blocks = []
+    for partition in candidates:
+        keys = []
+        for sub_crn in generator.group_sub_crns_by_fast_species(dict(data, species=partition)):
+            key = generator.sub_crn_cache_key(dict(sub_crn, natnum=str(natnum)))
+            blocks.setdefault(key, sub_crn)
+            keys.append(key)
+        partition_blocks.append(keys)
+
+    block_results = {}
+    for key in blocks:
+        if key in _block_cache:
+            _block_cache.move_to_end(key)
+            block_results[key] = _block_cache[key]
+    todo = {key: sub_crn for key, sub_crn in blocks.items() if key not in block_results}
+    if len(todo) > 1 and max_workers != 1:
+        with WorkerPool(max_workers) as executor:
+            futures = {executor.submit(_evaluate_block, sub_crn, natnum): key for key, sub_crn in todo.items()}
+            for future in as_completed(futures):
+                block_results[futures[future]] = future.result()
+    else:
+        for key, sub_crn in todo.items():
+            block_results[key] = _evaluate_block(sub_crn, natnum)
+    for key in todo:
+        generator.store_sub_crn_result(key, block_results[key][0])
+        _block_cache[key] = block_results[key]
+    while len(_block_cache) > BLOCK_CACHE_SIZE:
+        _block_cache.popitem(last=False)
+
+    records = []
+    for partition, keys in zip(candidates, partition_blocks):
+        result = sp.Add(*(block_results[key][0] for key in keys))
+        singular = any(block_results[key][1] for key in keys)
+        records.append(dict(
+            partition,
+            status="ok",
+            well_defined=not singular,
+            blocks=len(keys),
+            result={"str": str(result), "srepr": sp.srepr(result)},
+        ))
+    records += [dict(partition, status="pruned") for partition in pruned]
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan all slow/fast partitions of a network.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--species", nargs="+", help="species to distribute (default: all declared species)")
+    parser.add_argument("--fast-check", choices=FAST_CHECKS, default="report",
+                        help="require a fast species on both sides of every sub-CRN reaction: record the result per "
+                             "partition (report, default), prune partitions that fail (strict) or skip the check (off)")
+    parser.add_argument("--min-fast", type=int, default=1)
+    parser.add_argument("--min-slow", type=int, default=1)
+    parser.add_argument("--pruned", action="store_true", help="also write the pruned partitions")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    data = load_network(args.input)
+    start = time.perf_counter()
+    stats = {}
+    records = scan_partitions(data, args.species, args.fast_check, args.min_fast, args.min_slow, args.jobs, stats)
+    stream = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for record in records:
+            if record["status"] == "ok" or args.pruned:
+                stream.write(json.dumps(dict(record, input=os.path.abspath(args.input)), ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            stream.close()
+    ok = sum(record["status"] == "ok" for record in records)
+    print(f"✅ {ok} candidate partitions evaluated, {len(records) - ok + stats['cut']} pruned "
+          f"({stats['cut']} during the search, {time.perf_counter() - start:.1f} s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+
+
+class Cancelled(Exception):
+    """
+    Eine Berechnung wurde über ein CancellationToken abgebrochen.
+    """
+
+
+class CancellationToken:
+    """
+    Abbruchsignal für lange Berechnungen. Die Engines prüfen es zwischen den Stufen und in den inneren Schleifen
+    (bei jedem Fortschrittsereignis); `cancel` darf aus einem anderen Thread aufgerufen werden.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason=None):
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """
+        :raises Cancelled: Wenn `cancel` aufgerufen wurde.
+        """
+        if self._event.is_set():
+            raise Cancelled(self.reason or "cancelled")
+
+
+class Progress:
+    """
+    Meldet Fortschrittsereignisse an einen Callback und prüft dabei das CancellationToken.
+
+    Ein Ereignis ist ein Dictionary mit stage (z. B. "generator.determinant"), step und total (Position innerhalb
+    der Stufe, falls bekannt), time, elapsed (seit Beginn der Berechnung), eta (geschätzte Restzeit der Stufe in
+    Sekunden, sobald step > 0) und weiteren Angaben der Stufe, z. B. slow/fast beim Determinantenpaar.
+    """
+
+    def __init__(self, callback=None, cancel=None):
+        """
+        :param callback: Funktion, die jedes Ereignis erhält (None = nur Abbruch prüfen).
+        :param cancel: CancellationToken oder None.
+        """
+        self.callback = callback
+        self.cancel = cancel
+        self.start = time.perf_counter()
+        self._stages = {}
+
+    def __call__(self, stage, step=None, total=None, **info):
+        """
+        Meldet den Beginn einer Stufe oder eines Schritts darin.
+        :raises Cancelled: Wenn die Berechnung abgebrochen wurde.
+        """
+        self.check()
+        if self.callback is None:
+            return
+        now = time.perf_counter()
+        started = self._stages.setdefault(stage, now)
+        eta = None
+        if step and total:
+            done = step - 1  # step ist der gerade begonnene Schritt (ab 1)
+            eta = (now - started) / done * (total - done) if done > 0 else None
+        self.callback(dict(
+            {"stage": stage, "step": step, "total": total, "time": time.time(), "elapsed": now - self.start, "eta": eta},
+            **info,
+        ))
+
+    def check(self):
+        if self.cancel is not None:
+            self.cancel.check()
+
+
+def tracker(progress=None, cancel=None):
+    """
+    Erzeugt den Melder für eine Engine-Funktion aus ihren Argumenten progress und cancel.
+    Ein bereits erzeugter Progress (von einer aufrufenden Engine) wird unverändert weitergegeben.
+    """
+    if isinstance(progress, Progress):
+        return progress
+    return Progress(progress, cancel)
+
+
+async def stream(function, *args, cancel=None, **kwargs):
+    """
+    Führt eine Engine-Funktion (total_sum_of_reactions, crn_lln, crn_clt, ...) in einem Thread aus und liefert ihre
+    Fortschrittsereignisse als asynchronen Iterator. Das letzte Ereignis hat stage "result" und den Rückgabewert
+    unter "result". Wird der Iterator vorzeitig geschlossen, wird die Berechnung über das Token abgebrochen.
+
+    :param function: Funktion mit den Schlüsselwortargumenten progress und cancel.
+    :param cancel: CancellationToken (Standard: ein neues).
+    :raises Cancelled: Wenn die Berechnung abgebrochen wurde.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    token = cancel or CancellationToken()
+    done = object()
+
+    def callback(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    future = loop.run_in_executor(None, lambda: function(*args, progress=callback, cancel=token, **kwargs))
+    future.add_done_callback(lambda _: events.put_nowait(done))
+    try:
+        while True:
+            event = await events.get()
+            if event is done:
+                break
+            yield event
+        yield {"stage": "result", "time": time.time(), "result": future.result()}
+    finally:
+        if not future.done():
+            token.cancel("progress stream closed")
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())  # Cancelled gilt als abgeholt
@@ -0,0 +1,205 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+import telemetry
+from compiled_network import load_network
+from lazy_import import lazy_import
+from worker_pool import WorkerPool
+
+sp = lazy_import("sympy")
+
+# Struktur des Netzwerks im Worker-Prozess (wird einmal pro Prozess über den Initializer übergeben)
+_structure = None
+
+
+def parse_range(spec):
+    """
+    Liest die Werte eines Skalierungsexponenten, z. B. "b1=0:3" (0, 1, 2, 3) oder "b1=0,2,5".
+    :param spec: Zeichenkette "Name=Bereich".
+    :return: Tupel (Name, Liste ganzer Zahlen).
+    """
+    name, sep, values = spec.partition("=")
+    if not sep or not name or not values:
+        raise ValueError(f"Invalid range '{spec}', expected e.g. b1=0:3 or b1=0,1,2")
+    if ":" in values:
+        start, _, stop = values.partition(":")
+        return name, list(range(int(start), int(stop) + 1))
+    return name, [int(value) for value in values.split(",")]
+
+def scale_names(data):
+    """
+    :return: Die Namen aller Skalierungen der Reaktionen in der Reihenfolge ihres ersten Auftretens.
+    """
+    names = []
+    for reaction in data["reactions"]:
+        scale = str(reaction["scale"])
+        if scale not in names:
+            names.append(scale)
+    return names
+
+def regimes(ranges):
+    """
+    Bildet alle Kombinationen der Exponenten.
+    :param ranges: Dictionary {Name: Liste ganzer Zahlen}.
+    :return: Liste von Dictionaries {Name: Wert}.
+    """
+    names = list(ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*(ranges[name] for name in names))]
+
+def build_structure(data, coalesce=False):
+    """
+    Berechnet einmal alle von den Exponenten unabhängigen Teile des Generators.
+
+    Die Skalierungen bleiben dabei Symbole (wie in generator.compute_scaled_rate). Gespeichert werden
+    det(M), die Determinanten det(M{S,S'}) und pro langsamer Spezies die Reaktionssummen,
+    jeweils mit den Potenzen von N in Abhängigkeit der Skalierungssymbole (siehe generator.GeneratorQuery).
+
+    :param data: Dictionary mit den Reaktionsdaten.
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen.
+    :return: Dictionary mit den symbolischen Bausteinen.
+    """
+    import generator
+
+    slow_species = data["species"]["slow"]
+    fast_species = data["species"]["fast"]
+    natnum = sp.Symbol(data.get("natnum", "N"))
+    slow_symbolic_variables = generator.init_slow_symbolic_variables(slow_species)
+    slow_symbolic_derivatives = generator.init_slow_symbolic_derivatives(slow_species)
+    query = generator.GeneratorQuery(
+        data, natnum, slow_species, fast_species, slow_symbolic_variables, slow_symbolic_derivatives, coalesce
+    )
+
+    det_M = query.determinant()
+    coefficients = {}
+    for slow in slow_species:
+        slow_sum = sum(
+            generator.reaction_change(reaction, slow, slow_symbolic_variables, natnum, slow_species)
+            for reaction in query.reactions if generator.is_slow_only_reaction(reaction, fast_species)
+        )
+        # Je erzeugter schneller Spezies: Σ Propensität · Änderung, Σ Propensität und det(M{S,S'})
+        entries = []
+        for fast in fast_species:
+            producers = query.producers(fast)
+            if not producers:
+                continue
+            change = sum(
+                generator.reaction_change(reaction, slow, slow_symbolic_variables, natnum, slow_species)
+                for reaction in producers
+            )
+            propensity = sum(
+                generator.reaction_propensity(reaction, slow_symbolic_variables, natnum, slow_species)
+                for reaction in producers
+            )
+            modified = query.modified_determinant(slow, fast) if det_M != 0 else sp.S(0)
+            entries.append((change, propensity, modified))
+        coefficients[slow] = (slow_sum, entries)
+
+    return {
+        "scales": scale_names(data),
+        "det_M": det_M,
+        "coefficients": coefficients,
+        "derivatives": slow_symbolic_derivatives,
+    }
+
+def specialise(structure, regime):
+    """
+    Setzt die Exponenten eines Regimes ein und berechnet Hᴺf.
+
+    Skalierungen, deren Name eine ganze Zahl ist ("0", "1", ...), werden immer durch ihren Wert ersetzt;
+    nicht angegebene symbolische Skalierungen bleiben Symbole. Verschwindet det(M) im Regime, so werden
+    die Determinantenquotienten wie in generator.sum_over_slow_fast_species_reactions zu 0.
+
+    :param structure: Ergebnis von `build_structure`.
+    :param regime: Dictionary {Skalierungsname: ganze Zahl}.
+    :return: Der vereinfachte Generator als SymPy-Ausdruck.
+    """
+    values = {name: int(name) for name in structure["scales"] if name.lstrip("-").isdigit()}
+    values.update(regime)
+    substitution = {sp.Symbol(name): sp.Integer(value) for name, value in values.items()}
+
+    det_M = sp.simplify(structure["det_M"].subs(substitution))
+    total = 0
+    for slow, (slow_sum, entries) in structure["coefficients"].items():
+        coefficient = slow_sum.subs(substitution) if slow_sum != 0 else 0
+        for change, propensity, modified in entries:
+            coefficient += change.subs(substitution)
+            if det_M != 0:
+                coefficient += propensity.subs(substitution) * modified.subs(substitution) / det_M
+        total += coefficient * structure["derivatives"][slow]
+    return sp.simplify(total)
+
+def _init_worker(structure):
+    global _structure
+    _structure = structure
+
+def _run_regime(regime):
+    start = time.perf_counter()
+    try:
+        result = specialise(_structure, regime)
+        return {"regime": regime, "status": "ok", "result": {"str": str(result), "srepr": sp.srepr(result)},
+                "time": time.perf_counter() - start}
+    except Exception as error:
+        return {"regime": regime, "status": "error", "error": f"{type(error).__name__}: {error}",
+                "time": time.perf_counter() - start}
+
+def sweep(data, ranges, max_workers=None, coalesce=False):
+    """
+    Berechnet Hᴺf für alle Kombinationen der Exponenten. Die strukturelle Arbeit (Matrix, Determinanten,
+    Reaktionssummen) wird einmal erledigt; pro Regime werden nur die Exponenten eingesetzt, parallel in einem Prozesspool
+    (worker_pool.WorkerPool).
+    :param data: Dictionary mit den Reaktionsdaten.
+    :param ranges: Dictionary {Skalierungsname: Liste ganzer Zahlen}.
+    :param max_workers: Anzahl der Prozesse (Standard: Anzahl der CPU-Kerne, 1 = seriell).
+    :param coalesce: Strukturell gleiche Reaktionen vorab zusammenfassen.
+    :return: Generator von Ergebnis-Dictionaries (regime, status, result bzw. error, time) in der Reihenfolge der Regime.
+    """
+    unknown = [name for name in ranges if name not in scale_names(data)]
+    if unknown:
+        raise ValueError(f"Unknown scale(s) {unknown}, the network uses {scale_names(data)}")
+    return _run_regimes(build_structure(data, coalesce), regimes(ranges), max_workers)
+
+def _run_regimes(structure, todo, max_workers):
+    if max_workers == 1 or len(todo) < 2:
+        _init_worker(structure)
+        yield from map(_run_regime, todo)
+        return
+    with WorkerPool(max_workers, initializer=_init_worker, initargs=(structure,)) as executor:
+        yield from executor.map(_run_regime, todo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute the approximate generator for many scaling regimes.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("-s", "--scale", action="append", default=[], metavar="NAME=RANGE",
+                        help="values of a scale exponent, e.g. b1=0:3 or b1=0,2 (repeatable)")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--coalesce", action="store_true", help="merge structurally identical reactions first")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    data = load_network(args.input)
+    try:
+        ranges = dict(parse_range(spec) for spec in args.scale)
+        results = sweep(data, ranges, args.jobs, args.coalesce)
+        stream = open(args.output, "w") if args.output else sys.stdout
+        try:
+            count = 0
+            for record in results:
+                stream.write(json.dumps(dict(record, input=os.path.abspath(args.input)), ensure_ascii=False) + "\n")
+                stream.flush()
+                count += 1
+        finally:
+            if args.output:
+                stream.close()
+    except ValueError as error:
+        sys.exit(f"❌ {error}")
+    print(f"✅ Computed {count} regimes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import sys
+
+from lazy_import import lazy_import
+
+import codegen
+import telemetry
+
+sp = lazy_import("sympy")
+
+
+def rate_symbols(file_path, kind="generator"):
+    """
+    Bestimmt die Ratenkonstanten, nach denen abgeleitet wird: die Ratennamen der Netzwerkdatei für "generator",
+    k0, k1, ... (eine je Reaktion) für "lln" und "clt".
+    :return: Liste von Symbolen in der Reihenfolge der Reaktionen (ohne Wiederholungen).
+    """
+    from network_formats import read_network, to_yaml_dict
+
+    reactions = to_yaml_dict(read_network(file_path))["reactions"]
+    if kind == "generator":
+        names = [reaction["rate"] for reaction in reactions]
+    else:
+        names = [f"k{j}" for j in range(len(reactions))]
+    return [sp.Symbol(name) for name in dict.fromkeys(names)]
+
+def sensitivity_expressions(expressions, rates):
+    """
+    Ergänzt die Ausdrücke um ihre partiellen Ableitungen nach den Raten.
+    :param expressions: Dictionary {Name der Ausgabe: SymPy-Ausdruck} (z. B. aus codegen.collect_expressions).
+    :param rates: Liste der Ratensymbole.
+    :return: Dictionary mit zuerst den Ausdrücken und dann "d{Ausgabe}/d{Rate}" zeilenweise je Ausgabe.
+    """
+    result = dict(expressions)
+    for name, expression in expressions.items():
+        for rate in rates:
+            result[f"d{name}/d{rate}"] = sp.diff(expression, rate)
+    return result
+
+def jacobian_source(expressions, states, parameters, rates, name="evaluate"):
+    """
+    Erzeugt ein NumPy-Modul wie codegen.numpy_module_source für die Ausdrücke samt aller Ableitungen nach den
+    Raten. Werte und Ableitungen werden in einer Funktion mit gemeinsamen Teilausdrücken (cse) berechnet;
+    `jacobian(x, p)` gibt sie getrennt als Werte (..., Ausgaben) und Jacobi-Matrix (..., Ausgaben, Raten) zurück.
+
+    :param expressions: Dictionary {Name der Ausgabe: SymPy-Ausdruck}.
+    :param states: Liste der Zustandssymbole.
+    :param parameters: Liste der Parametersymbole (muss die Raten enthalten).
+    :param rates: Liste der Ratensymbole.
+    :param name: Name der erzeugten Grundfunktion.
+    :return: Quelltext als Zeichenkette.
+    """
+    source = codegen.numpy_module_source(sensitivity_expressions(expressions, rates), states, parameters, name)
+    count, width = len(expressions), len(rates)
+    lines = [
+        f"VALUES = {list(expressions)!r}",
+        f"RATES = {[str(rate) for rate in rates]!r}",
+        "",
+        "",
+        "def jacobian(x, p):",
+        '    """',
+        f"    :return: Tupel (Werte der Form (..., {count}), Jacobi-Matrix der Form (..., {count}, {width})) mit den",
+        "             Ableitungen der Werte (VALUES) nach den Raten (RATES).",
+        '    """',
+        f"    out = {name}(x, p)",
+        f"    return out[..., :{count}], out[..., {count}:].reshape(out.shape[:-1] + ({count}, {width}))",
+        "",
+    ]
+    return source + "\n" + "\n".join(lines)
+
+
+class Sensitivity:
+    """
+    Werte und Jacobi-Matrix der Drift- und Diffusionskoeffizienten nach den Ratenkonstanten für viele Punkte.
+    Die Ableitungen werden einmal symbolisch gebildet und über codegen in eine vektorisierte Funktion übersetzt.
+    """
+
+    def __init__(self, file_path, kind="lln", eliminate=None, rates=None):
+        """
+        :param file_path: Netzwerkdatei (.yaml, .json oder .crnb).
+        :param kind: "generator", "lln" oder "clt" (siehe codegen.collect_expressions).
+        :param eliminate: Zu eliminierende Indizes für crn_lln/crn_clt.
+        :param rates: Namen der Raten (Standard: `rate_symbols`).
+        """
+        self.expressions = codegen.collect_expressions(file_path, kind, eliminate)
+        self.states, self.parameters = codegen.split_symbols(self.expressions)
+        if rates is None:
+            rates = [rate for rate in rate_symbols(file_path, kind) if rate in self.parameters]
+        else:
+            rates = [sp.Symbol(rate) for rate in rates]
+            unknown = [str(rate) for rate in rates if rate not in self.parameters]
+            if unknown:
+                raise KeyError(f"rates not occurring in the {kind} coefficients: {', '.join(unknown)}")
+        self.rates = rates
+        self.source = jacobian_source(self.expressions, self.states, self.parameters, self.rates)
+        self._module = codegen.load_module(self.source, "generated_sensitivity")
+
+    def __call__(self, x, p):
+        """
+        :param x: Zustände, Form (..., len(states)).
+        :param p: Parameter, Form (..., len(parameters)).
+        :return: Tupel (Werte, Jacobi-Matrix) wie im erzeugten `jacobian`.
+        """
+        return self._module.jacobian(x, p)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate vectorised rate sensitivities of generator, LLN and CLT coefficients.")
+    parser.add_argument("input", help="network file (.yaml, .json or .crnb)")
+    parser.add_argument("-k", "--kind", choices=codegen.KINDS, default="lln")
+    parser.add_argument("-e", "--eliminate", type=int, nargs="+", help="indices to eliminate (crn_lln/crn_clt)")
+    parser.add_argument("-r", "--rates", nargs="+", help="rates to differentiate by (default: all rate constants)")
+    parser.add_argument("-o", "--output", help="Python module to write (default: stdout)")
+    parser.add_argument("--check", type=int, default=0, metavar="POINTS",
+                        help="compare values and derivatives with the symbolic result at POINTS random points")
+    args = parser.parse_args(argv)
+    telemetry.configure_from_env()
+
+    try:
+        sensitivity = Sensitivity(args.input, args.kind, args.eliminate, args.rates)
+    except KeyError as error:
+        sys.exit(f"❌ {error.args[0]}")
+    except ValueError as error:
+        sys.exit(f"❌ {error}")
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(sensitivity.source)
+    else:
+        sys.stdout.write(sensitivity.source)
+    print(f"✅ {len(sensitivity.expressions)} coefficients × {len(sensitivity.rates)} rates "
+          f"({', '.join(str(rate) for rate in sensitivity.rates)})", file=sys.stderr)
+    if args.check:
+        expressions = sensitivity_expressions(sensitivity.expressions, sensitivity.rates)
+        report = codegen.check_generated(expressions, sensitivity.states, sensitivity.parameters, sensitivity.source, points=args.check)
+        result = report["numpy"]
+        print(f"{'✅' if result['ok'] else '❌'} numpy: max. relative error {result['max_error']:.2e} "
+              f"at {result['points']} points", file=sys.stderr)
+        if not result["ok"]:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from lazy_import import lazy_import
+from worker_pool import WorkerPool
+
+sp = lazy_import("sympy")
+
+# Ergebnisse bereits ausgeführter Knoten (Schlüssel: Node.key), prozessweit über alle Graphen;
+# LRU mit höchstens RESULTS_SIZE Einträgen
+_results = OrderedDict()
+RESULTS_SIZE = 1024
+
+
+def clear_cache():
+    _results.clear()
+
+def _store(key, value):
+    _results[key] = value
+    _results.move_to_end(key)
+    while len(_results) > RESULTS_SIZE:
+        _results.popitem(last=False)
+
+
+class Node:
+    """
+    Ein Knoten des Aufgabengraphen: function(*args, **kwargs), wobei Knoten in args/kwargs (auch in Listen, Tupeln
+    und Dictionary-Werten) vor der Ausführung durch ihre Ergebnisse ersetzt werden und damit Abhängigkeiten sind.
+    """
+
+    def __init__(self, function, args, kwargs, stage=None, info=None):
+        self.function = function
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.stage = stage
+        self.info = dict(info or {})
+        self.dependencies = []
+        _walk((self.args, self.kwargs), self.dependencies.append)
+        self.key = _node_key(function, self.args, self.kwargs)
+
+    def __repr__(self):
+        return f"Node({self.function.__qualname__}, {self.key[:12]})"
+
+
+def _walk(value, visit):
+    if isinstance(value, Node):
+        visit(value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _walk(item, visit)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _walk(item, visit)
+
+def _resolve(value, results):
+    if isinstance(value, Node):
+        return results[value.key]
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_resolve(item, results) for item in value)
+    if isinstance(value, dict):
+        return {key: _resolve(item, results) for key, item in value.items()}
+    return value
+
+def _fingerprint(value):
+    # Deterministische Beschreibung eines Arguments für den Knotenschlüssel; SymPy-Objekte über srepr
+    if isinstance(value, Node):
+        return ["node", value.key]
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_fingerprint(item) for item in value]]
+    if isinstance(value, dict):
+        return ["dict", sorted([str(key), _fingerprint(item)] for key, item in value.items())]
+    if "sympy" in type(value).__module__:
+        return ["sympy", sp.srepr(value)]
+    return ["repr", repr(value)]
+
+def _node_key(function, args, kwargs):
+    content = [f"{function.__module__}.{function.__qualname__}", _fingerprint(list(args)), _fingerprint(kwargs)]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+class TaskGraph:
+    """
+    Aufgabengraph für unabhängige symbolische Stufen (z. B. die Determinanten det(M{S,S'}) von generator.py oder
+    die Vereinfachung einzelner Koeffizienten in crn_clt).
+
+    Knoten werden mit `add` samt ihren Abhängigkeiten deklariert und mit `run` ausgeführt: jeder Knoten, dessen
+    Abhängigkeiten fertig sind, wird sofort an einen Prozesspool (worker_pool.WorkerPool) gegeben. SymPy-Ausdrücke
+    werden dabei per pickle (Baum der args) übertragen, nicht über srepr/sympify. Inhaltsgleiche Knoten (gleiche
+    Funktion, gleiche Argumente) werden nur einmal berechnet; die letzten RESULTS_SIZE Ergebnisse bleiben
+    prozessweit gespeichert (`clear_cache`).
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, function, args=(), kwargs=None, stage=None, info=None):
+        """
+        Deklariert einen Knoten.
+        :param function: Auf Modulebene definierte Funktion (wird an die Worker-Prozesse übertragen).
+        :param args: Positionsargumente; enthaltene Knoten sind Abhängigkeiten.
+        :param kwargs: Schlüsselwortargumente; enthaltene Knoten sind Abhängigkeiten.
+        :param stage: Name der Stufe für Fortschrittsereignisse (siehe `run`).
+        :param info: Weitere Angaben für Fortschrittsereignisse.
+        :return: Der Knoten; ein inhaltsgleicher, bereits deklarierter Knoten wird wiederverwendet.
+        """
+        node = Node(function, args, kwargs, stage, info)
+        return self.nodes.setdefault(node.key, node)
+
+    def run(self, max_workers=1, executor=None, progress=None):
+        """
+        Führt alle noch nicht gespeicherten Knoten in Abhängigkeitsreihenfolge aus.
+        :param max_workers: Anzahl der Prozesse (None = Anzahl der CPU-Kerne, 1 = seriell im aufrufenden Prozess).
+        :param executor: Vorhandener Executor mit submit (z. B. worker_pool.WorkerPool); dann wird max_workers
+                         ignoriert und der Executor nicht beendet.
+        :param progress: progress.Progress oder Callback; erhält beim Start jedes Knotens mit stage ein Ereignis
+                         (stage, step, total und die Angaben aus info).
+        :return: Dictionary {Node: Ergebnis} für alle Knoten des Graphen.
+        :raises progress.Cancelled: Wenn die Berechnung abgebrochen wurde (laufende Knoten werden noch beendet).
+        """
+        from progress import tracker
+
+        report = tracker(progress)
+        # Ergebnisse dieses Laufs; unabhängig davon, ob sie später aus dem prozessweiten Cache verdrängt werden
+        results = {}
+        for node in self.nodes.values():
+            if node.key in _results:
+                _results.move_to_end(node.key)
+                results[node.key] = _results[node.key]
+        pending = [node for node in self.nodes.values() if node.key not in results]
+        total = len(pending)
+        started = 0
+
+        def start(node):
+            nonlocal started
+            started += 1
+            if node.stage:
+                report(node.stage, started, total, **node.info)
+            else:
+                report.check()
+
+        if executor is None and (max_workers == 1 or total <= 1):
+            for node in self._order(pending, results):
+                start(node)
+                results[node.key] = node.function(*_resolve(node.args, results), **_resolve(node.kwargs, results))
+                _store(node.key, results[node.key])
+            return {node: results[node.key] for node in self.nodes.values()}
+
+        own = executor is None
+        if own:
+            executor = WorkerPool(min(total, max_workers or os.cpu_count() or 1))
+        waiting = {node.key: node for node in pending}
+        running = {}
+        try:
+            while waiting or running:
+                for key, node in list(waiting.items()):
+                    if all(dependency.key in results for dependency in node.dependencies):
+                        start(node)
+                        del waiting[key]
+                        future = executor.submit(node.function, *_resolve(node.args, results), **_resolve(node.kwargs, results))
+                        running[future] = node
+                if not running:
+                    raise ValueError("task graph contains a cycle")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    results[node.key] = future.result()
+                    _store(node.key, results[node.key])
+        finally:
+            if own:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return {node: results[node.key] for node in self.nodes.values()}
+
+    def _order(self, nodes, results):
+        # Topologische Reihenfolge (Tiefensuche); bereits berechnete Knoten gelten als erledigt
+        order, seen = [], set()
+
+        def visit(node, path=()):
+            if node.key in seen or node.key in results:
+                return
+            if node.key in path:
+                raise ValueError("task graph contains a cycle")
+            for dependency in node.dependencies:
+                visit(dependency, path + (node.key,))
+            seen.add(node.key)
+            order.append(node)
+
+        for node in nodes:
+            visit(node)
+        return order
+
+
+def map_nodes(function, items, max_workers=1, executor=None, progress=None, stage=None):
+    """
+    Wendet function unabhängig auf jedes Element an (ein Knoten pro Element) und liefert die Ergebnisse in der
+    Reihenfolge der Elemente, z. B. map_nodes(sympy.simplify, coefficients, max_workers=None).
+    """
+    graph = TaskGraph()
+    nodes = [graph.add(function, (item,), stage=stage, info={"item": i}) for i, item in enumerate(items)]
+    results = graph.run(max_workers, executor, progress)
+    return [results[node] for node in nodes]
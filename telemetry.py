@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from lazy_import import lazy_import
+
+sp = lazy_import("sympy")
+
+ACTIONS = ("log", "switch", "raise")
+LIMITS = ("max_ops", "max_depth", "max_memory", "max_free_symbols")
+
+# Einstellungen und Aufzeichnungen der laufenden Sitzung (siehe configure)
+_session = {
+    "enabled": False,
+    "log": None,
+    "limits": {},
+    "action": "raise",
+    "records": [],
+}
+
+
+class ExpressionSwellError(RuntimeError):
+    def __init__(self, stage, metrics, exceeded):
+        limits = ", ".join(f"{name} {metrics[name[4:]]} > {limit}" for name, limit in exceeded.items())
+        super().__init__(f"expression swell in {stage}: {limits}")
+        self.stage = stage
+        self.metrics = metrics
+        self.exceeded = exceeded
+
+
+def configure(log=None, action="raise", enabled=True, **limits):
+    """
+    Schaltet die Aufzeichnung für die laufende Sitzung ein (bzw. mit enabled=False aus).
+
+    :param log: Pfad einer JSON-Lines-Datei oder geöffneter Textstrom (None = nur im Speicher, siehe `records`).
+    :param action: Verhalten bei Überschreitung einer Grenze: "log" (nur vermerken), "switch" (Stufen mit
+                   Ausweichstrategie wechseln diese, alle übrigen brechen ab) oder "raise" (ExpressionSwellError).
+    :param limits: Grenzen max_ops, max_depth, max_memory (Bytes) und max_free_symbols; None = unbegrenzt.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action '{action}'. Choose one of: {', '.join(ACTIONS)}")
+    unknown = [name for name in limits if name not in LIMITS]
+    if unknown:
+        raise ValueError(f"Unknown limit(s) {unknown}. Choose from: {', '.join(LIMITS)}")
+    if isinstance(_session["log"], tuple):
+        _session["log"][1].close()
+    _session.update(
+        enabled=enabled,
+        log=(log, open(log, "a")) if isinstance(log, str) else log,
+        limits={name: value for name, value in limits.items() if value is not None},
+        action=action,
+        records=[],
+    )
+
+def configure_from_env():
+    """
+    Liest die Einstellungen aus CRN_TELEMETRY_LOG, CRN_SWELL_ACTION und CRN_SWELL_MAX_OPS/_DEPTH/_MEMORY/_FREE_SYMBOLS,
+    damit auch Kommandozeilenprogramme und Worker-Prozesse ohne Codeänderung aufzeichnen. Wird von den
+    Kommandozeilenprogrammen und beim Start jedes worker_pool-Workers aufgerufen, nicht beim Import.
+    """
+    limits = {name: int(os.environ[f"CRN_SWELL_{name.upper()}"]) for name in LIMITS
+              if os.environ.get(f"CRN_SWELL_{name.upper()}")}
+    log = os.environ.get("CRN_TELEMETRY_LOG")
+    if log or limits:
+        configure(log, os.environ.get("CRN_SWELL_ACTION", "raise"), **limits)
+
+def enabled():
+    return _session["enabled"]
+
+def records():
+    """
+    :return: Liste der Aufzeichnungen der laufenden Sitzung.
+    """
+    return list(_session["records"])
+
+def measure(expression):
+    """
+    Bestimmt die Größe eines Ausdrucks (auch einer Liste, eines Tupels oder einer Matrix von Ausdrücken).
+    :return: Dictionary mit ops (sympy.count_ops), depth (Baumtiefe), nodes (Knoten), free_symbols und memory
+             (ungefährer Speicherbedarf in Bytes, gemeinsame Teilbäume werden mehrfach gezählt).
+    """
+    if isinstance(expression, dict):
+        expression = list(expression.values())
+    if isinstance(expression, (list, tuple)) or hasattr(expression, "tolist"):
+        expression = sp.Tuple(*expression)  # Matrizen werden zeilenweise durchlaufen
+    expression = sp.sympify(expression)
+
+    nodes = depth = memory = 0
+    stack = [(expression, 1)]
+    while stack:
+        node, level = stack.pop()
+        nodes += 1
+        depth = max(depth, level)
+        memory += sys.getsizeof(node)
+        stack.extend((arg, level + 1) for arg in node.args)
+    return {
+        "ops": int(sp.count_ops(expression)),
+        "depth": depth,
+        "nodes": nodes,
+        "free_symbols": len(expression.free_symbols),
+        "memory": memory,
+    }
+
+def record(stage, expression, switchable=False, **context):
+    """
+    Zeichnet die Größe eines Zwischenergebnisses auf und prüft die Grenzen. Ohne `configure` geschieht nichts.
+
+    :param stage: Name der Stufe, z. B. "crn_lln.G1g".
+    :param expression: Ausdruck (oder Liste/Matrix von Ausdrücken).
+    :param switchable: Die aufrufende Stufe hat eine Ausweichstrategie.
+    :param context: Weitere Angaben für das Protokoll, z. B. die Matrixgröße.
+    :return: False, wenn eine Grenze überschritten wurde und die Stufe ausweichen soll, sonst True.
+    :raises ExpressionSwellError: Bei Überschreitung, wenn action "raise" ist oder die Stufe nicht ausweichen kann.
+    """
+    if not _session["enabled"]:
+        return True
+    start = time.perf_counter()
+    metrics = measure(expression)
+    exceeded = {name: limit for name, limit in _session["limits"].items() if metrics[name[4:]] > limit}
+    action = _session["action"]
+    if exceeded and action == "switch" and not switchable:
+        action = "raise"
+    entry = dict(
+        {"time": time.time(), "stage": stage}, **metrics,
+        measure_time=time.perf_counter() - start,
+        swell=bool(exceeded),
+        action=action if exceeded else None,
+        **context,
+    )
+    _session["records"].append(entry)
+    log = _session["log"]
+    if log is not None:
+        stream = log[1] if isinstance(log, tuple) else log
+        stream.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        stream.flush()
+    if exceeded and action == "raise":
+        raise ExpressionSwellError(stage, metrics, exceeded)
+    return not (exceeded and action == "switch")
+
+def summarize(entries):
+    """
+    Fasst Aufzeichnungen je Stufe zusammen.
+    :param entries: Liste von Aufzeichnungen (siehe `records`) oder Pfad einer Protokolldatei.
+    :return: Dictionary {Stufe: {"count", "max_ops", "max_depth", "max_memory", "max_free_symbols", "swells"}}.
+    """
+    if isinstance(entries, str):
+        with open(entries, "r") as file:
+            entries = [json.loads(line) for line in file if line.strip()]
+    summary = {}
+    for entry in entries:
+        stage = summary.setdefault(entry["stage"], {"count": 0, "swells": 0, **{name: 0 for name in LIMITS}})
+        stage["count"] += 1
+        stage["swells"] += bool(entry.get("swell"))
+        for name in LIMITS:
+            stage[name] = max(stage[name], entry[name[4:]])
+    return summary
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize an expression telemetry log per stage.")
+    parser.add_argument("log", help="JSON-lines log written by telemetry.configure")
+    args = parser.parse_args()
+    print(f"{'stage':32} {'count':>6} {'ops':>10} {'depth':>6} {'memory':>12} {'symbols':>8} {'swells':>7}")
+    for stage, values in summarize(args.log).items():
+        print(f"{stage:32} {values['count']:>6} {values['max_ops']:>10} {values['max_depth']:>6} "
+              f"{values['max_memory']:>12} {values['max_free_symbols']:>8} {values['swells']:>7}")
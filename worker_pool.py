@@ -0,0 +1,308 @@
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+
+class CPUTimeExceeded(BaseException):
+    # Wird im Worker durch SIGXCPU ausgelöst; BaseException, damit `except Exception` in den Engines sie nicht abfängt
+    pass
+
+class JobFailed(RuntimeError):
+    """
+    Ein Job hat eine Ressourcengrenze überschritten oder seinen Worker zum Absturz gebracht.
+    reason ist "memory", "cpu", "killed" oder "crashed".
+    """
+
+    def __init__(self, reason, message):
+        super().__init__(f"{reason}: {message}")
+        self.reason = reason
+        self.message = message
+
+
+# Zusätzliche CPU-Zeit, nach der der Pool einen Worker abbricht, der SIGXCPU nicht verarbeitet (lange C-Schleifen)
+CPU_GRACE = 5.0
+
+
+def _cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+def _process_cpu_time(pid):
+    # CPU-Zeit eines anderen Prozesses aus /proc (nur Linux), sonst None
+    try:
+        with open(f"/proc/{pid}/stat", "r") as file:
+            fields = file.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def _cpu_exceeded(signum, frame):
+    raise CPUTimeExceeded()
+
+def _worker_main(conn, max_memory, initializer, initargs):
+    """
+    Hauptschleife eines Worker-Prozesses: setzt die Speichergrenze, lädt die Engines einmal und
+    führt Jobs aus, bis ein None kommt oder eine Grenze überschritten wurde.
+    """
+    if max_memory:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+    signal.signal(signal.SIGXCPU, _cpu_exceeded)
+    import telemetry  # Einstellungen aus der Umgebung (telemetry wird beim Import nicht konfiguriert)
+    telemetry.configure_from_env()
+    if initializer is not None:
+        initializer(*initargs)
+    unlimited = (resource.RLIM_INFINITY, resource.RLIM_INFINITY)
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        fn, args, kwargs, max_cpu = job
+        healthy = True
+        try:
+            if max_cpu:
+                # RLIMIT_CPU zählt die gesamte Laufzeit des Prozesses: Grenze relativ zum bisherigen Verbrauch
+                limit = int(_cpu_time() + max_cpu) + 1
+                resource.setrlimit(resource.RLIMIT_CPU, (limit, resource.RLIM_INFINITY))
+            reply = ("ok", fn(*args, **kwargs))
+        except MemoryError:
+            healthy = False
+            reply = ("failed", ("memory", f"address space limit of {max_memory} bytes exceeded"))
+        except CPUTimeExceeded:
+            healthy = False
+            reply = ("failed", ("cpu", f"CPU time limit of {max_cpu} s exceeded"))
+        except Exception as error:
+            reply = ("error", error)
+        finally:
+            if max_cpu:
+                resource.setrlimit(resource.RLIMIT_CPU, unlimited)
+        try:
+            conn.send(reply)
+        except MemoryError:
+            healthy = False
+            conn.send(("failed", ("memory", "result could not be sent within the memory limit")))
+        except Exception as error:
+            # Nicht serialisierbares Ergebnis oder Ausnahme
+            conn.send(("error", RuntimeError(f"{type(error).__name__}: {error}")))
+        if not healthy:
+            break
+    conn.close()
+
+
+class WorkerPool:
+    """
+    Prozesspool mit Grenzen pro Job, Schnittstelle wie concurrent.futures.ProcessPoolExecutor (submit/shutdown).
+
+    Jeder Worker setzt RLIMIT_AS (Adressraum, die unter Linux durchsetzbare Näherung einer RSS-Grenze) einmal beim
+    Start und vor jedem Job RLIMIT_CPU auf den bisherigen Verbrauch plus max_cpu. Überschreitet ein Job eine Grenze
+    (MemoryError, SIGXCPU) oder stirbt der Worker (z. B. durch den OOM-Killer), schlägt nur dieser Job mit JobFailed
+    fehl und der Worker wird durch einen neuen ersetzt. Gesunde Worker bleiben erhalten, sodass SymPy und die Engines
+    nur einmal pro Worker geladen werden.
+    """
+
+    def __init__(self, max_workers=None, max_memory=None, max_cpu=None, initializer=None, initargs=(), max_jobs_per_worker=None):
+        """
+        :param max_workers: Anzahl der Worker (Standard: Anzahl der CPU-Kerne).
+        :param max_memory: Grenze des Adressraums pro Worker in Bytes (None = unbegrenzt).
+        :param max_cpu: CPU-Zeit pro Job in Sekunden (None = unbegrenzt).
+        :param initializer: Funktion, die in jedem neuen Worker einmal aufgerufen wird (z. B. Importe).
+        :param initargs: Argumente des initializer.
+        :param max_jobs_per_worker: Worker nach so vielen Jobs ersetzen (None = nie).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_memory = max_memory
+        self.max_cpu = max_cpu
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_jobs_per_worker = max_jobs_per_worker
+        # spawn statt fork: Worker werden aus Threads heraus ersetzt
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._workers = {}
+        self.counts = {"submitted": 0, "completed": 0, "errors": 0, "failed": 0, "started": 0, "recycled": 0}
+        self._threads = [threading.Thread(target=self._serve, daemon=True) for _ in range(self.max_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Reicht einen Job ein. fn muss wie bei ProcessPoolExecutor auf Modulebene definiert sein.
+        :return: Future; bei Überschreitung einer Grenze mit der Ausnahme JobFailed.
+        """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            self.counts["submitted"] += 1
+        future = Future()
+        self._jobs.put((future, fn, args, kwargs))
+        return future
+
+    def map(self, fn, *iterables):
+        """
+        Wie Executor.map: liefert die Ergebnisse in der Reihenfolge der Eingaben.
+        """
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+        for future in futures:
+            yield future.result()
+
+    def _start_worker(self):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child, self.max_memory, self.initializer, self.initargs), daemon=True
+        )
+        process.start()
+        child.close()
+        with self._lock:
+            self.counts["started"] += 1
+            self._workers[process.pid] = process
+        return process, parent
+
+    def _stop_worker(self, worker, recycled=False):
+        process, conn = worker
+        try:
+            conn.send(None)
+        except (OSError, ValueError):
+            pass
+        conn.close()
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        with self._lock:
+            self._workers.pop(process.pid, None)
+            if recycled:
+                self.counts["recycled"] += 1
+
+    def _exit_reason(self, process, over_cpu=False):
+        process.join(timeout=5)
+        code = process.exitcode
+        if code == -signal.SIGXCPU or over_cpu:
+            return "cpu", f"CPU time limit of {self.max_cpu} s exceeded"
+        if code == -signal.SIGKILL:
+            return "killed", "worker was killed (possibly by the out-of-memory killer)"
+        return "crashed", f"worker exited with code {code}"
+
+    def _serve(self):
+        # Ein Thread pro Worker: holt Jobs aus der Warteschlange und ersetzt den Worker bei Bedarf
+        worker, jobs_done = None, 0
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            if worker is None:
+                try:
+                    worker, jobs_done = self._start_worker(), 0
+                except Exception as error:
+                    future.set_exception(error)
+                    with self._lock:
+                        self.counts["errors"] += 1
+                    continue
+            process, conn = worker
+            start_cpu = _process_cpu_time(process.pid) if self.max_cpu else None
+            try:
+                conn.send((fn, args, kwargs, self.max_cpu))
+            except Exception as error:
+                # Job nicht serialisierbar: der Worker hat nichts davon erhalten
+                future.set_exception(error)
+                with self._lock:
+                    self.counts["errors"] += 1
+                continue
+            over_cpu = False
+            try:
+                while not conn.poll(1.0):
+                    used = _process_cpu_time(process.pid) if start_cpu is not None else None
+                    if used is not None and used - start_cpu > self.max_cpu + CPU_GRACE:
+                        over_cpu = True
+                        process.kill()
+                        raise EOFError
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                status, payload = "failed", self._exit_reason(process, over_cpu)
+            jobs_done += 1
+
+            with self._lock:
+                self.counts[{"ok": "completed", "error": "errors", "failed": "failed"}[status]] += 1
+            if status == "ok":
+                future.set_result(payload)
+            elif status == "error":
+                future.set_exception(payload)
+            else:
+                future.set_exception(JobFailed(*payload))
+            if status == "failed" or (self.max_jobs_per_worker and jobs_done >= self.max_jobs_per_worker):
+                self._stop_worker(worker, recycled=True)
+                worker = None
+        if worker is not None:
+            self._stop_worker(worker)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, workers=len(self._workers), queued=self._jobs.qsize())
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """
+        Beendet den Pool wie Executor.shutdown.
+        :param wait: Auf laufende Jobs und das Ende der Worker warten.
+        :param cancel_futures: Noch nicht gestartete Jobs abbrechen.
+        """
+        with self._lock:
+            self._shutdown = True
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in self._threads:
+            self._jobs.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+def parse_memory(value):
+    """
+    Liest eine Speichergröße wie "2G", "512M" oder "1048576" (Bytes).
+    """
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+if __name__ == "__main__":
+    # Kurzer Selbsttest der Grenzen: python worker_pool.py [max_memory] [max_cpu]
+    def _report(name, future):
+        try:
+            print(f"✅ {name}: {future.result()}", file=sys.stderr)
+        except JobFailed as error:
+            print(f"❌ {name}: failed ({error})", file=sys.stderr)
+
+    with WorkerPool(2, parse_memory(sys.argv[1] if len(sys.argv) > 1 else "1G"),
+                    float(sys.argv[2]) if len(sys.argv) > 2 else 2.0) as pool:
+        start = time.perf_counter()
+        _report("allocate", pool.submit(bytearray, 4 * 1024 ** 3))
+        _report("spin", pool.submit(sum, range(10 ** 12)))  # C-Schleife: Abbruch durch den Pool nach CPU_GRACE
+        _report("small", pool.submit(sum, range(10)))
+        print(pool.stats(), f"{time.perf_counter() - start:.1f} s", file=sys.stderr)
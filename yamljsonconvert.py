@@ -1,12 +1,22 @@
+import sys
+
 import yaml
 import json
 
-# YAML-Datei laden
-with open("network.yaml", "r") as f:
-    yaml_data = yaml.safe_load(f)
 
-# YAML-Daten als JSON speichern
-with open("network.json", "w") as f:
-    json.dump(yaml_data, f, indent=4)
+def convert_yaml_to_json(yaml_filename="network.yaml", json_filename="network.json"):
+    # YAML-Datei laden
+    with open(yaml_filename, "r") as f:
+        yaml_data = yaml.safe_load(f)
+
+    # YAML-Daten als JSON speichern
+    with open(json_filename, "w") as f:
+        json.dump(yaml_data, f, indent=4)
+
 
-print("✅ YAML wurde erfolgreich in JSON umgewandelt!")
+if __name__ == "__main__":
+    # Optional: Ein- und Ausgabedatei als Argumente
+    yaml_filename = sys.argv[1] if len(sys.argv) > 1 else "network.yaml"
+    json_filename = sys.argv[2] if len(sys.argv) > 2 else "network.json"
+    convert_yaml_to_json(yaml_filename, json_filename)
+    print("✅ YAML wurde erfolgreich in JSON umgewandelt!")